@@ -10,11 +10,13 @@ from flask import (
     Response,
     abort,
     current_app,
+    g,
 )
 from datetime import datetime, date, timedelta, timezone
 from zoneinfo import ZoneInfo
 import calendar
 from functools import wraps
+import atexit
 import os
 import config
 import threading
@@ -23,11 +25,10 @@ import io
 import re
 from concurrent.futures import ThreadPoolExecutor
 from urllib.parse import quote
-from googleapiclient.discovery import build
 from googleapiclient.errors import HttpError
-from googleapiclient.http import MediaIoBaseDownload
-from google.oauth2.service_account import Credentials
 from itsdangerous import URLSafeTimedSerializer
+from utils import cache_checkpoint, metrics
+from utils.cache import BoundedCache
 
 # 한국 시간대 설정
 KST = ZoneInfo("Asia/Seoul")
@@ -36,64 +37,41 @@ def get_kst_now():
     """한국 시간대(Asia/Seoul)의 현재 시간 반환"""
     return datetime.now(KST)
 
-# 간단한 메모리 캐시 클래스 (TTL 지원)
-class SimpleCache:
-    """TTL(Time To Live)을 지원하는 간단한 메모리 캐시"""
-    def __init__(self, default_ttl=60):  # 기본 60초
-        self._cache = {}
-        self._timestamps = {}
-        self._lock = threading.Lock()
-        self.default_ttl = default_ttl
-    
-    def get(self, key):
-        """캐시에서 값 가져오기 (만료된 경우 None 반환)"""
-        with self._lock:
-            if key not in self._cache:
-                return None
-            
-            # TTL 확인
-            if time.time() - self._timestamps[key] > self.default_ttl:
-                del self._cache[key]
-                del self._timestamps[key]
-                return None
-            
-            return self._cache[key]
-    
-    def set(self, key, value, ttl=None):
-        """캐시에 값 저장"""
-        with self._lock:
-            self._cache[key] = value
-            self._timestamps[key] = time.time()
-            if ttl:
-                # TTL이 지정된 경우 별도 저장 (현재는 default_ttl 사용)
-                pass
-    
-    def clear(self, key=None):
-        """캐시 삭제 (key가 None이면 전체 삭제)"""
-        with self._lock:
-            if key is None:
-                self._cache.clear()
-                self._timestamps.clear()
-            else:
-                self._cache.pop(key, None)
-                self._timestamps.pop(key, None)
-    
-    def clear_pattern(self, pattern):
-        """패턴에 맞는 키들 삭제 (예: 'work_data:6000:*')"""
-        with self._lock:
-            keys_to_delete = [k for k in self._cache.keys() if pattern in k]
-            for key in keys_to_delete:
-                del self._cache[key]
-                del self._timestamps[key]
-
-# 전역 캐시 (TTL은 config 환경 변수로 조절 가능 — Sheets 분당 읽기 한도 완화)
-work_data_cache = SimpleCache(default_ttl=config.WORK_DATA_CACHE_SECONDS)
-sales_data_cache = SimpleCache(default_ttl=config.SALES_SUMMARY_CACHE_SECONDS)
-work_start_info_cache = SimpleCache(default_ttl=config.WORK_START_INFO_CACHE_SECONDS)
-annual_stats_cache = SimpleCache(default_ttl=config.ANNUAL_STATS_CACHE_SECONDS)
-notice_cache = SimpleCache(default_ttl=config.NOTICE_CACHE_SECONDS)
+def _work_revision(refresh=True):
+    return workbook_revisions(('work',), refresh=refresh)
+
+
+def _sales_revision(refresh=True):
+    return workbook_revisions(('sales',), refresh=refresh)
+
+
+def _work_and_sales_revision(refresh=True):
+    return workbook_revisions(('work', 'sales'), refresh=refresh)
+
+
+# 전역 캐시 (TTL은 config 환경 변수로 조절 가능 — Sheets 분당 읽기 한도 완화, 캐시당 APP_CACHE_MAX_ENTRIES 개 LRU)
+# TTL 이 지나도 해당 통합문서가 수정되지 않았으면 Drive version 확인 1회로 연장
+work_data_cache = BoundedCache(
+    default_ttl=config.WORK_DATA_CACHE_SECONDS, version_fn=_work_revision, name='work_data')
+sales_data_cache = BoundedCache(
+    default_ttl=config.SALES_SUMMARY_CACHE_SECONDS, version_fn=_sales_revision, name='sales_data')
+work_start_info_cache = BoundedCache(
+    default_ttl=config.WORK_START_INFO_CACHE_SECONDS, version_fn=_work_revision, name='work_start_info')
+annual_stats_cache = BoundedCache(
+    default_ttl=config.ANNUAL_STATS_CACHE_SECONDS, version_fn=_work_and_sales_revision, name='annual_stats')
+notice_cache = BoundedCache(default_ttl=config.NOTICE_CACHE_SECONDS, name='notice')
+_named_caches = (work_data_cache, sales_data_cache, work_start_info_cache, annual_stats_cache, notice_cache)
+for _cache in _named_caches:
+    cache_checkpoint.register_cache(_cache)
+metrics.register_gauge(
+    'app_cache_entries', '메모리 캐시 항목 수 (cache)',
+    lambda: [({'cache': c.name}, len(c)) for c in _named_caches],
+)
 from utils.auth import authenticate_user, change_password, check_default_password
 from utils import yearly_stats_snapshot
+from utils import sheets_quota
+from utils import warmup
+from utils.month_grid import MonthGrid
 
 
 def invalidate_main_dashboard_stats_caches(employee_id):
@@ -113,21 +91,9 @@ def invalidate_main_dashboard_stats_caches(employee_id):
     yearly_stats_snapshot.invalidate_employee(eid, config.YEARLY_STATS_SNAPSHOT_DB_PATH)
 
 
-def get_google_api_credentials():
-    """Google API 공통 인증 객체."""
-    credentials_dict = config.get_google_credentials()
-    if credentials_dict:
-        return Credentials.from_service_account_info(credentials_dict, scopes=config.SCOPES)
-    if not os.path.exists(config.CREDENTIALS_FILE):
-        raise FileNotFoundError(
-            f"credentials.json 파일을 찾을 수 없습니다. ({config.CREDENTIALS_FILE})"
-        )
-    return Credentials.from_service_account_file(config.CREDENTIALS_FILE, scopes=config.SCOPES)
-
-
 def get_drive_service():
-    creds = get_google_api_credentials()
-    return build('drive', 'v3', credentials=creds, cache_discovery=False)
+    """Drive v3 서비스 (프로세스 공용 — 호출마다 build 하지 않음, 전송은 스레드별 연결)."""
+    return get_drive_v3_service()
 
 
 def parse_notice_filename(raw_name):
@@ -257,12 +223,16 @@ from utils.google_sheets import (
     get_all_user_work_data,
     update_work_status,
     get_all_months_data,
-    get_all_months_aggregated_data,
+    work_history_month_sheet_names,
     get_user_by_id,
     add_sales_record,
     get_today_work_start_info,
     get_user_sales_summary,
-    prefetch_user_sales_summaries_batch,
+    get_sales_summaries_by_employee,
+    get_monthly_rollups_by_employee,
+    on_stats_delta,
+    get_work_month_grid,
+    get_work_notes_for_day,
     get_loaner_vehicles,
     update_loaner_vehicle_on_apply,
     reset_loaner_vehicle_on_work_end,
@@ -274,8 +244,10 @@ from utils.google_sheets import (
     get_leave_requests_for_display,
     append_leave_request_row,
     delete_pending_leave_request_row,
+    start_sheets_mirror_if_enabled,
+    workbook_revisions,
+    get_drive_v3_service,
 )
-import pandas as pd
 
 app = Flask(__name__)
 app.secret_key = config.SECRET_KEY
@@ -297,10 +269,45 @@ def verify_notice_pdf_token(file_id, token):
     except Exception:
         return False
 
+# 쓰기 함수가 쓰기 쿼터 마감(SHEETS_QUOTA_WRITE_MAX_WAIT_SEC)에 걸려 기록을 포기했을 때의 안내
+WRITE_BUSY_MESSAGE = '지금 기록 요청이 몰려 저장하지 못했습니다. 잠시 후 다시 시도해주세요.'
+
+
+def write_failure_message(default):
+    """쓰기 실패 안내 문구 — 쿼터 마감으로 포기한 경우면 '잠시 후 다시 시도', 아니면 default."""
+    return WRITE_BUSY_MESSAGE if sheets_quota.write_shed() else default
+
+
+@app.before_request
+def start_request_timer():
+    g.request_started = time.perf_counter()
+
+
+@app.before_request
+def ensure_cache_warmup():
+    """gunicorn 훅 없이 띄운 경우(run.py 등)에도 첫 요청에서 예열 시작 (이미 시작했으면 바로 반환)."""
+    start_cache_warmup()
+
+
+@app.teardown_request
+def record_request_latency(exc=None):
+    """라우트별 응답 시간 히스토그램 (/metrics). 라우트 패턴 단위라 사번·파일 ID 가 라벨에 안 들어간다."""
+    started = g.pop('request_started', None)
+    if started is None:
+        return
+    rule = request.url_rule.rule if request.url_rule is not None else 'unmatched'
+    status = g.get('response_status', 500 if exc is not None else 200)
+    metrics.observe(
+        'http_request_duration_seconds', time.perf_counter() - started,
+        {'route': rule, 'method': request.method, 'status': str(status)},
+    )
+
+
 # 정적 파일 캐싱 최적화 및 동적 페이지 캐시 방지
 @app.after_request
 def after_request(response):
     """응답에 적절한 캐시 제어 헤더 추가"""
+    g.response_status = response.status_code
     if response.mimetype == 'application/pdf' or request.endpoint == 'notice_file_proxy':
         return response
     # 정적 파일(이미지, CSS, JS)은 캐싱 허용
@@ -409,6 +416,21 @@ def get_active_work_reference(employee_id, reference_date):
     # 조건에 맞는 진행 중 운행이 없으면 기존 폴백 사용
     return get_work_start_info_with_fallback(employee_id, reference_date)
 
+@app.route('/metrics')
+def metrics_endpoint():
+    """프로세스 내 지표 (Prometheus text format). METRICS_ENABLED=0 이면 404."""
+    if not metrics.enabled():
+        abort(404)
+    return Response(metrics.render(), mimetype='text/plain; version=0.0.4; charset=utf-8')
+
+
+@app.route('/readyz')
+def readyz():
+    """캐시 예열 완료 여부 (배포·로드밸런서 확인용). 준비 전이면 503, 단계별 결과를 JSON 으로."""
+    state = warmup.status()
+    return jsonify(state), 200 if state['ready'] else 503
+
+
 @app.route('/')
 def index():
     """메인 페이지 - 로그인 페이지로 리다이렉트"""
@@ -501,21 +523,71 @@ def _get_sheet_metric(record, key):
     return _to_int_safe(record.get(key, 0))
 
 
+_rollup_freeze_lock = threading.Lock()
+
+
+def _month_closed_for_rollup(year, month, today):
+    """월이 끝나고 MONTHLY_ROLLUP_FREEZE_GRACE_DAYS(정정 기간)가 지났으면 True — 그 뒤로 월 롤업 고정."""
+    first_of_next = date(year + 1, 1, 1) if month == 12 else date(year, month + 1, 1)
+    return today >= first_of_next + timedelta(days=config.MONTHLY_ROLLUP_FREEZE_GRACE_DAYS)
+
+
+def _month_rollups(year, month_names, freeze=True, with_sales=True):
+    """월 시트 이름들 → (월 롤업 DB 로 답할 고정 월 이름 집합, {진행 중 월: {사번: 롤업}}).
+
+    진행 중 월은 get_monthly_rollups_by_employee 로 읽는다 (읽지 못한 월은 빠짐). freeze 면 마감됐는데 아직
+    고정되지 않은 월도 같은 읽기에 묶어(근무·매출 batchGet 각 1회) 전 사번 롤업을 고정한다 (동시에 한 스레드만)."""
+    snap_path = config.YEARLY_STATS_SNAPSHOT_DB_PATH
+    if not snap_path:
+        return set(), get_monthly_rollups_by_employee(list(month_names), with_sales=with_sales)
+    month_no = {mn: config.MONTHS.index(mn) + 1 for mn in month_names}
+    today = get_kst_now().date()
+
+    def _unfrozen(frozen):
+        return [mn for mn in month_names if month_no[mn] not in frozen]
+
+    def _closed(names):
+        return [mn for mn in names if _month_closed_for_rollup(year, month_no[mn], today)]
+
+    frozen = yearly_stats_snapshot.frozen_months(year, snap_path)
+    if not (freeze and _closed(_unfrozen(frozen))):
+        return {mn for mn in month_names if month_no[mn] in frozen}, get_monthly_rollups_by_employee(
+            _unfrozen(frozen), with_sales=with_sales)
+    with _rollup_freeze_lock:
+        frozen = yearly_stats_snapshot.frozen_months(year, snap_path)
+        rollups = get_monthly_rollups_by_employee(_unfrozen(frozen))
+        for mn in _closed(_unfrozen(frozen)):
+            if mn in rollups:
+                saved = yearly_stats_snapshot.freeze_month(year, month_no[mn], rollups.pop(mn), snap_path)
+                frozen.add(month_no[mn])
+                print(f'월 롤업 고정: {year}년 {mn} ({saved}명)')
+    return {mn for mn in month_names if month_no[mn] in frozen}, rollups
+
+
+def _frozen_month_rollup(employee_id, year, month):
+    """고정된 월이면 사번의 월 롤업 (그 월에 행이 없던 사번은 0), 아니면 None. Sheets 를 읽지 않는다."""
+    snap_path = config.YEARLY_STATS_SNAPSHOT_DB_PATH
+    if not snap_path or month not in yearly_stats_snapshot.frozen_months(year, snap_path):
+        return None
+    stored = yearly_stats_snapshot.get_employee_rollups(employee_id, year, snap_path).get(month)
+    return stored or dict.fromkeys(yearly_stats_snapshot.ROLLUP_FIELDS, 0)
+
+
 def _compute_heavy_yearly_totals(employee_id, reference_date):
-    """Sheets 호출 부담이 큰 두 지표만 계산해 (결근합, 가해사고 합)."""
-    aggregated = get_all_months_aggregated_data(
-        employee_id,
-        reference_date=reference_date,
-        recent_months=12,
-        work_data_cache=work_data_cache,
-    ) or {}
-    annual_absent_days = sum(_get_sheet_metric((v or {}), '결근일') for v in aggregated.values())
-    prefetch_user_sales_summaries_batch(employee_id, list(config.MONTHS), sales_data_cache)
-    annual_accident_count = 0
-    for mn in config.MONTHS:
-        annual_accident_count += _to_int_safe(
-            (get_user_sales_summary_cached(employee_id, mn) or {}).get('accident_count', 0)
-        )
+    """Sheets 호출 부담이 큰 두 지표만 계산해 (결근합, 가해사고 합).
+
+    기준월까지 마감 월은 월 롤업 SQL 합계, 진행 중인 월만 월 시트 공유 그리드·매출 꼬리에서 찾아본다."""
+    eid = str(employee_id).strip()
+    _, live_rollups = _month_rollups(reference_date.year, config.MONTHS[:reference_date.month])
+    sums = yearly_stats_snapshot.sum_rollups_by_employee(
+        reference_date.year, config.YEARLY_STATS_SNAPSHOT_DB_PATH, employee_id=eid
+    ).get(eid) or {}
+    annual_absent_days = sums.get('absent_days', 0)
+    annual_accident_count = sums.get('accident_count', 0)
+    for by_eid in live_rollups.values():
+        rollup = by_eid.get(eid) or {}
+        annual_absent_days += rollup.get('absent_days', 0)
+        annual_accident_count += rollup.get('accident_count', 0)
     return annual_absent_days, annual_accident_count
 
 
@@ -615,6 +687,18 @@ def get_main_yearly_stats(employee_id, reference_date, response_meta=None, allow
                 response_meta['revalidate_recommended'] = False
             return result
 
+    # 읽기 예산이 바닥이면 12개월 재계산(대기·429) 대신 만료 스냅샷이라도 반환
+    if snap_path and not sheets_quota.has_budget('read'):
+        peek = yearly_stats_snapshot.peek_heavy(employee_id, reference_date.year, 0, snap_path)
+        if peek:
+            result = dict(peek[0])
+            result.update(refresh_leave)
+            if response_meta is not None:
+                response_meta['heavy_stale'] = True
+                response_meta['heavy_source'] = 'snapshot'
+                response_meta['revalidate_recommended'] = True
+            return result
+
     absent, accidents = _compute_heavy_yearly_totals(employee_id, reference_date)
     if ttl_cfg > 0 and snap_path:
         yearly_stats_snapshot.put_heavy(
@@ -658,24 +742,92 @@ def refresh_yearly_heavy_snapshot_background(employee_id, reference_date):
         print(f'refresh_yearly_heavy_snapshot_background({eid}): {ex}')
 
 
-yearly_bg_rotate_index = 0
+def apply_yearly_stats_delta(employee_id, month_sheet_name, deltas):
+    """근무·매출 쓰기의 월 집계 증감을 연간 통계 메모리 캐시·스냅샷·고정된 월 롤업에 더한다.
+
+    쓰기마다 연간 통계를 지우고 12개월을 다시 계산하는 대신, 있는 값만 고쳐 다음 조회도 Sheets 없이 답한다.
+    연간 합계에 들어가지 않는 이후 월(기준월 다음)의 쓰기는 월 롤업에만 반영된다."""
+    now = get_kst_now()
+    month = config.MONTHS.index(month_sheet_name) + 1
+    snap_path = config.YEARLY_STATS_SNAPSHOT_DB_PATH
+    yearly_stats_snapshot.apply_rollup_delta(employee_id, now.year, month, deltas, snap_path)
+    absent = deltas.get('absent_days', 0)
+    accidents = deltas.get('accident_count', 0)
+    if month > now.month or not (absent or accidents):
+        return
+    yearly_stats_snapshot.apply_heavy_delta(employee_id, now.year, absent, accidents, snap_path)
+    cache_key = f'main_yearly:{employee_id}:{now.year}'
+    cached = annual_stats_cache.get(cache_key)
+    if cached is not None:
+        updated = dict(cached)
+        updated['annual_absent_days'] = max(0, updated.get('annual_absent_days', 0) + absent)
+        updated['annual_accident_count'] = max(0, updated.get('annual_accident_count', 0) + accidents)
+        annual_stats_cache.set(cache_key, updated)
+
+
+on_stats_delta(apply_yearly_stats_delta)
+
+
+def _compute_fleet_heavy_yearly_totals(reference_date):
+    """전 사번의 (결근합, 가해사고 합) {사번: (결근, 사고)} — 마감 월은 월 롤업 SQL 합계 한 번,
+    진행 중인 월은 근무·매출 월 시트를 각각 한 번씩만 읽는다.
+
+    진행 중인 월 중 하나라도 읽지 못하면 None (부분 합으로 스냅샷을 덮어쓰지 않음)."""
+    year = reference_date.year
+    months = config.MONTHS[:reference_date.month]
+    closed, live_rollups = _month_rollups(year, months)
+    unread = [mn for mn in months if mn not in closed and mn not in live_rollups]
+    if unread:
+        print(f'fleet 연간 통계: 근무·매출 시트를 읽지 못해 건너뜀 ({", ".join(unread)})')
+        return None
+    totals = {}
+    for r in get_accounts_data() or []:
+        eid = str(r.get('employee_id') or '').strip()
+        if eid:
+            totals[eid] = [0, 0]
+    rollups = [yearly_stats_snapshot.sum_rollups_by_employee(year, config.YEARLY_STATS_SNAPSHOT_DB_PATH)]
+    rollups += live_rollups.values()
+    for by_eid in rollups:
+        for eid, rollup in by_eid.items():
+            total = totals.setdefault(eid, [0, 0])
+            total[0] += rollup['absent_days']
+            total[1] += rollup['accident_count']
+    return {eid: (absent, accidents) for eid, (absent, accidents) in totals.items()}
+
+
+def refresh_fleet_yearly_heavy_snapshot(reference_date):
+    """전 사번 무거운 연간 두 지표를 한 번에 재계산해 스냅샷에 일괄 저장 → 저장한 사번 수. 실패만 로깅."""
+    started = time.perf_counter()
+    try:
+        totals = _compute_fleet_heavy_yearly_totals(reference_date)
+        if totals is None:
+            metrics.inc('yearly_fleet_refreshes_total', {'result': 'skipped'})
+            return 0
+        saved = yearly_stats_snapshot.put_heavy_many(
+            reference_date.year,
+            [(eid, absent, accidents) for eid, (absent, accidents) in totals.items()],
+            config.YEARLY_STATS_SNAPSHOT_DB_PATH,
+        )
+        annual_stats_cache.clear_pattern('main_yearly:')
+    except Exception as ex:
+        metrics.inc('yearly_fleet_refreshes_total', {'result': 'error'})
+        print(f'refresh_fleet_yearly_heavy_snapshot: {ex}')
+        return 0
+    metrics.inc('yearly_fleet_refreshes_total', {'result': 'ok'})
+    print(f'fleet 연간 통계: {saved}명 스냅샷 갱신 ({(time.perf_counter() - started) * 1000:.0f}ms)')
+    return saved
 
 
 def _yearly_stats_background_tick(app_instance):
-    global yearly_bg_rotate_index
+    # 워커마다 루프가 돌아도 주기당 한 워커만 갱신 (sleep 오차만큼 여유)
+    interval = config.YEARLY_STATS_BG_REFRESH_INTERVAL_SEC
     try:
+        if not yearly_stats_snapshot.claim_refresh(
+            'yearly_heavy_fleet', interval * 0.9, config.YEARLY_STATS_SNAPSHOT_DB_PATH
+        ):
+            return
         with app_instance.app_context():
-            rows = get_accounts_data()
-            eids = []
-            for r in rows or []:
-                eid = str(r.get('employee_id') or '').strip()
-                if eid:
-                    eids.append(eid)
-            if not eids:
-                return
-            idx = yearly_bg_rotate_index % len(eids)
-            yearly_bg_rotate_index = idx + 1
-            refresh_yearly_heavy_snapshot_background(eids[idx], get_kst_now().date())
+            refresh_fleet_yearly_heavy_snapshot(get_kst_now().date())
     except Exception as ex:
         print(f'_yearly_stats_background_tick: {ex}')
 
@@ -694,6 +846,32 @@ def start_yearly_stats_background_if_enabled(app_instance):
 
     threading.Thread(target=loop, daemon=True, name='yearly-heavy-snapshot-bg').start()
 
+
+def _warm_work_grid(month_name):
+    if get_work_month_grid(month_name) is None:
+        raise RuntimeError(f'{month_name} 근무 시트를 읽지 못했습니다.')
+
+
+def _warmup_steps():
+    """워커 시작 예열 단계 — 계정, 이번·지난달 근무 그리드, 오늘 근무 메모, 같은 두 달 매출 요약, 공지 목록."""
+    today = get_kst_now().date()
+    months = [config.MONTHS[today.month - 1]]
+    # 1월의 지난달은 작년 통합문서라 이 앱이 읽지 않는다
+    if today.month > 1:
+        months.append(config.MONTHS[today.month - 2])
+    steps = [('accounts', get_accounts_data, 'read')]
+    steps += [(f'work_grid:{m}', (lambda m=m: _warm_work_grid(m)), 'read') for m in months]
+    # 근무시작 정보(출근 시각·차량)는 오늘 날짜 열 메모에 있다
+    steps.append(('work_notes:today', lambda: get_work_notes_for_day(months[0], today.day), 'read'))
+    steps.append(('sales_summaries', lambda: get_sales_summaries_by_employee(months), 'read'))
+    steps.append(('notice_list', list_notice_pdfs, 'drive'))
+    return steps
+
+
+def start_cache_warmup():
+    """캐시 예열 시작 (백그라운드, 프로세스당 1회). gunicorn post_worker_init 과 첫 요청에서 호출."""
+    return warmup.start(_warmup_steps)
+
 def build_calendar_template_context(employee_id, year, month, include_yearly_stats=False):
     """캘린더 뷰와 메인 대시보드에서 공통으로 사용하는 템플릿 컨텍스트."""
     current_date = get_kst_now()
@@ -701,7 +879,16 @@ def build_calendar_template_context(employee_id, year, month, include_yearly_sta
     
     # 근무·매출 순차 로딩: 병렬 2동시 호출보다 분당 읽기 스파이크 감소(429 완화)
     all_work_data = get_all_user_work_data_cached(employee_id, month_name)
-    sales_summary = get_user_sales_summary_cached(employee_id, month_name) or {}
+    # 고정된(마감) 월 매출은 월 롤업에서 — 매출 시트를 다시 훑지 않음
+    frozen_rollup = _frozen_month_rollup(employee_id, year, month)
+    if frozen_rollup is not None:
+        sales_summary = {
+            'total_revenue': frozen_rollup['revenue'],
+            'total_fuel_cost': frozen_rollup['fuel_cost'],
+            'accident_count': frozen_rollup['accident_count'],
+        }
+    else:
+        sales_summary = get_user_sales_summary_cached(employee_id, month_name) or {}
     
     # 첫 번째 행을 기본 데이터로 사용 (기타 정보 표시용)
     work_data = all_work_data[0] if all_work_data and len(all_work_data) > 0 else None
@@ -714,37 +901,10 @@ def build_calendar_template_context(employee_id, year, month, include_yearly_sta
     work_status = {}
     record_for_day = {}
     if all_work_data:
-        # 상태 우선순위: O(근무) > X(결근) > R(예정일) > H(공휴일) > /(휴무일)
-        status_priority = {'O': 5, 'X': 4, 'R': 3, 'H': 2, '/': 1}
-        
-        for day in range(1, 32):
-            day_str = str(day)
-            best_status = None
-            best_priority = 0
-            best_record = None
-            
-            # 모든 행에서 해당 날짜의 상태 확인
-            for record in all_work_data:
-                if day_str in record:
-                    status_raw = str(record[day_str]).strip()
-                    if not status_raw:  # 빈 값은 스킵
-                        continue
-                    
-                    # 대소문자 구분 없이 처리 (O, X, R, H는 대문자로, /는 그대로)
-                    status = status_raw.upper() if status_raw.upper() in ['O', 'X', 'R', 'H'] else status_raw
-                    
-                    # 유효한 상태인 경우 우선순위 확인
-                    if status in ['O', 'X', 'R', 'H', '/']:
-                        priority = status_priority.get(status, 0)
-                        if priority > best_priority:
-                            best_priority = priority
-                            best_status = status
-                            best_record = record
-            
-            # 가장 높은 우선순위의 상태를 저장
-            if best_status:
-                work_status[day] = best_status
-                record_for_day[day] = best_record
+        # 상태 우선순위: O(근무) > X(결근) > R(예정일) > H(공휴일) > /(휴무일) — 행 × 31일 배열에서 날짜별 최댓값
+        for day, (status, row_pos) in MonthGrid.from_records(all_work_data).resolve_days().items():
+            work_status[day] = status
+            record_for_day[day] = all_work_data[row_pos]
     
     # 근무일·결근일·인정일: 같은 사번 모든 행 합산 (신규 시트명 우선)
     work_days = 0
@@ -792,13 +952,9 @@ def build_calendar_template_context(employee_id, year, month, include_yearly_sta
                 # 다른 월인 경우 (월이 바뀐 경우)
                 yesterday_all_work_data = get_all_user_work_data_cached(employee_id, yesterday_month_name)
                 if yesterday_all_work_data:
-                    yesterday_day_str = str(yesterday_day)
-                    for record in yesterday_all_work_data:
-                        if yesterday_day_str in record:
-                            status_raw = str(record.get(yesterday_day_str, '')).strip().upper()
-                            if status_raw == 'O':
-                                yesterday_info = get_today_work_start_info_cached(employee_id, yesterday_month_name, yesterday_day)
-                                break
+                    yesterday_status = MonthGrid.from_records(yesterday_all_work_data).resolve_days().get(yesterday_day)
+                    if yesterday_status and yesterday_status[0] == 'O':
+                        yesterday_info = get_today_work_start_info_cached(employee_id, yesterday_month_name, yesterday_day)
             
             # 어제 날짜에 근무시작 정보가 있고, sales_DB_2026에 기록이 없으면 근무종료 버튼 활성화
             if yesterday_info and yesterday_info.get('work_date'):
@@ -841,13 +997,9 @@ def build_calendar_template_context(employee_id, year, month, include_yearly_sta
                 # 다른 월인 경우 (월이 바뀐 경우)
                 yesterday_all_work_data = get_all_user_work_data_cached(employee_id, yesterday_month_name)
                 if yesterday_all_work_data:
-                    yesterday_day_str = str(yesterday_day)
-                    for record in yesterday_all_work_data:
-                        if yesterday_day_str in record:
-                            status_raw = str(record.get(yesterday_day_str, '')).strip().upper()
-                            if status_raw == 'O':
-                                yesterday_info = get_today_work_start_info_cached(employee_id, yesterday_month_name, yesterday_day)
-                                break
+                    yesterday_status = MonthGrid.from_records(yesterday_all_work_data).resolve_days().get(yesterday_day)
+                    if yesterday_status and yesterday_status[0] == 'O':
+                        yesterday_info = get_today_work_start_info_cached(employee_id, yesterday_month_name, yesterday_day)
             
             # 어제 날짜에 근무시작 정보가 있고, sales_DB_2026에 기록이 없으면 근무시작 버튼 비활성화
             if yesterday_info and yesterday_info.get('work_date'):
@@ -1046,7 +1198,8 @@ def api_main_yearly_stats():
             'revalidate_suggested': bool(meta.get('revalidate_recommended')) and not follow_poll,
             'revalidate_after_ms': int(getattr(config, 'YEARLY_SWR_RECHECK_MS', 2600)),
         }
-        if meta.get('revalidate_recommended') and not follow_poll:
+        # 읽기 예산이 부족하면 백그라운드 재계산을 미루고 stale 값 유지 (다음 재검증 때 다시 판단)
+        if meta.get('revalidate_recommended') and not follow_poll and sheets_quota.has_budget('read'):
             _schedule_yearly_heavy_refresh(current_app._get_current_object(), employee_id, ref.year)
         return jsonify(payload)
     except Exception as e:
@@ -1145,6 +1298,9 @@ def notice_file_proxy(file_id):
         if not notice:
             abort(404)
         svc = get_drive_service()
+        # googleapiclient.http 는 Drive 서비스를 만들 때 이미 불러옴 (모듈 로드 시점에는 불러오지 않음)
+        from googleapiclient.http import MediaIoBaseDownload
+
         req = svc.files().get_media(fileId=file_id, supportsAllDrives=True)
         stream = io.BytesIO()
         downloader = MediaIoBaseDownload(stream, req)
@@ -1238,7 +1394,7 @@ def leave_request_new():
         ):
             flash('휴가 신청이 접수되었습니다.', 'success')
             return redirect(url_for('leave_request'))
-        flash('휴가 신청 저장에 실패했습니다. 잠시 후 다시 시도해주세요.', 'error')
+        flash(write_failure_message('휴가 신청 저장에 실패했습니다. 잠시 후 다시 시도해주세요.'), 'error')
         return redirect(url_for('leave_request_new'))
 
     return render_template(
@@ -1275,7 +1431,7 @@ def leave_request_cancel():
     if delete_pending_leave_request_row(employee_id, row_name or session_name, apply_date, start_date, end_date):
         flash('휴가 신청이 취소되었습니다.', 'success')
     else:
-        flash('대기 상태의 신청건을 찾지 못했습니다.', 'error')
+        flash(write_failure_message('대기 상태의 신청건을 찾지 못했습니다.'), 'error')
     return redirect(url_for('leave_request'))
 
 
@@ -1302,9 +1458,9 @@ def vehicle_replacement_apply():
                 work_start_info_cache.clear_pattern(f"work_start_info:{employee_id}:")
                 flash('대차신청이 완료되었습니다.', 'success')
             else:
-                flash('보고사항 반영에 실패했습니다. 관리자에게 문의하세요.', 'error')
+                flash(write_failure_message('보고사항 반영에 실패했습니다. 관리자에게 문의하세요.'), 'error')
         else:
-            flash('대차 신청 처리에 실패했습니다. 다시 시도해주세요.', 'error')
+            flash(write_failure_message('대차 신청 처리에 실패했습니다. 다시 시도해주세요.'), 'error')
         return redirect(url_for('main_dashboard'))
     
     vehicles = get_loaner_vehicles()
@@ -1374,7 +1530,7 @@ def work_start():
             # 근무응원 페이지로 리다이렉트
             return redirect(url_for('work_thanks'))
         else:
-            flash('근무시작 기록에 실패했습니다.', 'error')
+            flash(write_failure_message('근무시작 기록에 실패했습니다.'), 'error')
     
     # 사용자 정보 가져오기
     user = get_user_by_id(employee_id)
@@ -1725,7 +1881,7 @@ def work_end_step2():
             # 감사 페이지로 이동
             return redirect(url_for('work_end_thanks'))
         else:
-            flash('근무종료 기록에 실패했습니다.', 'error')
+            flash(write_failure_message('근무종료 기록에 실패했습니다.'), 'error')
     
     # 사용자 정보 가져오기
     user = get_user_by_id(employee_id)
@@ -1750,20 +1906,29 @@ def work_end_thanks():
 def work_history():
     """월별 근무이력 시각화"""
     employee_id = session.get('employee_id')
+    ref = get_kst_now().date()
     
-    # 월별 근무 합산: 스프레드시트 1회 열기 + 월 병렬 조회 + work_data 캐시 연동 + 조회 월 수 제한(설정)
-    all_data = get_all_months_aggregated_data(
-        employee_id,
-        reference_date=get_kst_now().date(),
-        recent_months=config.WORK_HISTORY_RECENT_MONTHS,
-        work_data_cache=work_data_cache,
-    )
+    # 월별 근무 합산: 고정된 마감 월은 월 롤업(SQLite), 나머지 월은 공유 월 그리드에서 (조회 월 수 제한은 설정)
+    # 고정은 매출도 읽어야 하므로 여기서는 하지 않고 연간 통계·배경 갱신에 맡긴다
+    month_names = work_history_month_sheet_names(ref, config.WORK_HISTORY_RECENT_MONTHS)
+    closed, live_rollups = _month_rollups(ref.year, month_names, freeze=False, with_sales=False)
+    all_data = {}
+    if closed:
+        stored = yearly_stats_snapshot.get_employee_rollups(employee_id, ref.year, config.YEARLY_STATS_SNAPSHOT_DB_PATH)
+        for mn in closed:
+            rollup = stored.get(config.MONTHS.index(mn) + 1)
+            if rollup and rollup['work_rows']:
+                all_data[mn] = rollup
+    for mn, by_eid in live_rollups.items():
+        rollup = by_eid.get(str(employee_id).strip())
+        if rollup and rollup['work_rows']:
+            all_data[mn] = rollup
     
     if not all_data:
         flash('근무 이력 데이터가 없습니다.', 'info')
         return render_template('work_history.html', chart_data=None)
     
-    # 데이터프레임 생성
+    # 월별 차트 데이터
     months = []
     work_days = []
     absent_days = []
@@ -1774,37 +1939,11 @@ def work_history():
         if month in all_data:
             data = all_data[month]
             months.append(month)
-            # 숫자로 변환 (문자열일 수 있음)
-            work_days_val = _get_sheet_metric(data, '근무일')
-            absent_days_val = _get_sheet_metric(data, '결근일')
-            try:
-                work_days.append(int(work_days_val) if work_days_val else 0)
-                absent_days.append(int(absent_days_val) if absent_days_val else 0)
-            except (ValueError, TypeError):
-                work_days.append(0)
-                absent_days.append(0)
-            
-            # R(예정일)과 휴가 개수 계산
-            scheduled_count = 0
-            holiday_count = _to_int_safe(data.get('휴가', 0))
-            for day in range(1, 32):
-                day_str = str(day)
-                if day_str in data:
-                    status_raw = str(data[day_str]).strip()
-                    # R은 대문자로 변환, /는 그대로 유지
-                    status = status_raw.upper() if status_raw.upper() == 'R' else status_raw
-                    if status == 'R':
-                        scheduled_count += 1
-            scheduled_days.append(scheduled_count)
-            holiday_days.append(holiday_count)
-    
-    df = pd.DataFrame({
-        '월': months,
-        '근무일': work_days,
-        '결근일': absent_days,
-        '예정일수': scheduled_days,
-        '휴가': holiday_days
-    })
+            work_days.append(data['work_days'])
+            absent_days.append(data['absent_days'])
+            # R(예정일)과 휴가 개수 (같은 사번 모든 행 합산)
+            scheduled_days.append(data['scheduled_days'])
+            holiday_days.append(data['vacation_days'])
     
     # 차트 데이터 생성
     chart_data = {
@@ -1816,8 +1955,7 @@ def work_history():
     }
     
     return render_template('work_history.html', 
-                         chart_data=chart_data,
-                         df=df)
+                         chart_data=chart_data)
 
 @app.route('/api/work-status/<int:day>', methods=['POST'])
 @require_login
@@ -1834,10 +1972,18 @@ def api_update_work_status(day):
         # 캐시 무효화
         work_data_cache.clear_pattern(f"work_data:{employee_id}:{month_name}")
         return jsonify({'success': True, 'message': '근무시작이 기록되었습니다.'})
+    elif sheets_quota.write_shed():
+        return jsonify({'success': False, 'retry': True, 'message': WRITE_BUSY_MESSAGE}), 503, {
+            'Retry-After': str(sheets_quota.retry_after('write'))
+        }
     else:
         return jsonify({'success': False, 'message': '근무시작 기록에 실패했습니다.'}), 400
 
+# 직전 워커가 종료하며 남긴 캐시를 되살리고(TTL·세대가 유효한 항목만), 이 워커도 종료할 때 남긴다
+cache_checkpoint.restore()
+atexit.register(cache_checkpoint.save_on_exit)
 start_yearly_stats_background_if_enabled(app)
+start_sheets_mirror_if_enabled()
 
 if __name__ == '__main__':
     # Cloudtype.io 등 클라우드 환경에서는 PORT 환경 변수 사용
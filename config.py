@@ -54,12 +54,25 @@ MONTHS = ['1월', '2월', '3월', '4월', '5월', '6월',
 WORK_HISTORY_RECENT_MONTHS = int(os.environ.get('WORK_HISTORY_RECENT_MONTHS', '12'))
 
 # Sheets 재시도/병렬: SHEETS_READ_RETRY_ATTEMPTS, SHEETS_429_BACKOFF_CAP_SEC, SHEETS_PARALLEL_MONTH_WORKERS
-# 메모리 캐시(TTL): WORK_DATA_* , SALES_* , WORK_START_* , ANNUAL_STATS_* , ACCOUNTS_* , NOTICE_CACHE_SECONDS
+# 메모리 캐시(TTL): WORK_DATA_* , SALES_* , WORK_START_* , ANNUAL_STATS_* , ACCOUNTS_* , NOTICE_CACHE_SECONDS ,
+#   APP_CACHE_MAX_ENTRIES , APP_CACHE_BACKEND(memory|sqlite) , APP_CACHE_DB_PATH , APP_CACHE_CHECKPOINT_PATH
 # /main 강제 갱신 제한: ALLOW_MAIN_FRESH_QUERY=0 또는 false / no / off
-# SQLite 연간 스냅샷: YEARLY_STATS_SNAPSHOT_DB_PATH , YEARLY_STATS_SNAPSHOT_TTL_SEC
+# SQLite 연간 스냅샷: YEARLY_STATS_SNAPSHOT_DB_PATH , YEARLY_STATS_SNAPSHOT_TTL_SEC , MONTHLY_ROLLUP_FREEZE_GRACE_DAYS
 # 선택 배경 갱신: YEARLY_STATS_BG_REFRESH_ENABLED , YEARLY_STATS_BG_REFRESH_INTERVAL_SEC
 # SWR 재패치: YEARLY_SWR_RECHECK_MS
 # batchGet chunk: SHEETS_WORK_BATCH_CHUNK
+# 없는 시트 제목 기억(시트 목록 재조회 억제): SHEETS_MISSING_SHEET_TTL_SEC
+# 선제 쿼터 제어(토큰 버킷): SHEETS_QUOTA_ENABLED , SHEETS_READ/WRITE_QUOTA_PER_MIN , DRIVE_QUOTA_PER_MIN ,
+#   SHEETS_QUOTA_MAX_WAIT_SEC , SHEETS_QUOTA_WRITE_MAX_WAIT_SEC , SHEETS_QUOTA_STALE_RESERVE , SHEETS_QUOTA_DB_PATH
+# 로컬 SQLite 미러: SHEETS_MIRROR_ENABLED , SHEETS_MIRROR_DB_PATH , SHEETS_MIRROR_SYNC_SECONDS ,
+#   SHEETS_MIRROR_FULL_SYNC_SECONDS , SHEETS_MIRROR_MAX_AGE_SEC
+# Drive version 재검증: SHEETS_REVALIDATE_ENABLED , SHEETS_REVISION_CHECK_SECONDS , SHEETS_REVALIDATE_MAX_AGE_SEC
+# 매출 꼬리 읽기 전체 재동기화: SALES_TAIL_FULL_RESYNC_SECONDS
+# 오프라인 대역 서버: GOOGLE_API_BASE_URL (예: http://127.0.0.1:8765, python -m tools.fake_google_api)
+# 지표 노출(/metrics): METRICS_ENABLED
+# Google API 연결 풀: GOOGLE_HTTP_POOL_SIZE , GOOGLE_HTTP_TIMEOUT_SEC
+# 서비스 계정 토큰 선제 갱신: GOOGLE_TOKEN_REFRESH_MARGIN_SEC
+# 워커 시작 캐시 예열(/readyz): WARMUP_ENABLED , WARMUP_QUOTA_RESERVE
 
 # Sheets 읽기 429 완화: 재시도·병렬·앱측 데이터 캐시 (초)
 # 재시도/sleep 합이 Gunicorn timeout(보통 30s)보다 크면 WORKER TIMEOUT 발생 → backoff 상한 필수.
@@ -71,18 +84,31 @@ SALES_SUMMARY_CACHE_SECONDS = max(30, min(3600, int(os.environ.get('SALES_SUMMAR
 WORK_START_INFO_CACHE_SECONDS = max(30, min(3600, int(os.environ.get('WORK_START_INFO_CACHE_SECONDS', '180'))))
 ANNUAL_STATS_CACHE_SECONDS = max(60, min(7200, int(os.environ.get('ANNUAL_STATS_CACHE_SECONDS', '300'))))
 ACCOUNTS_CACHE_SECONDS = max(60, min(7200, int(os.environ.get('ACCOUNTS_CACHE_SECONDS', '300'))))
+# 매출 월 시트 1행 헤더 (시트 매핑이 바뀌면 TTL 과 무관하게 다시 읽음)
+SALES_HEADER_CACHE_SECONDS = max(60, min(86400, int(os.environ.get('SALES_HEADER_CACHE_SECONDS', '3600'))))
 
 NOTICE_CACHE_SECONDS = max(30, min(7200, int(os.environ.get('NOTICE_CACHE_SECONDS', '120'))))
+# 메모리 캐시 하나당 최대 항목 수 (넘으면 가장 오래 안 쓴 항목부터 제거)
+APP_CACHE_MAX_ENTRIES = max(100, min(1000000, int(os.environ.get('APP_CACHE_MAX_ENTRIES', '20000'))))
+# 캐시 저장소: memory(워커별) | sqlite(APP_CACHE_DB_PATH 파일을 모든 gunicorn 워커가 공유 → 워커를 늘려도 Sheets 읽기 수 유지)
+APP_CACHE_BACKEND = (os.environ.get('APP_CACHE_BACKEND') or 'memory').strip().lower()
 
 _allow_main_fresh = (os.environ.get('ALLOW_MAIN_FRESH_QUERY') or '1').strip().lower()
 ALLOW_MAIN_FRESH_QUERY = _allow_main_fresh not in ('0', 'false', 'no', 'off')
 
 _PROJECT_ROOT = os.path.dirname(os.path.abspath(__file__))
+_default_app_cache_db = os.path.join(_PROJECT_ROOT, 'instance', 'app_cache.sqlite')
+APP_CACHE_DB_PATH = (os.environ.get('APP_CACHE_DB_PATH') or _default_app_cache_db).strip()
+# 워커 종료 때 메모리 캐시를 저장하고 다음 워커가 시작할 때 되살리는 체크포인트 파일 (빈 값이면 끔)
+_default_app_cache_checkpoint = os.path.join(_PROJECT_ROOT, 'instance', 'app_cache_checkpoint.json')
+APP_CACHE_CHECKPOINT_PATH = (os.environ.get('APP_CACHE_CHECKPOINT_PATH', _default_app_cache_checkpoint) or '').strip()
 _default_yearly_snap_db = os.path.join(_PROJECT_ROOT, 'instance', 'yearly_stats.sqlite')
 YEARLY_STATS_SNAPSHOT_DB_PATH = (os.environ.get('YEARLY_STATS_SNAPSHOT_DB_PATH') or _default_yearly_snap_db).strip()
 # 0 이면 스냅샷 기능 끔(항상 무거운 항목도 Sheets 재계산). 메모리(ANNUAL_STATS_CACHE_SECONDS) TTL이 여기 TTL보다
 # 크면 결과가 디스크 갱신보다 오래 머물 수 있다.
 YEARLY_STATS_SNAPSHOT_TTL_SEC = max(0, min(86400 * 30, int(os.environ.get('YEARLY_STATS_SNAPSHOT_TTL_SEC', '21600'))))
+# 월 롤업: 월이 끝나고 이 일수가 지나면(마감 후 정정 기간) 같은 DB 에 사번별 월 집계를 고정하고 다시 읽지 않음
+MONTHLY_ROLLUP_FREEZE_GRACE_DAYS = max(0, min(31, int(os.environ.get('MONTHLY_ROLLUP_FREEZE_GRACE_DAYS', '3'))))
 
 _bg_yearly = (os.environ.get('YEARLY_STATS_BG_REFRESH_ENABLED') or '0').strip().lower()
 YEARLY_STATS_BG_REFRESH_ENABLED = _bg_yearly in ('1', 'true', 'yes', 'on')
@@ -93,4 +119,67 @@ YEARLY_SWR_RECHECK_MS = max(500, min(60000, int(os.environ.get('YEARLY_SWR_RECHE
 
 # work/sales 각 스프레드시트 값 batchGet 한 요청당 최대 range 개수(URI·쿼터 안전)
 SHEETS_WORK_BATCH_CHUNK = max(1, min(200, int(os.environ.get('SHEETS_WORK_BATCH_CHUNK', '90'))))
-
+# 레지스트리에 없는 시트 제목(아직 만들지 않은 월 등)을 이 시간 동안 기억해, 조회마다 시트 목록을 다시 읽지 않음
+SHEETS_MISSING_SHEET_TTL_SEC = max(0, min(3600, int(os.environ.get('SHEETS_MISSING_SHEET_TTL_SEC', '300'))))
+
+# Sheets/Drive 선제 쿼터 제어 (utils/sheets_quota.py). 서비스 계정 1개 = 사용자 1명 기준 분당 한도.
+# 읽기·Drive 는 토큰이 없으면 SHEETS_QUOTA_MAX_WAIT_SEC 까지만 대기 후 호출 포기 → 캐시(stale)로 응답.
+# 쓰기(근무·매출 기록)는 쓰기 함수 호출마다 SHEETS_QUOTA_WRITE_MAX_WAIT_SEC 까지만 줄을 서고, 넘으면 '잠시 후 다시 시도' 응답.
+_quota_enabled = (os.environ.get('SHEETS_QUOTA_ENABLED') or '1').strip().lower()
+SHEETS_QUOTA_ENABLED = _quota_enabled not in ('0', 'false', 'no', 'off')
+SHEETS_READ_QUOTA_PER_MIN = max(1, min(6000, int(os.environ.get('SHEETS_READ_QUOTA_PER_MIN', '60'))))
+SHEETS_WRITE_QUOTA_PER_MIN = max(1, min(6000, int(os.environ.get('SHEETS_WRITE_QUOTA_PER_MIN', '60'))))
+DRIVE_QUOTA_PER_MIN = max(1, min(60000, int(os.environ.get('DRIVE_QUOTA_PER_MIN', '600'))))
+SHEETS_QUOTA_MAX_WAIT_SEC = max(0.0, min(30.0, float(os.environ.get('SHEETS_QUOTA_MAX_WAIT_SEC', '3.0'))))
+# 쓰기 함수 호출 1회(읽기+쓰기 전체)의 쿼터 대기 마감. API 응답 시간·429 재시도가 더해져도 워커가
+# gunicorn.conf.py timeout(GUNICORN_TIMEOUT)에 걸리지 않도록 timeout 의 1/4 이하로 제한한다.
+GUNICORN_TIMEOUT_SEC = max(30, min(600, int(os.environ.get('GUNICORN_TIMEOUT', '120'))))
+SHEETS_QUOTA_WRITE_MAX_WAIT_SEC = max(0.0, min(GUNICORN_TIMEOUT_SEC / 4.0, float(os.environ.get('SHEETS_QUOTA_WRITE_MAX_WAIT_SEC', '20.0'))))
+# 남은 토큰이 용량 × 이 비율 미만이면 만료 캐시가 있는 조회는 Sheets 대신 캐시로 응답
+SHEETS_QUOTA_STALE_RESERVE = max(0.0, min(1.0, float(os.environ.get('SHEETS_QUOTA_STALE_RESERVE', '0.2'))))
+# 워커 간 공유 버킷 파일 (빈 문자열이면 프로세스 메모리 버킷)
+_default_quota_db = os.path.join(_PROJECT_ROOT, 'instance', 'sheets_quota.sqlite')
+SHEETS_QUOTA_DB_PATH = (os.environ.get('SHEETS_QUOTA_DB_PATH', _default_quota_db) or '').strip()
+
+# work_DB/sales_DB 로컬 SQLite 미러 (utils/sheets_mirror.py). 켜면 조회는 미러, 쓰기는 Sheets + 미러 반영.
+_mirror_enabled = (os.environ.get('SHEETS_MIRROR_ENABLED') or '0').strip().lower()
+SHEETS_MIRROR_ENABLED = _mirror_enabled in ('1', 'true', 'yes', 'on')
+_default_mirror_db = os.path.join(_PROJECT_ROOT, 'instance', 'sheets_mirror.sqlite')
+SHEETS_MIRROR_DB_PATH = (os.environ.get('SHEETS_MIRROR_DB_PATH') or _default_mirror_db).strip()
+# 증분 동기화 간격(당월·전월 근무, 매출 꼬리 행, accounts·휴가신청·대차차량)
+SHEETS_MIRROR_SYNC_SECONDS = max(15, min(3600, int(os.environ.get('SHEETS_MIRROR_SYNC_SECONDS', '60'))))
+# 전체 월 재동기화 간격 (매출 행 수정·삭제 반영)
+SHEETS_MIRROR_FULL_SYNC_SECONDS = max(300, min(86400, int(os.environ.get('SHEETS_MIRROR_FULL_SYNC_SECONDS', '3600'))))
+# 마지막 동기화가 이보다 오래되면 미러 대신 Sheets 조회
+SHEETS_MIRROR_MAX_AGE_SEC = max(60, min(86400, int(os.environ.get('SHEETS_MIRROR_MAX_AGE_SEC', '900'))))
+
+# Drive version 기반 캐시 재검증: TTL 이 지나도 통합문서가 그대로면 항목을 연장(최대 SHEETS_REVALIDATE_MAX_AGE_SEC)
+_revalidate_enabled = (os.environ.get('SHEETS_REVALIDATE_ENABLED') or '1').strip().lower()
+SHEETS_REVALIDATE_ENABLED = _revalidate_enabled not in ('0', 'false', 'no', 'off')
+# 통합문서별 Drive 메타데이터 확인 간격 (이 시간 안의 재검증은 직전 결과 공유)
+SHEETS_REVISION_CHECK_SECONDS = max(2, min(600, int(os.environ.get('SHEETS_REVISION_CHECK_SECONDS', '15'))))
+SHEETS_REVALIDATE_MAX_AGE_SEC = max(60, min(86400, int(os.environ.get('SHEETS_REVALIDATE_MAX_AGE_SEC', '3600'))))
+
+# 매출 월 시트 꼬리 읽기: 이 간격마다 A:N 전체를 다시 읽어 중간 행 수정·삭제 반영
+SALES_TAIL_FULL_RESYNC_SECONDS = max(300, min(86400, int(os.environ.get('SALES_TAIL_FULL_RESYNC_SECONDS', '1800'))))
+
+# Google API 연결: gspread(requests) 연결 풀 크기 — gthread 워커의 threads 이상으로, httplib2 요청 타임아웃(초)
+GOOGLE_HTTP_POOL_SIZE = max(1, min(128, int(os.environ.get('GOOGLE_HTTP_POOL_SIZE', '16'))))
+GOOGLE_HTTP_TIMEOUT_SEC = max(5, min(300, int(os.environ.get('GOOGLE_HTTP_TIMEOUT_SEC', '60'))))
+# 액세스 토큰 만료 이 초 전에 백그라운드 스레드가 미리 갱신. google-auth 는 만료 225초 전부터 요청 스레드에서
+# 갱신하므로 그보다 커야 요청이 토큰 발급을 기다리지 않는다 (240~1800).
+GOOGLE_TOKEN_REFRESH_MARGIN_SEC = max(240, min(1800, int(os.environ.get('GOOGLE_TOKEN_REFRESH_MARGIN_SEC', '300'))))
+
+# 오프라인 대역 서버 (tools/fake_google_api.py) 주소. 지정하면 Sheets/Drive 요청을 모두 이 서버로 보내고 인증을 생략.
+GOOGLE_API_BASE_URL = (os.environ.get('GOOGLE_API_BASE_URL') or '').strip()
+
+# /metrics (Prometheus text format) — Sheets 호출 지연·429·캐시 적중률·라우트 지연. 끄려면 METRICS_ENABLED=0
+_metrics_enabled = (os.environ.get('METRICS_ENABLED') or '1').strip().lower()
+METRICS_ENABLED = _metrics_enabled not in ('0', 'false', 'no', 'off')
+
+# 워커 시작 캐시 예열 — gunicorn post_worker_init(없으면 첫 요청)에서 계정·이번/지난달 근무·매출·공지 목록을
+# 백그라운드로 미리 읽는다. 끝나면 /readyz 가 200. 끄려면 WARMUP_ENABLED=0 (그때는 바로 준비 완료).
+_warmup_enabled = (os.environ.get('WARMUP_ENABLED') or '1').strip().lower()
+WARMUP_ENABLED = _warmup_enabled not in ('0', 'false', 'no', 'off')
+# 예열 단계마다 버킷 토큰이 용량의 이 비율 이상 남아 있을 때만 읽음 (나머지는 기사 요청 몫으로 남김)
+WARMUP_QUOTA_RESERVE = max(0.0, min(1.0, float(os.environ.get('WARMUP_QUOTA_RESERVE', '0.5'))))
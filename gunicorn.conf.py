@@ -2,11 +2,35 @@
 # 시작 예: gunicorn -c gunicorn.conf.py app:app
 # 기본 timeout(30초)이면 Sheets 429 재시도 중 워커가 막혀 WORKER TIMEOUT → SIGKILL 이 납니다.
 
+import os
+
 bind = "0.0.0.0:5000"
-workers = 1
-worker_class = "sync"
-timeout = 120
+# 캐시가 워커마다 따로면 워커 수만큼 Sheets 읽기가 늘어난다.
+# 2 이상으로 올릴 때는 APP_CACHE_BACKEND=sqlite (공유 캐시 파일) 와 함께 쓴다.
+workers = int(os.environ.get("WEB_CONCURRENCY", "1"))
+# gthread 로 워커 하나가 여러 기사 요청을 동시에 처리 (Sheets 대기 중에도 다른 요청 응답).
+# Google API 클라이언트는 스레드별 연결을 쓰므로 GUNICORN_THREADS 를 늘려도 안전하다.
+threads = int(os.environ.get("GUNICORN_THREADS", "1"))
+worker_class = os.environ.get("GUNICORN_WORKER_CLASS", "gthread" if threads > 1 else "sync")
+# config.GUNICORN_TIMEOUT_SEC 와 같은 값 (쓰기 쿼터 대기 상한이 이 값을 기준으로 잡힌다)
+timeout = max(30, min(600, int(os.environ.get("GUNICORN_TIMEOUT", "120"))))
 graceful_timeout = 30
 keepalive = 5
 max_requests = 500
 max_requests_jitter = 50
+
+
+def post_worker_init(worker):
+    """워커가 앱을 불러온 직후 캐시 예열 시작 — 재시작(max_requests) 직후 기사들이 각자 시트를 읽지 않게.
+
+    예열은 백그라운드 스레드라 요청 처리는 바로 시작한다. 진행 상태는 /readyz."""
+    from app import start_cache_warmup
+
+    start_cache_warmup()
+
+
+def worker_exit(server, worker):
+    """워커 종료(max_requests 재시작·배포) 때 메모리 캐시를 체크포인트 파일로 저장 — 다음 워커가 이어받는다."""
+    from utils import cache_checkpoint
+
+    cache_checkpoint.save_on_exit()
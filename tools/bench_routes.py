@@ -0,0 +1,212 @@
+"""주요 화면 라우트 벤치마크 + Sheets 호출 예산 검사.
+
+tools/fake_google_api.py 의 합성 통합문서(기본 기사 300명 · 12개월 · 매출 10,000행)를 같은 프로세스에서
+띄우고, Flask test client 로 로그인부터 근무종료까지 한 기사의 흐름을 두 번(cold → warm) 돈다.
+요청마다 소요 시간, 파이썬 메모리 최고치(tracemalloc), 대역 서버가 받은 Sheets 읽기·쓰기·Drive 호출 수를
+기록하고, BUDGETS 의 호출 수를 넘는 요청이 있으면 종료 코드 1 로 끝난다.
+요청이 띄운 백그라운드 재계산(yearly-swr-*)이 끝날 때까지 기다려 그 호출도 해당 요청에 포함한다.
+
+사용:
+    python -m tools.bench_routes
+    python -m tools.bench_routes --drivers 300 --sales-rows 10000 --latency-ms 80 --json bench.json
+
+성능 개선으로 호출 수가 줄었으면 BUDGETS 도 같이 낮춰 개선이 되돌아가지 않게 한다."""
+import argparse
+import json
+import os
+import sys
+import tempfile
+import threading
+import time
+import tracemalloc
+
+# (단계, 패스) → (Sheets 읽기, Sheets 쓰기) 상한. Drive 호출은 기록만 한다.
+BUDGETS = {
+    ('login', 'cold'): (4, 0),
+    ('main', 'cold'): (3, 0),
+    ('calendar', 'cold'): (0, 0),
+    ('work_start_get', 'cold'): (0, 0),
+    ('work_start_post', 'cold'): (1, 1),
+    ('work_end_step2_get', 'cold'): (1, 0),
+    ('work_end_step2_post', 'cold'): (3, 1),
+    ('work_history', 'cold'): (1, 0),
+    ('api_main_yearly_stats', 'cold'): (2, 0),
+    ('login', 'warm'): (0, 0),
+    ('main', 'warm'): (0, 0),
+    ('calendar', 'warm'): (0, 0),
+    ('work_start_get', 'warm'): (0, 0),
+    ('work_start_post', 'warm'): (1, 1),
+    ('work_end_step2_get', 'warm'): (0, 0),
+    ('work_end_step2_post', 'warm'): (1, 1),
+    ('work_history', 'warm'): (0, 0),
+    ('api_main_yearly_stats', 'warm'): (1, 0),
+}
+
+# 요청이 끝난 뒤에도 호출을 이어가는 백그라운드 스레드 이름 접두사
+_BACKGROUND_THREAD_PREFIXES = ('yearly-swr-',)
+
+
+def _prepare_environment(workdir, base_url, quota):
+    """app·config 를 불러오기 전에 환경 변수 설정 (SQLite 파일은 임시 디렉터리, 배경 갱신 끔)."""
+    os.environ['GOOGLE_API_BASE_URL'] = base_url
+    os.environ['YEARLY_STATS_SNAPSHOT_DB_PATH'] = os.path.join(workdir, 'yearly_stats_snapshot.sqlite')
+    os.environ['SHEETS_QUOTA_DB_PATH'] = os.path.join(workdir, 'sheets_quota.sqlite')
+    os.environ['SHEETS_MIRROR_DB_PATH'] = os.path.join(workdir, 'sheets_mirror.sqlite')
+    os.environ['APP_CACHE_DB_PATH'] = os.path.join(workdir, 'app_cache.sqlite')
+    os.environ['APP_CACHE_CHECKPOINT_PATH'] = os.path.join(workdir, 'app_cache_checkpoint.json')
+    os.environ['YEARLY_STATS_BG_REFRESH_ENABLED'] = '0'
+    os.environ['SHEETS_MIRROR_ENABLED'] = '0'
+    # 예열 읽기가 라우트별 호출 수에 섞이지 않게 끈다
+    os.environ['WARMUP_ENABLED'] = '0'
+    # 앱 쪽 토큰 버킷은 기본으로 끈다 (대기 시간이 벤치마크 시간에 섞이지 않게)
+    os.environ['SHEETS_QUOTA_ENABLED'] = '1' if quota else '0'
+
+
+def _wait_background(timeout=60.0):
+    deadline = time.time() + timeout
+    for t in threading.enumerate():
+        if t.name.startswith(_BACKGROUND_THREAD_PREFIXES):
+            t.join(max(0.0, deadline - time.time()))
+
+
+def _assigned_row(state, employee_id, month_name):
+    """합성 work_DB 월 시트에서 기사 행 → (차량번호, 근무유형)."""
+    import config
+
+    sheet = state.workbooks[config.SPREADSHEET_ID].sheet(month_name)
+    header = sheet.rows[0]
+    for row in sheet.rows[1:]:
+        if str(row[header.index('사번')]) == employee_id:
+            return row[header.index('차량번호')], row[header.index('근무유형')]
+    return '', '주간'
+
+
+def _steps(client, employee_id, password, today, vehicle_number, work_type):
+    """(단계 이름, 요청 함수) 목록 — 한 기사의 하루 흐름."""
+    def login():
+        return client.post('/login', data={'employee_id': employee_id, 'password': password})
+
+    def work_end_step2_get():
+        with client.session_transaction() as sess:
+            sess['work_end_step1'] = {
+                'vehicle_number': vehicle_number, 'work_type': work_type, 'accident_status': '무사고',
+                'special_notes': '',
+            }
+        return client.get('/work-end-step2')
+
+    return [
+        ('login', login),
+        ('main', lambda: client.get('/main')),
+        ('calendar', lambda: client.get('/calendar')),
+        ('work_start_get', lambda: client.get('/work-start')),
+        ('work_start_post', lambda: client.post('/work-start', data={
+            'selected_date': today.isoformat(), 'vehicle_number': vehicle_number, 'work_type': work_type,
+        })),
+        ('work_end_step2_get', work_end_step2_get),
+        ('work_end_step2_post', lambda: client.post('/work-end-step2', data={
+            'cash_fare': '12,000', 'card_fare': '34,000', 'toll_fee': '0', 'fuel_usage': '20', 'fuel_cost': '30,000',
+        })),
+        ('work_history', lambda: client.get('/work-history')),
+        ('api_main_yearly_stats', lambda: client.get('/api/main-yearly-stats')),
+    ]
+
+
+def run(drivers=300, sales_rows=10000, latency_ms=0.0, employee_index=0, quota=False):
+    """벤치마크 실행 → 결과 dict 목록 (단계·패스별 시간·메모리·호출 수·예산 초과 여부)."""
+    workdir = tempfile.mkdtemp(prefix='bench_routes_')
+    # config 는 fake 서버 모듈이 먼저 불러오므로, 주소를 알기 전에 임시 값으로 환경을 잡고 서버 시작 뒤 덮어쓴다
+    _prepare_environment(workdir, 'http://127.0.0.1:0', quota)
+    from tools.fake_google_api import (
+        FakeGoogleState, SYNTHETIC_PASSWORD, build_synthetic_state, start_fake_server, synthetic_employee_ids,
+    )
+    import config
+
+    state = build_synthetic_state(FakeGoogleState(latency_ms=latency_ms), drivers=drivers, sales_rows=sales_rows)
+    server, url = start_fake_server(state)
+    os.environ['GOOGLE_API_BASE_URL'] = url
+    config.GOOGLE_API_BASE_URL = url
+
+    import app as app_module
+
+    app_module.app.config['TESTING'] = True
+    client = app_module.app.test_client()
+    employee_id = synthetic_employee_ids(drivers)[employee_index]
+    today = app_module.get_kst_now().date()
+    vehicle_number, work_type = _assigned_row(state, employee_id, config.MONTHS[today.month - 1])
+
+    results = []
+    tracemalloc.start()
+    try:
+        for phase in ('cold', 'warm'):
+            for name, call in _steps(client, employee_id, SYNTHETIC_PASSWORD, today, vehicle_number, work_type):
+                state.reset_stats()
+                tracemalloc.reset_peak()
+                base_mem = tracemalloc.get_traced_memory()[0]
+                started = time.perf_counter()
+                response = call()
+                elapsed = time.perf_counter() - started
+                _wait_background()
+                peak = tracemalloc.get_traced_memory()[1] - base_mem
+                stats = dict(state.stats)
+                reads_budget, writes_budget = BUDGETS.get((name, phase), (None, None))
+                over = (
+                    (reads_budget is not None and stats['reads'] > reads_budget)
+                    or (writes_budget is not None and stats['writes'] > writes_budget)
+                )
+                results.append({
+                    'step': name,
+                    'phase': phase,
+                    'status': response.status_code,
+                    'ms': round(elapsed * 1000, 1),
+                    'peak_kb': round(peak / 1024, 1),
+                    'reads': stats['reads'],
+                    'writes': stats['writes'],
+                    'drive': stats['drive'],
+                    'throttled': stats['throttled'],
+                    'calls': dict(stats['calls']),
+                    'budget': [reads_budget, writes_budget],
+                    'over_budget': bool(over),
+                })
+    finally:
+        tracemalloc.stop()
+        server.shutdown()
+    return results
+
+
+def _print_table(results):
+    print(f"{'step':<24}{'phase':<6}{'status':>7}{'ms':>10}{'peak KB':>10}{'reads':>7}{'writes':>7}{'drive':>7}  budget")
+    for r in results:
+        reads_budget, writes_budget = r['budget']
+        budget = '-' if reads_budget is None else f'{reads_budget}/{writes_budget}'
+        mark = '  OVER' if r['over_budget'] else ''
+        print(f"{r['step']:<24}{r['phase']:<6}{r['status']:>7}{r['ms']:>10.1f}{r['peak_kb']:>10.1f}"
+              f"{r['reads']:>7}{r['writes']:>7}{r['drive']:>7}  {budget}{mark}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='라우트 벤치마크 (Sheets 호출 예산 검사)')
+    parser.add_argument('--drivers', type=int, default=300)
+    parser.add_argument('--sales-rows', type=int, default=10000)
+    parser.add_argument('--latency-ms', type=float, default=0, help='대역 서버 요청당 지연')
+    parser.add_argument('--employee-index', type=int, default=0, help='로그인할 합성 기사 순번')
+    parser.add_argument('--quota', action='store_true', help='앱 토큰 버킷(SHEETS_QUOTA_ENABLED) 켜고 측정')
+    parser.add_argument('--json', dest='json_path', help='결과를 JSON 파일로 저장')
+    args = parser.parse_args()
+
+    results = run(
+        drivers=args.drivers, sales_rows=args.sales_rows, latency_ms=args.latency_ms,
+        employee_index=args.employee_index, quota=args.quota,
+    )
+    _print_table(results)
+    if args.json_path:
+        with open(args.json_path, 'w', encoding='utf-8') as f:
+            json.dump(results, f, ensure_ascii=False, indent=2)
+    failed = [r for r in results if r['over_budget'] or r['status'] >= 500]
+    if failed:
+        print(f"예산 초과·오류 {len(failed)}건: " + ', '.join(f"{r['step']}({r['phase']})" for r in failed))
+        return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,184 @@
+"""워커 부팅 벤치마크: 새 파이썬 프로세스가 app 을 불러와 첫 /login 을 처리하기까지의 시간.
+
+gunicorn 은 max_requests 마다 워커를 새로 띄우므로, 그때마다 드는 import 시간과 첫 로그인 지연을 잰다.
+tools/fake_google_api.py 대역 서버를 이 프로세스에서 띄우고, 자식 프로세스를 --runs 번 새로 실행해
+단계별 시간을 측정한다.
+  ready_ms : 프로세스 시작(인터프리터 포함)부터 첫 GET /login 응답까지 — 워커가 요청을 받을 수 있게 되는 시간
+  import_ms · login_get_ms · login_post_ms : 단계별 (POST 는 bcrypt 확인 포함)
+  total_ms : 프로세스 시작부터 종료까지 (종료 때 체크포인트 저장 포함)
+
+  cold     : 캐시 체크포인트 없이 시작 (배포 직후 첫 워커)
+  recycled : 앞선 워커가 종료하며 남긴 캐시 체크포인트(APP_CACHE_CHECKPOINT_PATH)가 있는 상태 (재활용된 워커)
+
+recycled 의 ready_ms 중앙값이 --budget-ms 를 넘으면 종료 코드 1.
+
+사용:
+    python -m tools.bench_startup
+    python -m tools.bench_startup --runs 10 --latency-ms 80 --json startup.json
+    python -m tools.bench_startup --importtime   # 느린 모듈 상위 목록 (python -X importtime)"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+_PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+PHASES = ('ready_ms', 'import_ms', 'login_get_ms', 'login_post_ms', 'total_ms')
+
+
+def _child(employee_id, password):
+    """자식 프로세스: 단계별 시간을 JSON 한 줄로 출력."""
+    started = time.perf_counter()
+    import app as app_module
+
+    imported = time.perf_counter()
+    client = app_module.app.test_client()
+    get_status = client.get('/login').status_code
+    got = time.perf_counter()
+    got_wall = time.time()
+    post = client.post('/login', data={'employee_id': employee_id, 'password': password})
+    posted = time.perf_counter()
+    print(json.dumps({
+        'import_ms': round((imported - started) * 1000, 1),
+        'login_get_ms': round((got - imported) * 1000, 1),
+        'login_post_ms': round((posted - got) * 1000, 1),
+        'login_get_done_at': got_wall,
+        'status': [get_status, post.status_code],
+        'logged_in': post.status_code == 302 and '/login' not in post.headers.get('Location', ''),
+        'heavy_modules': sorted(m for m in ('pandas', 'googleapiclient.discovery', 'plotly') if m in sys.modules),
+    }))
+
+
+def _spawn(env, employee_id, password, importtime=False):
+    cmd = [sys.executable]
+    if importtime:
+        cmd += ['-X', 'importtime']
+    cmd += ['-m', 'tools.bench_startup', '--child', employee_id, password]
+    started_wall = time.time()
+    started = time.perf_counter()
+    proc = subprocess.run(cmd, cwd=_PROJECT_ROOT, env=env, capture_output=True, text=True, timeout=120)
+    elapsed = time.perf_counter() - started
+    if proc.returncode != 0:
+        raise RuntimeError(f'자식 프로세스 실패 (code {proc.returncode}):\n{proc.stderr[-2000:]}')
+    # 앱 로그(print)가 섞여 나오므로 결과 JSON 줄만 고른다
+    result = json.loads([line for line in proc.stdout.splitlines() if line.startswith('{')][-1])
+    result['total_ms'] = round(elapsed * 1000, 1)
+    result['ready_ms'] = round((result.pop('login_get_done_at') - started_wall) * 1000, 1)
+    return result, proc.stderr
+
+
+def _environment(workdir, url, scenario):
+    env = dict(os.environ)
+    env.update({
+        'GOOGLE_API_BASE_URL': url,
+        'YEARLY_STATS_SNAPSHOT_DB_PATH': os.path.join(workdir, 'yearly_stats_snapshot.sqlite'),
+        'SHEETS_QUOTA_DB_PATH': os.path.join(workdir, 'sheets_quota.sqlite'),
+        'SHEETS_MIRROR_DB_PATH': os.path.join(workdir, 'sheets_mirror.sqlite'),
+        'APP_CACHE_DB_PATH': os.path.join(workdir, 'app_cache.sqlite'),
+        'APP_CACHE_BACKEND': 'memory',
+        'APP_CACHE_CHECKPOINT_PATH': os.path.join(workdir, 'app_cache_checkpoint.json') if scenario == 'recycled' else '',
+        'YEARLY_STATS_BG_REFRESH_ENABLED': '0',
+        'SHEETS_MIRROR_ENABLED': '0',
+        # 예열(백그라운드)이 첫 로그인 시간·읽기 수에 섞이지 않게 끈다
+        'WARMUP_ENABLED': '0',
+    })
+    return env
+
+
+def _top_imports(stderr, limit=15):
+    """-X importtime 출력 → 누적 시간 상위 (모듈, ms)."""
+    rows = []
+    for line in stderr.splitlines():
+        if not line.startswith('import time:') or '|' not in line:
+            continue
+        parts = [p.strip() for p in line[len('import time:'):].split('|')]
+        if parts[1].isdigit():
+            rows.append((parts[2], int(parts[1]) / 1000))
+    return sorted(rows, key=lambda r: -r[1])[:limit]
+
+
+def run(runs=5, drivers=300, latency_ms=0.0, importtime=False):
+    """시나리오별 측정 결과 {'cold': [...], 'recycled': [...]} (+ importtime 이면 'imports')."""
+    os.environ.setdefault('GOOGLE_API_BASE_URL', 'http://127.0.0.1:0')
+    from tools.fake_google_api import (
+        FakeGoogleState, SYNTHETIC_PASSWORD, build_synthetic_state, start_fake_server, synthetic_employee_ids,
+    )
+
+    state = build_synthetic_state(FakeGoogleState(latency_ms=latency_ms), drivers=drivers, sales_rows=100)
+    server, url = start_fake_server(state)
+    employee_id = synthetic_employee_ids(drivers)[0]
+    results = {}
+    try:
+        for scenario in ('cold', 'recycled'):
+            workdir = tempfile.mkdtemp(prefix=f'bench_startup_{scenario}_')
+            env = _environment(workdir, url, scenario)
+            if scenario == 'recycled':
+                # 앞선 워커가 체크포인트를 남긴 상태를 만든다 (측정에는 넣지 않음)
+                _spawn(env, employee_id, SYNTHETIC_PASSWORD)
+            samples = []
+            for _ in range(runs):
+                state.reset_stats()
+                sample, _ = _spawn(env, employee_id, SYNTHETIC_PASSWORD)
+                sample['reads'] = state.stats['reads']
+                samples.append(sample)
+            results[scenario] = samples
+        if importtime:
+            env = _environment(tempfile.mkdtemp(prefix='bench_startup_imports_'), url, 'cold')
+            _, stderr = _spawn(env, employee_id, SYNTHETIC_PASSWORD, importtime=True)
+            results['imports'] = _top_imports(stderr)
+    finally:
+        server.shutdown()
+    return results
+
+
+def _median(samples, key):
+    return statistics.median(s[key] for s in samples)
+
+
+def _print_summary(results):
+    print(f"{'scenario':<10}" + ''.join(f'{p:>15}' for p in PHASES) + f"{'reads':>7}  heavy modules")
+    for scenario in ('cold', 'recycled'):
+        samples = results[scenario]
+        heavy = ','.join(samples[-1]['heavy_modules']) or '-'
+        print(f'{scenario:<10}' + ''.join(f'{_median(samples, p):>15.1f}' for p in PHASES)
+              + f"{_median(samples, 'reads'):>7.0f}  {heavy}")
+    if 'imports' in results:
+        print('\n누적 import 시간 상위 (ms):')
+        for module, ms in results['imports']:
+            print(f'  {ms:>8.1f}  {module}')
+
+
+def main():
+    if len(sys.argv) == 4 and sys.argv[1] == '--child':
+        _child(sys.argv[2], sys.argv[3])
+        return 0
+    parser = argparse.ArgumentParser(description='워커 부팅·첫 /login 시간 측정')
+    parser.add_argument('--runs', type=int, default=5, help='시나리오별 프로세스 실행 횟수 (중앙값 보고)')
+    parser.add_argument('--drivers', type=int, default=300)
+    parser.add_argument('--latency-ms', type=float, default=0, help='대역 서버 요청당 지연')
+    parser.add_argument('--budget-ms', type=float, default=1000, help='recycled ready_ms 중앙값 상한')
+    parser.add_argument('--importtime', action='store_true', help='python -X importtime 상위 모듈도 출력')
+    parser.add_argument('--json', dest='json_path', help='결과를 JSON 파일로 저장')
+    args = parser.parse_args()
+
+    results = run(runs=args.runs, drivers=args.drivers, latency_ms=args.latency_ms, importtime=args.importtime)
+    _print_summary(results)
+    if args.json_path:
+        with open(args.json_path, 'w', encoding='utf-8') as f:
+            json.dump(results, f, ensure_ascii=False, indent=2)
+    failed = [s for samples in (results['cold'], results['recycled']) for s in samples if not s['logged_in']]
+    if failed:
+        print(f'로그인 실패 {len(failed)}건')
+        return 1
+    recycled = _median(results['recycled'], 'ready_ms')
+    if recycled > args.budget_ms:
+        print(f'recycled 부팅~첫 /login {recycled:.0f}ms > 예산 {args.budget_ms:.0f}ms')
+        return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
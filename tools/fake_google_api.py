@@ -0,0 +1,607 @@
+"""Google Sheets v4 / Drive v3 오프라인 대역 서버 (벤치마크·부하 테스트용).
+
+utils/google_sheets.py 와 app.py 가 실제로 쓰는 엔드포인트만 메모리 위에서 흉내 낸다.
+  - Sheets: spreadsheets.get(메타데이터·메모), values.get / batchGet / append / update / batchUpdate,
+    spreadsheets.batchUpdate(updateCells · appendCells · deleteDimension)
+  - Drive: files.list(부모 폴더), files.get(메타데이터 · alt=media)
+요청마다 지연(--latency-ms ± --jitter-ms)을 주고, 분당 읽기·쓰기 한도나 무작위 비율로 429 를 돌려준다.
+
+사용:
+    python -m tools.fake_google_api --port 8765 --synthetic --latency-ms 80 --read-quota-per-min 60
+    GOOGLE_API_BASE_URL=http://127.0.0.1:8765 python run.py
+
+GET /__fake/stats 는 연산별 호출 수, POST /__fake/reset 은 카운터 초기화."""
+import argparse
+import json
+import random
+import re
+import threading
+import time
+from datetime import date, datetime, timedelta, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, unquote, urlparse
+
+import bcrypt
+
+import config
+
+_A1_CELL = re.compile(r'^([A-Za-z]*)(\d*)$')
+
+
+def _col_index(letters):
+    """'A' → 0, 'AM' → 38."""
+    n = 0
+    for ch in letters.upper():
+        n = n * 26 + (ord(ch) - 64)
+    return n - 1
+
+
+def _col_letters(idx):
+    idx += 1
+    out = ''
+    while idx:
+        idx, rem = divmod(idx - 1, 26)
+        out = chr(65 + rem) + out
+    return out
+
+
+def _split_range(a1):
+    """"'1월'!A3:N" → ('1월', 'A3:N'). 시트 이름만 있으면 범위는 ''."""
+    if not a1.startswith("'"):
+        title, _, cells = a1.partition('!')
+        return title, cells
+    end = a1.index("'", 1)
+    while end + 1 < len(a1) and a1[end + 1] == "'":
+        end = a1.index("'", end + 2)
+    return a1[1:end].replace("''", "'"), a1[end + 1:].lstrip('!')
+
+
+def _parse_bounds(cells):
+    """'A3:N' → (행 시작, 행 끝, 열 시작, 열 끝) 0-base, 끝은 포함·None 이면 끝까지."""
+    if not cells:
+        return 0, None, 0, None
+    start, _, end = cells.partition(':')
+    m1 = _A1_CELL.match(start)
+    m2 = _A1_CELL.match(end or start)
+    r0 = int(m1.group(2)) - 1 if m1.group(2) else 0
+    c0 = _col_index(m1.group(1)) if m1.group(1) else 0
+    r1 = int(m2.group(2)) - 1 if m2.group(2) else None
+    c1 = _col_index(m2.group(1)) if m2.group(1) else None
+    return r0, r1, c0, c1
+
+
+def _cell_text(value):
+    if value is None:
+        return ''
+    if isinstance(value, bool):
+        return 'TRUE' if value else 'FALSE'
+    if isinstance(value, float) and value.is_integer():
+        return str(int(value))
+    return str(value)
+
+
+class FakeSheet:
+    def __init__(self, sheet_id, title, rows=None, row_count=1000, col_count=40):
+        self.sheet_id = sheet_id
+        self.title = title
+        self.rows = [list(r) for r in (rows or [])]
+        self.notes = {}  # (행, 열) 0-base → 메모
+        self.row_count = max(row_count, len(self.rows))
+        self.col_count = max([col_count] + [len(r) for r in self.rows])
+
+    def last_data_row(self):
+        for i in range(len(self.rows) - 1, -1, -1):
+            if any(_cell_text(v) for v in self.rows[i]):
+                return i + 1
+        return 0
+
+    def set_cell(self, r, c, value):
+        while len(self.rows) <= r:
+            self.rows.append([])
+        row = self.rows[r]
+        while len(row) <= c:
+            row.append('')
+        row[c] = value
+        self.row_count = max(self.row_count, r + 1)
+        self.col_count = max(self.col_count, c + 1)
+
+    def read(self, r0, r1, c0, c1):
+        """범위 값 (실제 API 처럼 뒤쪽 빈 칸·빈 행은 잘라냄)."""
+        end_row = min(self.last_data_row(), self.row_count) if r1 is None else min(r1 + 1, len(self.rows))
+        out = []
+        for r in range(r0, end_row):
+            row = self.rows[r] if r < len(self.rows) else []
+            cells = [_cell_text(v) for v in row[c0:(None if c1 is None else c1 + 1)]]
+            while cells and cells[-1] == '':
+                cells.pop()
+            out.append(cells)
+        while out and not out[-1]:
+            out.pop()
+        return out
+
+    def properties(self, index):
+        return {
+            'sheetId': self.sheet_id,
+            'title': self.title,
+            'index': index,
+            'sheetType': 'GRID',
+            'gridProperties': {'rowCount': self.row_count, 'columnCount': self.col_count},
+        }
+
+
+class FakeWorkbook:
+    def __init__(self, spreadsheet_id, title):
+        self.id = spreadsheet_id
+        self.title = title
+        self.sheets = []
+        self.version = 1
+        self.modified = datetime.now(timezone.utc)
+
+    def add_sheet(self, title, rows, **kwargs):
+        sheet = FakeSheet(len(self.sheets) * 1000 + 7, title, rows, **kwargs)
+        self.sheets.append(sheet)
+        return sheet
+
+    def sheet(self, title=None, sheet_id=None):
+        for s in self.sheets:
+            if (title is not None and s.title == title) or (sheet_id is not None and s.sheet_id == sheet_id):
+                return s
+        raise KeyError(title if title is not None else sheet_id)
+
+    def touch(self):
+        self.version += 1
+        self.modified = datetime.now(timezone.utc)
+
+    def drive_meta(self):
+        return {
+            'id': self.id,
+            'name': self.title,
+            'mimeType': 'application/vnd.google-apps.spreadsheet',
+            'version': str(self.version),
+            'modifiedTime': self.modified.isoformat().replace('+00:00', 'Z'),
+            'parents': [],
+        }
+
+
+class QuotaExceeded(Exception):
+    pass
+
+
+class FakeGoogleState:
+    """서버 전체 상태: 통합문서, Drive 파일, 지연·쿼터 설정, 호출 카운터."""
+
+    def __init__(self, latency_ms=0, jitter_ms=0, read_quota_per_min=0, write_quota_per_min=0, error_rate=0.0):
+        self.lock = threading.RLock()
+        self.workbooks = {}
+        self.files = {}
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.read_quota_per_min = read_quota_per_min
+        self.write_quota_per_min = write_quota_per_min
+        self.error_rate = error_rate
+        self._windows = {'read': [], 'write': []}
+        self.reset_stats()
+
+    def reset_stats(self):
+        with self.lock:
+            self.stats = {'calls': {}, 'reads': 0, 'writes': 0, 'drive': 0, 'throttled': 0}
+            self._windows = {'read': [], 'write': []}
+
+    def add_workbook(self, spreadsheet_id, title):
+        wb = FakeWorkbook(spreadsheet_id, title)
+        self.workbooks[spreadsheet_id] = wb
+        return wb
+
+    def add_file(self, file_id, name, parents, content=b'', mime_type='application/pdf'):
+        self.files[file_id] = {
+            'id': file_id, 'name': name, 'parents': list(parents), 'mimeType': mime_type,
+            'content': content, 'version': '1',
+            'modifiedTime': datetime.now(timezone.utc).isoformat().replace('+00:00', 'Z'),
+        }
+
+    def admit(self, op, kind):
+        """호출 기록 + 지연 + 429 판정. kind: 'read' | 'write' | 'drive'."""
+        with self.lock:
+            calls = self.stats['calls']
+            calls[op] = calls.get(op, 0) + 1
+            if kind == 'drive':
+                self.stats['drive'] += 1
+            else:
+                self.stats[kind + 's'] += 1
+            throttled = self.error_rate and random.random() < self.error_rate
+            limit = {'read': self.read_quota_per_min, 'write': self.write_quota_per_min}.get(kind, 0)
+            if limit and not throttled:
+                now = time.time()
+                window = [t for t in self._windows[kind] if now - t < 60.0]
+                throttled = len(window) >= limit
+                if not throttled:
+                    window.append(now)
+                self._windows[kind] = window
+            if throttled:
+                self.stats['throttled'] += 1
+        if self.latency_ms or self.jitter_ms:
+            time.sleep(max(0.0, self.latency_ms + random.uniform(-self.jitter_ms, self.jitter_ms)) / 1000.0)
+        if throttled:
+            raise QuotaExceeded(op)
+
+    # ----- Sheets -----
+    def spreadsheet_get(self, ssid, ranges, fields, include_grid):
+        wb = self.workbooks[ssid]
+        sheets = []
+        by_title = {}
+        for idx, s in enumerate(wb.sheets):
+            entry = {'properties': s.properties(idx)}
+            sheets.append(entry)
+            by_title[s.title] = entry
+        if ranges and (include_grid or 'data' in (fields or '')):
+            for a1 in ranges:
+                title, cells = _split_range(a1)
+                sheet = wb.sheet(title)
+                r0, r1, c0, c1 = _parse_bounds(cells)
+                last_r = (min(sheet.last_data_row(), sheet.row_count) - 1) if r1 is None else r1
+                last_c = (sheet.col_count - 1) if c1 is None else c1
+                row_data = []
+                for r in range(r0, last_r + 1):
+                    values = []
+                    for c in range(c0, last_c + 1):
+                        cell = {}
+                        note = sheet.notes.get((r, c))
+                        if note:
+                            cell['note'] = note
+                        if 'note' not in (fields or '') or 'formattedValue' in (fields or ''):
+                            row = sheet.rows[r] if r < len(sheet.rows) else []
+                            text = _cell_text(row[c]) if c < len(row) else ''
+                            if text:
+                                cell['formattedValue'] = text
+                        values.append(cell)
+                    row_data.append({'values': values})
+                by_title[title].setdefault('data', []).append(
+                    {'startRow': r0, 'startColumn': c0, 'rowData': row_data}
+                )
+        return {
+            'spreadsheetId': wb.id,
+            'properties': {'title': wb.title, 'locale': 'ko_KR', 'timeZone': 'Asia/Seoul'},
+            'sheets': sheets,
+        }
+
+    def values_get(self, ssid, a1):
+        wb = self.workbooks[ssid]
+        title, cells = _split_range(a1)
+        sheet = wb.sheet(title)
+        r0, r1, c0, c1 = _parse_bounds(cells)
+        if r0 >= sheet.row_count:
+            raise ValueError(f'Range ({a1}) exceeds grid limits. Max rows: {sheet.row_count}')
+        out = {'range': a1, 'majorDimension': 'ROWS'}
+        values = sheet.read(r0, r1, c0, c1)
+        if values:
+            out['values'] = values
+        return out
+
+    def _write_block(self, sheet, r0, c0, values):
+        for dr, row in enumerate(values or []):
+            for dc, value in enumerate(row):
+                sheet.set_cell(r0 + dr, c0 + dc, value)
+
+    def values_update(self, ssid, a1, values):
+        wb = self.workbooks[ssid]
+        title, cells = _split_range(a1)
+        sheet = wb.sheet(title)
+        r0, _, c0, _ = _parse_bounds(cells)
+        self._write_block(sheet, r0, c0, values)
+        wb.touch()
+        return {'spreadsheetId': ssid, 'updatedRange': a1, 'updatedRows': len(values or [])}
+
+    def values_append(self, ssid, a1, values):
+        wb = self.workbooks[ssid]
+        title, _ = _split_range(a1)
+        sheet = wb.sheet(title)
+        start = sheet.last_data_row()
+        self._write_block(sheet, start, 0, values)
+        wb.touch()
+        width = max([1] + [len(r) for r in values or []])
+        updated = f"'{title}'!A{start + 1}:{_col_letters(width - 1)}{start + len(values or [])}"
+        return {
+            'spreadsheetId': ssid,
+            'tableRange': f"'{title}'!A1:{_col_letters(width - 1)}{start}",
+            'updates': {'spreadsheetId': ssid, 'updatedRange': updated, 'updatedRows': len(values or [])},
+        }
+
+    def batch_update(self, ssid, requests):
+        wb = self.workbooks[ssid]
+        replies = []
+        for req in requests or []:
+            if 'updateCells' in req:
+                self._update_cells(wb, req['updateCells'])
+            elif 'appendCells' in req:
+                body = req['appendCells']
+                sheet = wb.sheet(sheet_id=body['sheetId'])
+                self._apply_rows(sheet, sheet.last_data_row(), 0, body.get('rows'), body.get('fields', '*'))
+            elif 'deleteDimension' in req:
+                rng = req['deleteDimension']['range']
+                sheet = wb.sheet(sheet_id=rng['sheetId'])
+                if rng.get('dimension', 'ROWS') == 'ROWS':
+                    a, b = rng['startIndex'], rng['endIndex']
+                    del sheet.rows[a:b]
+                    sheet.notes = {
+                        ((r - (b - a) if r >= b else r), c): n
+                        for (r, c), n in sheet.notes.items() if not a <= r < b
+                    }
+                    sheet.row_count -= b - a
+            replies.append({})
+        wb.touch()
+        return {'spreadsheetId': ssid, 'replies': replies}
+
+    def _update_cells(self, wb, body):
+        if 'range' in body:
+            rng = body['range']
+            sheet = wb.sheet(sheet_id=rng.get('sheetId', 0))
+            r0, c0 = rng.get('startRowIndex', 0), rng.get('startColumnIndex', 0)
+        else:
+            start = body['start']
+            sheet = wb.sheet(sheet_id=start.get('sheetId', 0))
+            r0, c0 = start.get('rowIndex', 0), start.get('columnIndex', 0)
+        self._apply_rows(sheet, r0, c0, body.get('rows'), body.get('fields', '*'))
+
+    def _apply_rows(self, sheet, r0, c0, rows, fields):
+        set_note = fields == '*' or 'note' in fields
+        set_value = fields == '*' or 'userEnteredValue' in fields
+        for dr, row in enumerate(rows or []):
+            for dc, cell in enumerate(row.get('values') or []):
+                r, c = r0 + dr, c0 + dc
+                if set_note:
+                    if cell.get('note'):
+                        sheet.notes[(r, c)] = cell['note']
+                    else:
+                        sheet.notes.pop((r, c), None)
+                if set_value:
+                    uv = cell.get('userEnteredValue') or {}
+                    value = next(iter(uv.values()), '') if uv else ''
+                    sheet.set_cell(r, c, value)
+                else:
+                    sheet.row_count = max(sheet.row_count, r + 1)
+
+    # ----- Drive -----
+    def drive_list(self, q):
+        parent = re.search(r"'([^']+)' in parents", q or '')
+        mime = re.search(r"mimeType\s*=\s*'([^']+)'", q or '')
+        out = []
+        for f in self.files.values():
+            if parent and parent.group(1) not in f['parents']:
+                continue
+            if mime and f['mimeType'] != mime.group(1):
+                continue
+            out.append({k: v for k, v in f.items() if k != 'content'})
+        return {'files': out}
+
+    def drive_get(self, file_id):
+        if file_id in self.workbooks:
+            return self.workbooks[file_id].drive_meta()
+        f = self.files[file_id]
+        return {k: v for k, v in f.items() if k != 'content'}
+
+
+# ----- 합성 데이터 -----
+WORK_HEADER = ['차량번호', '차종', '사번', '근무유형', '근무일', '결근일', '인정일', '휴가'] + [str(d) for d in range(1, 32)]
+SALES_HEADER = ['운행일', '근무유형', '사번', '운전기사', '차량번호', '차종', '사고유무', '현금운임', '카드운임',
+                '통행료', '연료비', '연료충전량', '근무시간(분)', '보고사항']
+ACCOUNTS_HEADER = ['employee_id', 'password_hash', 'name', '근속연차']
+LEAVE_HEADER = ['신청일', '사번', '이름', '시작일', '종료일', '기간', '구분', '사유', '승인상태']
+LOANER_HEADER = ['차량번호', '차종', '대차가능', '대차신청일', '대차사용자', '사번']
+SYNTHETIC_PASSWORD = '5678'
+
+
+def synthetic_employee_ids(drivers):
+    return [str(10001 + i) for i in range(drivers)]
+
+
+def build_synthetic_state(state=None, drivers=300, sales_rows=10000, year=None, seed=0):
+    """기사 수·매출 행 수가 현실적인 합성 통합문서 (work_DB·sales_DB·공지 폴더).
+
+    비밀번호는 모두 SYNTHETIC_PASSWORD 의 bcrypt 해시 (운영처럼 로그인 시 평문→해시 이전 쓰기가 없고,
+    기본 비밀번호가 아니므로 변경 화면으로 가지 않음)."""
+    rng = random.Random(seed)
+    state = state or FakeGoogleState()
+    year = year or date.today().year
+    eids = synthetic_employee_ids(drivers)
+    vehicles = {eid: f'{rng.randint(10, 99)}바{rng.randint(1000, 9999)}' for eid in eids}
+    work = state.add_workbook(config.SPREADSHEET_ID, config.SPREADSHEET_NAME)
+    sales = state.add_workbook(config.SALES_SPREADSHEET_ID, config.SALES_SPREADSHEET_NAME)
+    per_month_sales = max(1, sales_rows // 12)
+    for month in range(1, 13):
+        rows = [WORK_HEADER]
+        for eid in eids:
+            statuses = [rng.choices(['O', 'X', 'R', 'H', '/', ''], [60, 3, 10, 4, 12, 11])[0] for _ in range(31)]
+            rows.append([vehicles[eid], '쏘나타', eid, rng.choice(['주간', '야간']),
+                         statuses.count('O'), statuses.count('X'), statuses.count('O'), statuses.count('/')] + statuses)
+        work.add_sheet(config.MONTHS[month - 1], rows, row_count=len(rows) + 200)
+        srows = [SALES_HEADER]
+        for _ in range(per_month_sales):
+            eid = rng.choice(eids)
+            day = rng.randint(1, 28)
+            srows.append([f'{year}/{month:02d}/{day:02d}', '주간', eid, f'기사{eid}', vehicles[eid], '쏘나타',
+                          rng.choices(['무사고', '가해사고', '피해사고'], [97, 1, 2])[0],
+                          f'{rng.randint(0, 200) * 1000:,}', f'{rng.randint(0, 200) * 1000:,}', '0',
+                          f'{rng.randint(0, 80) * 1000:,}', '30', str(rng.randint(400, 720)), ''])
+        sales.add_sheet(config.MONTHS[month - 1], srows, row_count=len(srows) + 1000, col_count=14)
+    password_hash = bcrypt.hashpw(SYNTHETIC_PASSWORD.encode('utf-8'), bcrypt.gensalt()).decode('utf-8')
+    work.add_sheet('accounts', [ACCOUNTS_HEADER] + [[eid, password_hash, f'기사{eid}', 15] for eid in eids])
+    leave_rows = [LEAVE_HEADER]
+    for eid in eids[: max(1, drivers // 5)]:
+        start = date(year, rng.randint(1, 12), rng.randint(1, 20))
+        leave_rows.append([start.strftime('%Y/%m/%d'), eid, f'기사{eid}', start.strftime('%Y/%m/%d'),
+                           (start + timedelta(days=1)).strftime('%Y/%m/%d'), 2, '', '개인 사유',
+                           rng.choice(['o', '/', 'x'])])
+    work.add_sheet('휴가신청', leave_rows)
+    work.add_sheet('대차차량', [LOANER_HEADER] + [[f'99허{1000 + i}', 'K5', 'O', '', '', ''] for i in range(10)])
+    folder = (config.NOTICE_DRIVE_FOLDER_ID or 'notice-folder').strip()
+    for i in range(1, 6):
+        state.add_file(f'notice-{i}', f'{i}_안전운행 안내 {i}_{year}-01-{i:02d}.pdf', [folder],
+                       content=b'%PDF-1.4\n% fake notice\n')
+    return state
+
+
+# ----- HTTP -----
+class _Handler(BaseHTTPRequestHandler):
+    server_version = 'FakeGoogleAPI/1.0'
+    protocol_version = 'HTTP/1.1'
+
+    def log_message(self, fmt, *args):
+        if self.server.verbose:
+            super().log_message(fmt, *args)
+
+    def _send(self, status, payload, content_type='application/json'):
+        body = payload if isinstance(payload, bytes) else json.dumps(payload, ensure_ascii=False).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', content_type)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _error(self, status, message, reason):
+        self._send(status, {'error': {'code': status, 'message': message, 'status': reason}})
+
+    def _body(self):
+        n = int(self.headers.get('Content-Length') or 0)
+        return json.loads(self.rfile.read(n) or b'{}') if n else {}
+
+    def do_GET(self):
+        self._dispatch('GET')
+
+    def do_POST(self):
+        self._dispatch('POST')
+
+    def do_PUT(self):
+        self._dispatch('PUT')
+
+    def _dispatch(self, method):
+        url = urlparse(self.path)
+        path = unquote(url.path)
+        qs = parse_qs(url.query)
+        state = self.server.state
+        try:
+            if path == '/__fake/stats':
+                with state.lock:
+                    return self._send(200, state.stats)
+            if path == '/__fake/reset':
+                state.reset_stats()
+                return self._send(200, {})
+            m = re.match(r'^/v4/spreadsheets/([^/:]+)(.*)$', path)
+            if m:
+                return self._sheets(method, m.group(1), m.group(2), qs)
+            m = re.match(r'^/drive/v3/files(?:/([^/]+))?$', path)
+            if m:
+                return self._drive(m.group(1), qs)
+            return self._error(404, f'Unknown path {path}', 'NOT_FOUND')
+        except QuotaExceeded as e:
+            return self._error(429, f"Quota exceeded for quota metric '{e}' (fake)", 'RESOURCE_EXHAUSTED')
+        except KeyError as e:
+            return self._error(400, f'Unable to parse range: {e}', 'INVALID_ARGUMENT')
+        except ValueError as e:
+            return self._error(400, str(e), 'INVALID_ARGUMENT')
+
+    def _sheets(self, method, ssid, rest, qs):
+        state = self.server.state
+        if ssid not in state.workbooks:
+            return self._error(404, 'Requested entity was not found.', 'NOT_FOUND')
+        if method == 'GET' and rest == '':
+            state.admit('spreadsheets.get', 'read')
+            with state.lock:
+                return self._send(200, state.spreadsheet_get(
+                    ssid, qs.get('ranges', []), (qs.get('fields') or [''])[0],
+                    (qs.get('includeGridData') or ['false'])[0] == 'true',
+                ))
+        if method == 'GET' and rest == '/values:batchGet':
+            state.admit('values.batchGet', 'read')
+            with state.lock:
+                ranges = [state.values_get(ssid, a1) for a1 in qs.get('ranges', [])]
+            return self._send(200, {'spreadsheetId': ssid, 'valueRanges': ranges})
+        if method == 'GET' and rest.startswith('/values/'):
+            state.admit('values.get', 'read')
+            with state.lock:
+                return self._send(200, state.values_get(ssid, rest[len('/values/'):]))
+        if method == 'POST' and rest.startswith('/values/') and rest.endswith(':append'):
+            state.admit('values.append', 'write')
+            body = self._body()
+            with state.lock:
+                return self._send(200, state.values_append(ssid, rest[len('/values/'):-len(':append')], body.get('values')))
+        if method == 'PUT' and rest.startswith('/values/'):
+            state.admit('values.update', 'write')
+            body = self._body()
+            with state.lock:
+                return self._send(200, state.values_update(ssid, rest[len('/values/'):], body.get('values')))
+        if method == 'POST' and rest == '/values:batchUpdate':
+            state.admit('values.batchUpdate', 'write')
+            body = self._body()
+            with state.lock:
+                for item in body.get('data') or []:
+                    state.values_update(ssid, item['range'], item.get('values'))
+            return self._send(200, {'spreadsheetId': ssid, 'totalUpdatedRanges': len(body.get('data') or [])})
+        if method == 'POST' and rest == ':batchUpdate':
+            state.admit('spreadsheets.batchUpdate', 'write')
+            body = self._body()
+            with state.lock:
+                return self._send(200, state.batch_update(ssid, body.get('requests')))
+        return self._error(404, f'Unsupported Sheets call {method} {rest}', 'NOT_FOUND')
+
+    def _drive(self, file_id, qs):
+        state = self.server.state
+        if file_id is None:
+            state.admit('files.list', 'drive')
+            with state.lock:
+                return self._send(200, state.drive_list((qs.get('q') or [''])[0]))
+        if (qs.get('alt') or [''])[0] == 'media':
+            state.admit('files.get_media', 'drive')
+            f = state.files.get(file_id)
+            if f is None:
+                return self._error(404, 'File not found.', 'NOT_FOUND')
+            return self._send(200, f['content'], f['mimeType'])
+        state.admit('files.get', 'drive')
+        with state.lock:
+            if file_id not in state.files and file_id not in state.workbooks:
+                return self._error(404, 'File not found.', 'NOT_FOUND')
+            return self._send(200, state.drive_get(file_id))
+
+
+def start_fake_server(state, host='127.0.0.1', port=0, verbose=False):
+    """백그라운드 스레드로 서버 시작 → (서버, 기준 URL). port=0 이면 빈 포트."""
+    server = ThreadingHTTPServer((host, port), _Handler)
+    server.daemon_threads = True
+    server.state = state
+    server.verbose = verbose
+    threading.Thread(target=server.serve_forever, daemon=True, name='fake-google-api').start()
+    return server, f'http://{host}:{server.server_address[1]}'
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Sheets/Drive 오프라인 대역 서버')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--synthetic', action='store_true', help='합성 work/sales 통합문서 생성')
+    parser.add_argument('--drivers', type=int, default=300)
+    parser.add_argument('--sales-rows', type=int, default=10000)
+    parser.add_argument('--latency-ms', type=float, default=0)
+    parser.add_argument('--jitter-ms', type=float, default=0)
+    parser.add_argument('--read-quota-per-min', type=int, default=0, help='0 이면 무제한')
+    parser.add_argument('--write-quota-per-min', type=int, default=0, help='0 이면 무제한')
+    parser.add_argument('--error-rate', type=float, default=0.0, help='무작위 429 비율 (0~1)')
+    parser.add_argument('--verbose', action='store_true')
+    args = parser.parse_args()
+
+    state = FakeGoogleState(
+        latency_ms=args.latency_ms, jitter_ms=args.jitter_ms,
+        read_quota_per_min=args.read_quota_per_min, write_quota_per_min=args.write_quota_per_min,
+        error_rate=args.error_rate,
+    )
+    if args.synthetic:
+        build_synthetic_state(state, drivers=args.drivers, sales_rows=args.sales_rows)
+    server, url = start_fake_server(state, args.host, args.port, verbose=args.verbose)
+    print(f'Fake Google API: {url}  (GOOGLE_API_BASE_URL={url})')
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        server.shutdown()
+
+
+if __name__ == '__main__':
+    main()
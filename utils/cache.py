@@ -0,0 +1,347 @@
+"""앱 메모리 캐시: 항목별 TTL + 항목 수 상한(LRU 제거) + 키 접두사 색인.
+
+키는 'work_data:6000:3월' 처럼 ':' 로 구분한 구간으로 보고, 구간 트라이(prefix index)에 넣어
+clear_pattern('work_data:6000:') 이 전체 키를 훑지 않고 해당 가지의 항목 수(k)만큼만 일한다.
+version_fn(refresh=True) 를 주면 TTL 이 지난 항목도 저장 당시 세대(통합문서 Drive version)와
+지금 세대가 같을 때 연장해 쓴다(처음 저장 후 최대 max_age 초). 세대를 모르면 TTL 로만 판단.
+name 을 주면 조회 적중/실패·제거 수를 /metrics 에 cache 라벨로 기록한다.
+
+APP_CACHE_BACKEND=sqlite 이고 name 이 있으면 항목을 utils.shared_cache 의 SQLite 파일에 두어
+모든 gunicorn 워커가 같은 캐시를 쓴다(프로세스 메모리에는 두지 않음).
+메모리 캐시는 export_entries / import_entries 로 워커 재시작을 넘겨 보존한다 (utils.cache_checkpoint)."""
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+
+import config
+from utils import metrics, shared_cache
+
+KEY_SEPARATOR = shared_cache.KEY_SEPARATOR
+# 공유 저장소는 set 이 이만큼 쌓일 때마다 항목 수 상한을 확인 (매번 COUNT 하지 않도록)
+SHARED_TRIM_EVERY = 64
+
+
+def _segments(pattern):
+    """clear_pattern 인자 → 트라이 경로. 끝의 '*' 와 빈 구간은 '이 아래 전부'를 뜻한다.
+
+    'work_data:6000:*' · 'work_data:6000:' → ['work_data', '6000']
+    'work_data:6000:3월' → ['work_data', '6000', '3월'] (그 키와 그 아래 키만, '13월' 은 아님)"""
+    parts = pattern.split(KEY_SEPARATOR)
+    while parts and parts[-1] in ('', '*'):
+        parts.pop()
+    return parts
+
+
+class _Node:
+    __slots__ = ('children', 'key')
+
+    def __init__(self):
+        self.children = {}
+        self.key = None  # 이 노드에서 끝나는 캐시 키 (없으면 None)
+
+
+class _Entry:
+    __slots__ = ('value', 'expires_at', 'loaded_at', 'ttl', 'version')
+
+    def __init__(self, value, ttl, version, now):
+        self.value = value
+        self.ttl = ttl
+        self.loaded_at = now
+        self.expires_at = now + ttl
+        self.version = version
+
+
+class BoundedCache:
+    """항목별 TTL · LRU 상한 · 접두사 무효화를 지원하는 스레드 안전 메모리 캐시."""
+
+    def __init__(self, default_ttl=60, version_fn=None, max_age=None, name=None, max_entries=None):
+        self.name = name
+        self.default_ttl = default_ttl
+        self.version_fn = version_fn
+        self.max_age = max_age if max_age is not None else config.SHEETS_REVALIDATE_MAX_AGE_SEC
+        self.max_entries = max_entries if max_entries is not None else config.APP_CACHE_MAX_ENTRIES
+        self._entries = OrderedDict()  # 키 → _Entry (앞쪽이 가장 오래 안 쓴 항목)
+        self._root = _Node()
+        self._lock = threading.Lock()
+        self._stats = {'hits': 0, 'misses': 0, 'expired': 0, 'stale': 0, 'lru': 0, 'cleared': 0}
+        self._shared = shared_cache.SharedStore(name) if name and shared_cache.enabled() else None
+        self._shared_sets = 0
+
+    def __len__(self):
+        if self._shared is not None:
+            return self._shared_call(self._shared.count, default=0)
+        return len(self._entries)
+
+    # ----- 통계 -----
+    def _hit(self, hit):
+        self._stats['hits' if hit else 'misses'] += 1
+        if self.name:
+            metrics.inc('app_cache_requests_total', {'cache': self.name, 'result': 'hit' if hit else 'miss'})
+
+    def _evicted(self, reason, n=1):
+        if not n:
+            return
+        self._stats[reason] += n
+        if self.name:
+            metrics.inc('app_cache_evictions_total', {'cache': self.name, 'reason': reason}, n)
+
+    def stats(self):
+        """{'hits', 'misses', 'hit_ratio', 'entries', 'max_entries', 'evictions': {사유: 수}}."""
+        with self._lock:
+            s = dict(self._stats)
+        entries = len(self)
+        total = s['hits'] + s['misses']
+        return {
+            'hits': s['hits'],
+            'misses': s['misses'],
+            'hit_ratio': (s['hits'] / total) if total else 0.0,
+            'entries': entries,
+            'max_entries': self.max_entries,
+            'evictions': {k: s[k] for k in ('expired', 'stale', 'lru', 'cleared')},
+        }
+
+    # ----- 접두사 색인 -----
+    def _index_add(self, key):
+        node = self._root
+        for seg in key.split(KEY_SEPARATOR):
+            node = node.children.setdefault(seg, _Node())
+        node.key = key
+
+    def _index_remove(self, key):
+        """키를 트라이에서 빼고, 비게 된 가지를 잘라낸다."""
+        segs = key.split(KEY_SEPARATOR)
+        node = self._root
+        for seg in segs:
+            node = node.children.get(seg)
+            if node is None:
+                return
+        node.key = None
+        self._prune(segs)
+
+    def _prune(self, segs):
+        """segs 경로 끝에서부터 키도 자식도 없는 노드를 잘라낸다."""
+        path = [self._root]
+        for seg in segs:
+            node = path[-1].children.get(seg)
+            if node is None:
+                return
+            path.append(node)
+        for depth in range(len(segs), 0, -1):
+            node = path[depth]
+            if node.key is not None or node.children:
+                break
+            del path[depth - 1].children[segs[depth - 1]]
+
+    def _drop(self, key):
+        if self._entries.pop(key, None) is not None:
+            self._index_remove(key)
+
+    # ----- 조회·저장 -----
+    def get(self, key):
+        """캐시에서 값 가져오기 (없거나 만료된 경우 None 반환)"""
+        if self._shared is not None:
+            return self._shared_get(key)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self._hit(False)
+                return None
+            now = time.time()
+            if now <= entry.expires_at:
+                self._entries.move_to_end(key)
+                self._hit(True)
+                return entry.value
+            if self.version_fn is None or entry.version is None or now - entry.loaded_at > self.max_age:
+                self._drop(key)
+                self._evicted('expired')
+                self._hit(False)
+                return None
+            version = entry.version
+        # 세대 확인은 네트워크 호출이 있을 수 있어 잠금 밖에서 (결과는 모든 키가 공유)
+        current = self.version_fn()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry.version != version:
+                # 확인하는 사이 다시 저장됐거나 삭제됨
+                self._hit(entry is not None)
+                return entry.value if entry is not None else None
+            if current != version:
+                self._drop(key)
+                self._evicted('stale')
+                self._hit(False)
+                return None
+            entry.expires_at = time.time() + entry.ttl
+            self._entries.move_to_end(key)
+            self._hit(True)
+            return entry.value
+
+    def set(self, key, value, ttl=None):
+        """캐시에 값 저장 (ttl 을 주면 이 항목만 그 초 단위 TTL). 상한을 넘으면 가장 오래 안 쓴 항목부터 제거."""
+        # 네트워크 없이 마지막으로 확인한 세대 기록 (데이터보다 오래된 세대일 수는 있어도 새 세대는 아님)
+        version = self.version_fn(refresh=False) if self.version_fn is not None else None
+        if self._shared is not None:
+            self._shared_set(key, value, version, ttl if ttl else self.default_ttl)
+            return
+        entry = _Entry(value, ttl if ttl else self.default_ttl, version, time.time())
+        with self._lock:
+            if key not in self._entries:
+                self._index_add(key)
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            evicted = 0
+            while self.max_entries and len(self._entries) > self.max_entries:
+                old_key, _ = self._entries.popitem(last=False)
+                self._index_remove(old_key)
+                evicted += 1
+            self._evicted('lru', evicted)
+
+    # ----- 무효화 -----
+    def clear(self, key=None):
+        """캐시 삭제 (key가 None이면 전체 삭제)"""
+        if self._shared is not None:
+            if key is None:
+                removed = self._shared_call(self._shared.delete_prefix, '', default=0)
+            else:
+                removed = self._shared_call(self._shared.delete, key, default=0)
+            with self._lock:
+                self._evicted('cleared', removed)
+            return
+        with self._lock:
+            if key is None:
+                self._evicted('cleared', len(self._entries))
+                self._entries.clear()
+                self._root = _Node()
+            elif key in self._entries:
+                self._drop(key)
+                self._evicted('cleared')
+
+    def clear_pattern(self, pattern):
+        """접두사에 맞는 키들 삭제 (예: 'work_data:6000:' · 'work_data:6000:*' → 6000 의 모든 월).
+
+        ':' 구간 단위로 맞추므로 'work_data:6000:1월' 은 그 키만 지우고 '10월' 등은 남긴다."""
+        segs = _segments(pattern)
+        if self._shared is not None:
+            removed = self._shared_call(self._shared.delete_prefix, KEY_SEPARATOR.join(segs), default=0)
+            with self._lock:
+                self._evicted('cleared', removed)
+            return
+        with self._lock:
+            if not segs:
+                self._evicted('cleared', len(self._entries))
+                self._entries.clear()
+                self._root = _Node()
+                return
+            parent = None
+            node = self._root
+            for seg in segs:
+                parent, node = node, node.children.get(seg)
+                if node is None:
+                    return
+            keys = []
+            stack = [node]
+            while stack:
+                n = stack.pop()
+                if n.key is not None:
+                    keys.append(n.key)
+                stack.extend(n.children.values())
+            # 가지를 통째로 떼어낸 뒤 위쪽 빈 노드 정리
+            del parent.children[segs[-1]]
+            for key in keys:
+                self._entries.pop(key, None)
+            self._prune(segs[:-1])
+            self._evicted('cleared', len(keys))
+
+    # ----- 공유 저장소 (APP_CACHE_BACKEND=sqlite) -----
+    def _shared_call(self, fn, *args, default=None):
+        """공유 저장소 호출. 실패하면 경고·지표만 남기고 default (캐시 없음과 같게 동작).
+
+        TypeError 는 저장할 수 없는 값 형식(shared_cache 태그 JSON 밖의 타입), ValueError 는 읽은 값 해석 실패,
+        sqlite3.Error 는 파일 오류 — app_cache_errors_total 의 reason 으로 구분한다."""
+        try:
+            return fn(*args)
+        except TypeError as ex:
+            metrics.inc('app_cache_errors_total', {'cache': self.name, 'reason': 'encode'})
+            print(f'cache[{self.name}]: 공유 캐시에 저장할 수 없는 값 — 이 항목은 캐시하지 않습니다 ({ex})')
+        except ValueError as ex:
+            metrics.inc('app_cache_errors_total', {'cache': self.name, 'reason': 'decode'})
+            print(f'cache[{self.name}]: 공유 캐시 값 해석 실패 — 캐시 없이 진행합니다 ({ex})')
+        except sqlite3.Error as ex:
+            metrics.inc('app_cache_errors_total', {'cache': self.name, 'reason': 'sqlite'})
+            print(f'cache[{self.name}]: 공유 캐시 접근 실패 — 캐시 없이 진행합니다 ({ex})')
+        return default
+
+    def _shared_get(self, key):
+        row = self._shared_call(self._shared.get, key)
+        now = time.time()
+        if row is None:
+            with self._lock:
+                self._hit(False)
+            return None
+        value, version, ttl, expires_at, loaded_at, touched_at = row
+        if now <= expires_at:
+            if now - touched_at > shared_cache.TOUCH_INTERVAL_SEC:
+                self._shared_call(self._shared.touch, key, now)
+            with self._lock:
+                self._hit(True)
+            return value
+        if self.version_fn is None or version is None or now - loaded_at > self.max_age:
+            self._shared_call(self._shared.delete, key)
+            with self._lock:
+                self._evicted('expired')
+                self._hit(False)
+            return None
+        current = self.version_fn()
+        if current != version:
+            self._shared_call(self._shared.delete, key)
+            with self._lock:
+                self._evicted('stale')
+                self._hit(False)
+            return None
+        now = time.time()
+        self._shared_call(self._shared.extend, key, version, now + ttl, now)
+        with self._lock:
+            self._hit(True)
+        return value
+
+    def _shared_set(self, key, value, version, ttl):
+        self._shared_call(self._shared.put, key, value, version, ttl, time.time())
+        with self._lock:
+            self._shared_sets += 1
+            check = self._shared_sets % SHARED_TRIM_EVERY == 0
+        if check and self.max_entries:
+            removed = self._shared_call(self._shared.trim, self.max_entries, default=0)
+            with self._lock:
+                self._evicted('lru', removed)
+
+    # ----- 체크포인트 (utils.cache_checkpoint) -----
+    def export_entries(self):
+        """메모리 항목 [(키, 값, ttl, 세대, 만료 시각, 적재 시각), ...] — 오래 안 쓴 것부터. 공유 저장소면 빈 목록."""
+        if self._shared is not None:
+            return []
+        with self._lock:
+            return [(k, e.value, e.ttl, e.version, e.expires_at, e.loaded_at) for k, e in self._entries.items()]
+
+    def import_entries(self, entries):
+        """export_entries 결과를 되살림 → 복원한 수.
+
+        만료됐고 세대 확인으로도 연장할 수 없는(max_age 초과·세대 없음) 항목은 버린다. 이미 있는 키는 덮지 않는다."""
+        if self._shared is not None:
+            return 0
+        now = time.time()
+        restored = 0
+        with self._lock:
+            for key, value, ttl, version, expires_at, loaded_at in entries:
+                if now > expires_at and (self.version_fn is None or version is None or now - loaded_at > self.max_age):
+                    continue
+                if key in self._entries:
+                    continue
+                entry = _Entry(value, ttl, version, loaded_at)
+                entry.expires_at = expires_at
+                self._index_add(key)
+                self._entries[key] = entry
+                restored += 1
+            while self.max_entries and len(self._entries) > self.max_entries:
+                old_key, _ = self._entries.popitem(last=False)
+                self._index_remove(old_key)
+        return restored
@@ -0,0 +1,132 @@
+"""메모리 캐시 체크포인트: 워커가 정상 종료할 때 파일로 저장하고, 다음 워커가 시작할 때 되살린다.
+
+gunicorn 이 max_requests 마다 워커를 바꾸면 메모리 캐시(BoundedCache, 공유 월 그리드, 매출 꼬리 상태,
+근무 메모 인덱스)가 모두 사라져 재시작 직후 Sheets 읽기가 몰린다. 각 모듈이 register() 로 구역(section)의
+내보내기·되살리기 함수를 등록하면, save() 가 모두 모아 APP_CACHE_CHECKPOINT_PATH 에 쓰고 restore() 가
+시작할 때 읽어 돌려준다. TTL·세대 판단은 각 구역의 import 함수가 한다 (만료된 항목은 버림).
+
+파일 형식 (JSON, pickle 없음 — 값은 shared_cache.encode_value 태그 JSON):
+    {"format": "app-cache-checkpoint", "version": 1, "saved_at": 초, "pid": 저장한 워커, "sections": {이름: 값}}
+version 이 다르거나 saved_at 이 SHEETS_REVALIDATE_MAX_AGE_SEC 보다 오래됐으면 파일 전체를 무시한다.
+캐시 값의 모양이 바뀌는 변경을 하면 CHECKPOINT_VERSION 을 올린다."""
+import json
+import os
+import threading
+import time
+
+import config
+from utils import metrics, shared_cache
+
+FORMAT = 'app-cache-checkpoint'
+CHECKPOINT_VERSION = 1
+
+_lock = threading.Lock()
+_sections = {}  # 이름 → (export_fn, import_fn)
+_exit_saved_pid = None
+
+
+def _path():
+    return (getattr(config, 'APP_CACHE_CHECKPOINT_PATH', '') or '').strip()
+
+
+def enabled():
+    return bool(_path())
+
+
+def register(name, export_fn, import_fn):
+    """구역 등록. export_fn() → 인코딩 가능한 값, import_fn(값) → 되살린 항목 수."""
+    with _lock:
+        _sections[name] = (export_fn, import_fn)
+
+
+def register_cache(cache):
+    """BoundedCache 를 'cache:<이름>' 구역으로 등록 (공유 저장소 캐시는 내보낼 항목이 없음)."""
+    register(f'cache:{cache.name}', cache.export_entries, cache.import_entries)
+
+
+def save():
+    """등록된 구역을 모두 파일에 저장 (임시 파일에 쓴 뒤 교체) → 저장한 구역 수."""
+    path = _path()
+    if not path:
+        return 0
+    started = time.perf_counter()
+    with _lock:
+        sections = dict(_sections)
+    encoded = {}
+    for name, (export_fn, _) in sections.items():
+        try:
+            encoded[name] = shared_cache.encode_value(export_fn())
+        except Exception as ex:
+            if isinstance(ex, TypeError):
+                # 구역 안에 태그 JSON 으로 못 바꾸는 값이 있음 (구역 전체를 건너뜀)
+                metrics.inc('app_cache_errors_total', {'cache': f'checkpoint:{name}', 'reason': 'encode'})
+            print(f'cache_checkpoint: {name} 저장 건너뜀 ({ex})')
+    doc = {
+        'format': FORMAT,
+        'version': CHECKPOINT_VERSION,
+        'saved_at': time.time(),
+        'pid': os.getpid(),
+        'sections': encoded,
+    }
+    path = os.path.abspath(path)
+    tmp = f'{path}.{os.getpid()}.tmp'
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(tmp, 'w', encoding='utf-8') as f:
+            json.dump(doc, f, ensure_ascii=False, separators=(',', ':'))
+        os.replace(tmp, path)
+    except OSError as ex:
+        print(f'cache_checkpoint: 저장 실패 ({ex})')
+        return 0
+    elapsed = (time.perf_counter() - started) * 1000
+    print(f'cache_checkpoint: {len(encoded)}개 구역 저장 ({os.path.getsize(path)} bytes, {elapsed:.0f}ms)')
+    return len(encoded)
+
+
+def save_on_exit():
+    """종료 경로(gunicorn worker_exit · atexit) 공용 — 프로세스당 한 번만 저장."""
+    global _exit_saved_pid
+    with _lock:
+        if _exit_saved_pid == os.getpid():
+            return 0
+        _exit_saved_pid = os.getpid()
+    return save()
+
+
+def _load():
+    path = _path()
+    if not path or not os.path.exists(path):
+        return None
+    try:
+        with open(path, encoding='utf-8') as f:
+            doc = json.load(f)
+    except (OSError, ValueError) as ex:
+        print(f'cache_checkpoint: 파일을 읽지 못해 무시합니다 ({ex})')
+        return None
+    if not isinstance(doc, dict) or doc.get('format') != FORMAT or doc.get('version') != CHECKPOINT_VERSION:
+        print(f'cache_checkpoint: 형식·버전이 달라 무시합니다 (version={doc.get("version") if isinstance(doc, dict) else None})')
+        return None
+    if time.time() - float(doc.get('saved_at') or 0) > config.SHEETS_REVALIDATE_MAX_AGE_SEC:
+        return None
+    return doc
+
+
+def restore():
+    """체크포인트 파일에서 등록된 구역을 되살림 → {구역 이름: 되살린 항목 수}."""
+    doc = _load()
+    if doc is None:
+        return {}
+    with _lock:
+        sections = dict(_sections)
+    restored = {}
+    for name, data in (doc.get('sections') or {}).items():
+        if name not in sections:
+            continue
+        try:
+            restored[name] = sections[name][1](shared_cache.decode_value(data))
+        except Exception as ex:
+            print(f'cache_checkpoint: {name} 복원 건너뜀 ({ex})')
+    age = time.time() - float(doc['saved_at'])
+    summary = ', '.join(f'{k}={v}' for k, v in restored.items() if v)
+    print(f'cache_checkpoint: {age:.0f}초 전 체크포인트 복원 — {summary or "유효한 항목 없음"}')
+    return restored
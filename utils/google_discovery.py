@@ -0,0 +1,53 @@
+"""Sheets v4 · Drive v3 discovery 서비스 생성 (googleapiclient · httplib2).
+
+googleapiclient.discovery / googleapiclient.http / httplib2 는 불러오는 데만 수십 ms 가 걸려,
+utils.google_sheets 가 서비스를 처음 만들 때 이 모듈을 불러온다 (워커 부팅·/login 경로에서는 불러오지 않음).
+
+서비스 객체는 프로세스에 하나, 실제 전송은 요청을 만든 스레드 전용 httplib2 연결로 한다
+(httplib2.Http 는 스레드 안전하지 않음). 모든 요청은 sheets_quota.metered_call 로 토큰을 받고 기록된다."""
+import threading
+
+import google_auth_httplib2
+import httplib2
+from googleapiclient.discovery import build
+from googleapiclient.http import HttpRequest
+
+import config
+from utils import sheets_quota
+
+_thread_local = threading.local()
+_credentials = None  # build_service 에 넘긴 프로세스 공용 Credentials (토큰을 모든 스레드가 공유)
+
+
+def _thread_http():
+    """현재 스레드 전용 AuthorizedHttp (스레드당 1회 생성, keep-alive 연결 재사용)."""
+    http = getattr(_thread_local, 'http', None)
+    if http is None:
+        http = google_auth_httplib2.AuthorizedHttp(
+            _credentials, http=httplib2.Http(timeout=config.GOOGLE_HTTP_TIMEOUT_SEC)
+        )
+        _thread_local.http = http
+    return http
+
+
+class _ThreadHttpRequest(HttpRequest):
+    """requestBuilder — 서비스가 가진 공용 http 대신 요청을 만든 스레드의 http 로 보낸다 (미디어 다운로드 포함)."""
+
+    def __init__(self, http, *args, **kwargs):
+        super().__init__(_thread_http(), *args, **kwargs)
+
+    def execute(self, http=None, num_retries=0):
+        return sheets_quota.metered_call(
+            self.method, self.uri, lambda: super(_ThreadHttpRequest, self).execute(http=http, num_retries=num_retries),
+            body=self.body,
+        )
+
+
+def build_service(api, version, credentials, client_options=None):
+    """여러 스레드가 함께 써도 되는 discovery 서비스 객체."""
+    global _credentials
+    _credentials = credentials
+    return build(
+        api, version, credentials=credentials, cache_discovery=False,
+        requestBuilder=_ThreadHttpRequest, client_options=client_options,
+    )
@@ -2,13 +2,18 @@ import re
 import random
 import threading
 import time
-from datetime import date, datetime
+from datetime import date, datetime, timezone
 import gspread
+import google.auth.transport.requests
+import requests
+from google.auth.credentials import AnonymousCredentials
 from google.oauth2.service_account import Credentials
-from googleapiclient.discovery import build
 from googleapiclient.errors import HttpError
 import config
 import os
+from utils import cache_checkpoint, metrics, month_grid, sheets_mirror, sheets_quota
+from utils.cache import BoundedCache
+from utils.yearly_stats_snapshot import ROLLUP_FIELDS
 
 
 def _is_sheets_read_quota_error(exc):
@@ -39,34 +44,73 @@ def _sheets_quota_backoff(attempt_index):
     """429 후 대기 Gunicorn sync 워커 타임아웃을 피하기 위해 sleep 상한 적용."""
     cap = getattr(config, 'SHEETS_429_BACKOFF_CAP_SEC', 10.0)
     raw = min(1.15 * (1.85 ** attempt_index) + random.random() * 0.85, cap)
-    time.sleep(max(0.4, raw))
+    delay = max(0.4, raw)
+    metrics.inc('sheets_retries_total')
+    metrics.inc('sheets_retry_sleep_seconds_total', value=delay)
+    time.sleep(delay)
 
 
-def _retry_sheets_operation(operation_fn, attempts=None):
-    """읽기 쿼터 초과 시 백오프 재시도 (시도 횟수는 config)."""
+def _is_missing_sheet_error(exc):
+    """시트 이름 변경·삭제로 캐시된 워크시트 정보가 어긋난 경우 (범위 파싱 실패 / 없는 sheetId)."""
+    msg = str(exc)
+    return 'Unable to parse range' in msg or 'No grid with id' in msg
+
+
+def _retry_sheets_operation(operation_fn, attempts=None, kind=None):
+    """읽기 쿼터 초과 시 백오프 재시도 (시도 횟수는 config).
+
+    kind('work' | 'sales')를 주면 시트 이름 변경으로 보이는 오류 때 그 통합문서의 워크시트 레지스트리만
+    새로 고친 뒤 1회 더 시도한다(시도 횟수와 별개). operation_fn 이 매 시도마다 워크시트·sheetId 를
+    레지스트리에서 다시 찾을 때만 kind 를 준다 — 이미 찾은 워크시트를 붙잡은 호출은 재시도해도 같다."""
     n = attempts if attempts is not None else config.SHEETS_READ_RETRY_ATTEMPTS
-    last_exc = None
-    for attempt in range(n):
+    attempt = 0
+    registry_refreshed = False
+    while True:
         try:
             return operation_fn()
         except Exception as e:
-            last_exc = e
+            if isinstance(e, sheets_quota.QuotaExhausted):
+                raise
+            if kind is not None and not registry_refreshed and _is_missing_sheet_error(e):
+                registry_refreshed = True
+                invalidate_worksheet_registry(kind)
+                continue
             if attempt < n - 1 and _is_sheets_read_quota_error(e):
                 print(f"Sheets API 429 재시도({attempt + 1}/{n}): {str(e)[:300]}")
                 _sheets_quota_backoff(attempt)
+                attempt += 1
                 continue
             raise
-    raise last_exc
 
 
 ACCOUNTS_CACHE_TTL_SEC = config.ACCOUNTS_CACHE_SECONDS
-_accounts_cache_lock = threading.Lock()
-_accounts_cache_records = None
-_accounts_cache_ts = 0.0
+# {'records', 'ts'} — TTL 이 지나도 조회 실패·예산 부족 때 stale 응답용으로 하루 보관 (APP_CACHE_BACKEND=sqlite 면 워커 공유)
+ACCOUNTS_CACHE_KEY = 'accounts'
+_accounts_cache = BoundedCache(default_ttl=86400, name='accounts')
+
+
+# 실제 Google API 호스트 → GOOGLE_API_BASE_URL(오프라인 대역 서버)로 바꿀 접두사
+_GOOGLE_API_HOSTS = ('https://sheets.googleapis.com', 'https://www.googleapis.com')
+
+
+def google_api_base_url():
+    """오프라인 대역 서버(tools/fake_google_api.py) 주소. 비어 있으면 실제 Google API."""
+    return (getattr(config, 'GOOGLE_API_BASE_URL', '') or '').strip().rstrip('/')
+
+
+def google_api_client_options(api):
+    """discovery build(client_options=...) 값. api: 'sheets' | 'drive'. 실제 API면 None."""
+    base = google_api_base_url()
+    if not base:
+        return None
+    # api_endpoint 는 servicePath 까지 대신하므로 Drive 는 경로를 붙인다
+    return {'api_endpoint': base + ('/drive/v3/' if api == 'drive' else '/')}
 
 
 def _service_account_credentials():
-    """gspread·Sheets v4 discovery 공용 서비스 계정 Credentials."""
+    """gspread·Sheets v4 discovery 공용 서비스 계정 Credentials (대역 서버면 인증 없음)."""
+    if google_api_base_url():
+        return AnonymousCredentials()
     credentials_dict = config.get_google_credentials()
     if credentials_dict:
         return Credentials.from_service_account_info(credentials_dict, scopes=config.SCOPES)
@@ -77,18 +121,87 @@ def _service_account_credentials():
     return Credentials.from_service_account_file(config.CREDENTIALS_FILE, scopes=config.SCOPES)
 
 
+# ----- 스레드 안전 클라이언트 -----
+# Sheets v4 · Drive v3 discovery 서비스는 프로세스에 하나만 만들고 요청마다 스레드 전용 httplib2 연결로
+# 보낸다 (utils.google_discovery). gspread 는 requests 세션(AuthorizedSession)의 연결 풀을
+# GOOGLE_HTTP_POOL_SIZE 로 키워 gthread 워커의 요청 스레드·월별 병렬 조회 풀이 함께 쓴다.
+#
+# Credentials 도 프로세스에 하나: gspread · Sheets v4 · Drive 가 같은 액세스 토큰을 쓴다. 처음 만들 때
+# 잠금 안에서 토큰을 한 번 받아(스레드마다 따로 발급받지 않음), 이후에는 google-token-refresh 스레드가
+# 만료 GOOGLE_TOKEN_REFRESH_MARGIN_SEC 초 전에 미리 갱신한다. 갱신이 실패하면 google-auth 가 요청 때 직접 갱신.
+_credentials_lock = threading.Lock()
+_credentials = None
+_credentials_pid = None  # 갱신 스레드를 띄운 프로세스 (fork 후 자식에서는 다시 띄움)
+_token_lock = threading.Lock()
+# 갱신 실패 후 재시도 간격 (초)
+TOKEN_REFRESH_RETRY_SEC = 30.0
+
+
+def _token_seconds_left(credentials):
+    """액세스 토큰 만료까지 남은 초 (토큰이 없으면 0)."""
+    if not credentials.token or credentials.expiry is None:
+        return 0.0
+    # google-auth 의 expiry 는 tz 없는 UTC
+    now = datetime.now(timezone.utc).replace(tzinfo=None)
+    return (credentials.expiry - now).total_seconds()
+
+
+def _refresh_token(credentials, trigger):
+    """만료 여유가 margin 보다 적을 때만 토큰 갱신 (여러 스레드가 불러도 발급은 한 번) → 성공 여부."""
+    with _token_lock:
+        if _token_seconds_left(credentials) > config.GOOGLE_TOKEN_REFRESH_MARGIN_SEC:
+            return True
+        try:
+            credentials.refresh(google.auth.transport.requests.Request())
+        except Exception as e:
+            metrics.inc('google_token_refreshes_total', {'trigger': trigger, 'result': 'error'})
+            print(f"Google 액세스 토큰 갱신 실패({trigger}): {e}")
+            return False
+        metrics.inc('google_token_refreshes_total', {'trigger': trigger, 'result': 'ok'})
+        return True
+
+
+def _token_refresh_loop(credentials):
+    while True:
+        wait = _token_seconds_left(credentials) - config.GOOGLE_TOKEN_REFRESH_MARGIN_SEC
+        if wait > 0:
+            time.sleep(wait)
+        if not _refresh_token(credentials, 'background'):
+            time.sleep(TOKEN_REFRESH_RETRY_SEC)
+
+
+def _shared_credentials():
+    """프로세스 공용 Credentials (토큰을 스레드·서비스가 함께 씀)."""
+    global _credentials, _credentials_pid
+    with _credentials_lock:
+        if _credentials is None:
+            _credentials = _service_account_credentials()
+        if _credentials_pid != os.getpid() and not isinstance(_credentials, AnonymousCredentials):
+            _credentials_pid = os.getpid()
+            _refresh_token(_credentials, 'startup')
+            threading.Thread(
+                target=_token_refresh_loop, args=(_credentials,), name='google-token-refresh', daemon=True
+            ).start()
+        return _credentials
+
+
+def _build_service(api, version):
+    # googleapiclient.discovery · httplib2 는 무거워서 서비스를 처음 만들 때 불러온다 (워커 부팅 시간 단축)
+    from utils import google_discovery
+
+    return google_discovery.build_service(api, version, _shared_credentials(), google_api_client_options(api))
+
+
 _sheets_v4_lock = threading.Lock()
 _sheets_v4_service = None
 
 
 def _get_sheets_v4_service():
-    """Sheets API v4 REST (values.batchGet 등)."""
+    """Sheets API v4 REST (values.batchGet 등). 여러 스레드가 함께 써도 됨."""
     global _sheets_v4_service
     with _sheets_v4_lock:
         if _sheets_v4_service is None:
-            _sheets_v4_service = build(
-                'sheets', 'v4', credentials=_service_account_credentials(), cache_discovery=False
-            )
+            _sheets_v4_service = _build_service('sheets', 'v4')
         return _sheets_v4_service
 
 
@@ -121,10 +234,128 @@ def _sheet_values_batch_get(spreadsheet_id, ranges_a1):
     return _retry_sheets_operation(_call)
 
 
+# ----- 통합문서·워크시트 레지스트리 -----
+# 통합문서는 프로세스당 1회만 열고(open_by_key 메타데이터 읽기 1회), 시트 제목 → Worksheet(sheetId 포함)
+# 매핑을 보관한다. 매핑은 시트가 없거나(추가·이름 변경) 범위 오류가 날 때만 다시 읽는다.
+_registry_lock = threading.Lock()
+_gspread_client = None
+_spreadsheet_handles = {}  # 'work' | 'sales' → gspread.Spreadsheet
+_spreadsheet_open_locks = {'work': threading.Lock(), 'sales': threading.Lock()}
+_worksheet_maps = {}  # 'work' | 'sales' → {시트 제목: Worksheet}
+_worksheet_map_versions = {}  # 'work' | 'sales' → 매핑을 새로 읽을 때마다 증가
+_worksheet_missing = {}  # 'work' | 'sales' → {없던 시트 제목: 확인 시각} (SHEETS_MISSING_SHEET_TTL_SEC 동안 재조회 안 함)
+
+
+class _SheetsClient(sheets_quota.QuotaClient):
+    """gspread 요청 주소를 GOOGLE_API_BASE_URL 이 있으면 대역 서버로 바꾼다."""
+
+    def request(self, method, endpoint, *args, **kwargs):
+        base = google_api_base_url()
+        if base:
+            for host in _GOOGLE_API_HOSTS:
+                if endpoint.startswith(host):
+                    endpoint = base + endpoint[len(host):]
+                    break
+        return super().request(method, endpoint, *args, **kwargs)
+
+
 def get_google_sheets_client():
-    """Google Sheets API 클라이언트 생성"""
-    client = gspread.authorize(_service_account_credentials())
-    return client
+    """Google Sheets API 클라이언트 (프로세스 공용, 최초 1회 authorize)."""
+    global _gspread_client
+    with _registry_lock:
+        if _gspread_client is None:
+            client = gspread.authorize(_shared_credentials(), client_factory=_SheetsClient)
+            # 기본 풀(10)이면 gthread 스레드가 많을 때 연결을 버리고 다시 맺는다
+            adapter = requests.adapters.HTTPAdapter(
+                pool_connections=4, pool_maxsize=config.GOOGLE_HTTP_POOL_SIZE
+            )
+            client.session.mount('https://', adapter)
+            client.session.mount('http://', adapter)
+            _gspread_client = client
+        return _gspread_client
+
+
+def _registry_spreadsheet(kind, open_once):
+    with _registry_lock:
+        ss = _spreadsheet_handles.get(kind)
+    if ss is not None:
+        return ss
+    with _spreadsheet_open_locks[kind]:
+        with _registry_lock:
+            ss = _spreadsheet_handles.get(kind)
+        if ss is None:
+            ss = _retry_sheets_operation(open_once)
+            with _registry_lock:
+                _spreadsheet_handles[kind] = ss
+        return ss
+
+
+def _refresh_worksheet_map(kind, spreadsheet):
+    """통합문서 시트 목록을 1회 읽어 제목 → Worksheet 매핑 교체.
+
+    세대 번호는 제목 → sheetId 구성이 실제로 바뀌었을 때만 올린다(정기 재조회로 헤더 캐시 등이 비지 않게)."""
+    worksheets = _retry_sheets_operation(spreadsheet.worksheets)
+    with _registry_lock:
+        old = _worksheet_maps.get(kind)
+        new = {ws.title: ws for ws in worksheets}
+        _worksheet_maps[kind] = new
+        missing = _worksheet_missing.get(kind)
+        if missing:
+            for title in [t for t in missing if t in new]:
+                del missing[title]
+        if old is None or {t: w.id for t, w in old.items()} != {t: w.id for t, w in new.items()}:
+            _worksheet_map_versions[kind] = _worksheet_map_versions.get(kind, 0) + 1
+        return new
+
+
+def _registry_worksheet(kind, spreadsheet, title):
+    """제목 → Worksheet. 없으면 시트 목록을 1회 다시 읽고, 그래도 없으면 그 제목을 잠시 기억해
+    (아직 만들지 않은 월 시트 등) 조회마다 메타데이터를 다시 읽지 않는다."""
+    with _registry_lock:
+        ws = (_worksheet_maps.get(kind) or {}).get(title)
+        missing_at = (_worksheet_missing.get(kind) or {}).get(title)
+    if ws is not None:
+        return ws
+    if missing_at is not None and time.time() - missing_at < config.SHEETS_MISSING_SHEET_TTL_SEC:
+        raise gspread.exceptions.WorksheetNotFound(title)
+    ws = _refresh_worksheet_map(kind, spreadsheet).get(title)
+    if ws is None:
+        with _registry_lock:
+            _worksheet_missing.setdefault(kind, {})[title] = time.time()
+        raise gspread.exceptions.WorksheetNotFound(title)
+    return ws
+
+
+def _registry_kind_of(spreadsheet):
+    with _registry_lock:
+        for kind, ss in _spreadsheet_handles.items():
+            if ss is spreadsheet or ss.id == getattr(spreadsheet, 'id', None):
+                return kind
+    return None
+
+
+def _registry_kind_of_id(spreadsheet_id):
+    with _registry_lock:
+        for kind, ss in _spreadsheet_handles.items():
+            if ss.id == spreadsheet_id:
+                return kind
+    return None
+
+
+def worksheet_registry_version(kind):
+    """제목 → sheetId 매핑 세대 번호 (매핑을 다시 읽을 때마다 증가)."""
+    with _registry_lock:
+        return _worksheet_map_versions.get(kind, 0)
+
+
+def invalidate_worksheet_registry(kind=None):
+    """제목 → Worksheet 매핑 폐기 (다음 조회 때 1회 재조회). 통합문서 핸들은 유지."""
+    with _registry_lock:
+        for k in (list(_worksheet_maps) if kind is None else [kind]):
+            _worksheet_maps.pop(k, None)
+            _worksheet_missing.pop(k, None)
+            _worksheet_map_versions[k] = _worksheet_map_versions.get(k, 0) + 1
+
 
 def _open_work_spreadsheet_once():
     """work_DB 스프레드시트 1회 오픈 (429는 상위에서 재시도)."""
@@ -161,14 +392,13 @@ def _open_work_spreadsheet_once():
 
 
 def get_spreadsheet():
-    """스프레드시트 객체 반환 (읽기 한도 초과 시 자동 재시도)."""
-    return _retry_sheets_operation(_open_work_spreadsheet_once)
+    """work_DB 스프레드시트 객체 반환 (프로세스 공용 핸들, 최초 1회만 오픈·429 시 재시도)."""
+    return _registry_spreadsheet('work', _open_work_spreadsheet_once)
 
 
 def get_worksheet(sheet_name):
-    """특정 워크시트 반환"""
-    spreadsheet = get_spreadsheet()
-    return spreadsheet.worksheet(sheet_name)
+    """특정 워크시트 반환 (레지스트리 매핑 사용 — 시트가 없을 때만 메타데이터 재조회)."""
+    return _registry_worksheet('work', get_spreadsheet(), sheet_name)
 
 def _open_sales_spreadsheet_once():
     """sales_DB 스프레드시트 1회 오픈."""
@@ -193,25 +423,95 @@ def _open_sales_spreadsheet_once():
 
 
 def get_sales_spreadsheet():
-    """sales_DB_2026 스프레드시트 객체 반환 (읽기 한도 초과 시 자동 재시도)."""
-    return _retry_sheets_operation(_open_sales_spreadsheet_once)
+    """sales_DB_2026 스프레드시트 객체 반환 (프로세스 공용 핸들, 최초 1회만 오픈·429 시 재시도)."""
+    return _registry_spreadsheet('sales', _open_sales_spreadsheet_once)
 
 
 def get_sales_worksheet(month_sheet_name):
-    """sales_DB_2026의 특정 월별 워크시트 반환"""
-    spreadsheet = get_sales_spreadsheet()
-    return spreadsheet.worksheet(month_sheet_name)
+    """sales_DB_2026의 특정 월별 워크시트 반환 (레지스트리 매핑 사용)."""
+    return _registry_worksheet('sales', get_sales_spreadsheet(), month_sheet_name)
+
+# ----- 통합문서 수정 세대 (Drive version) -----
+# Drive files.get(fields=version,modifiedTime) 1회로 통합문서가 바뀌었는지 확인한다. 결과는
+# WORKBOOK_REVISION_CHECK_SEC 동안 모든 캐시 키가 공유하므로 키 수와 무관하게 분당 호출 수가 일정하다.
+WORKBOOK_REVISION_CHECK_SEC = config.SHEETS_REVISION_CHECK_SECONDS
+_revision_lock = threading.Lock()
+_revision_state = {}  # 'work' | 'sales' → {'version': str | None, 'ts': 확인 시각}
+_revision_fetch_locks = {'work': threading.Lock(), 'sales': threading.Lock()}
+_drive_v3_service = None
+
+
+def get_drive_v3_service():
+    """Drive API v3 (통합문서 version 확인·공지 PDF). 여러 스레드가 함께 써도 됨."""
+    global _drive_v3_service
+    with _revision_lock:
+        if _drive_v3_service is None:
+            _drive_v3_service = _build_service('drive', 'v3')
+        return _drive_v3_service
+
+
+def _workbook_file_id(kind):
+    if kind == 'sales':
+        return config.SALES_SPREADSHEET_ID or get_sales_spreadsheet().id
+    return _work_spreadsheet_id()
+
+
+def workbook_revision(kind, refresh=True):
+    """통합문서 수정 세대 문자열. 마지막 확인이 WORKBOOK_REVISION_CHECK_SEC 이내면 그 값을 재사용.
+
+    refresh=False 면 네트워크 없이 마지막으로 확인한 값만 반환. 기능이 꺼져 있거나 확인에
+    실패하면 None (호출자는 TTL 로만 판단)."""
+    if not config.SHEETS_REVALIDATE_ENABLED:
+        return None
+    with _revision_lock:
+        state = _revision_state.get(kind)
+    if state is not None and (not refresh or time.time() - state['ts'] < WORKBOOK_REVISION_CHECK_SEC):
+        return state['version']
+    if not refresh:
+        return None
+    with _revision_fetch_locks[kind]:
+        with _revision_lock:
+            state = _revision_state.get(kind)
+        if state is not None and time.time() - state['ts'] < WORKBOOK_REVISION_CHECK_SEC:
+            return state['version']
+        try:
+            meta = get_drive_v3_service().files().get(
+                fileId=_workbook_file_id(kind), fields='version,modifiedTime', supportsAllDrives=True
+            ).execute()
+            version = str(meta.get('version') or meta.get('modifiedTime') or '') or None
+        except Exception as e:
+            print(f'Warning: {kind} 통합문서 수정 세대 확인 실패 — TTL 로만 판단합니다 ({e})')
+            version = None
+        with _revision_lock:
+            _revision_state[kind] = {'version': version, 'ts': time.time()}
+        return version
+
+
+def workbook_revisions(kinds, refresh=True):
+    """여러 통합문서 세대를 튜플로. 하나라도 모르면 None."""
+    versions = tuple(workbook_revision(k, refresh=refresh) for k in kinds)
+    return None if any(v is None for v in versions) else versions
+
 
 def get_accounts_data():
     """accounts 시트에서 모든 사용자 데이터 가져오기 (단기 캐시로 읽기 호출 감소)."""
-    global _accounts_cache_records, _accounts_cache_ts
-
-    now = time.time()
-    with _accounts_cache_lock:
-        if _accounts_cache_records is not None and now - _accounts_cache_ts < ACCOUNTS_CACHE_TTL_SEC:
-            return list(_accounts_cache_records)
+    cached = _accounts_cache.get(ACCOUNTS_CACHE_KEY)
+    if cached is not None and time.time() - cached['ts'] < ACCOUNTS_CACHE_TTL_SEC:
+        return list(cached['records'])
+    stale_records = cached['records'] if cached is not None else None
+    # 읽기 예산이 바닥이면 대기·429 대신 직전 캐시로 응답
+    if stale_records is not None and not sheets_quota.has_budget('read'):
+        return list(stale_records)
 
     def fetch_records():
+        mirrored = sheets_mirror.read_values('work', 'accounts')
+        if mirrored is not None:
+            # get_all_records 와 같은 형태 (헤더 길이로 채우고 숫자 문자열은 숫자로)
+            header = mirrored[0]
+            return [
+                dict(zip(header, gspread.utils.numericise_all(list(r) + [''] * (len(header) - len(r)))))
+                for r in mirrored[1:]
+            ]
         worksheet = get_worksheet("accounts")
         return worksheet.get_all_records()
         
@@ -226,19 +526,15 @@ def get_accounts_data():
                 normalized_record[normalized_key] = value
             normalized_records.append(normalized_record)
         
-        with _accounts_cache_lock:
-            _accounts_cache_records = normalized_records
-            _accounts_cache_ts = time.time()
+        _accounts_cache.set(ACCOUNTS_CACHE_KEY, {'records': normalized_records, 'ts': time.time()})
         return list(normalized_records)
     except Exception as e:
         print(f"Error getting accounts data: {e}")
         import traceback
         traceback.print_exc()
-        with _accounts_cache_lock:
-            stale = _accounts_cache_records
-        if stale is not None:
+        if stale_records is not None:
             print('Warning: accounts 시트 조회 실패 — 직전에 성공한 캐시 데이터를 사용합니다.')
-            return list(stale)
+            return list(stale_records)
         return []
 
 def get_user_by_id(employee_id):
@@ -274,6 +570,7 @@ def get_user_by_id(employee_id):
         traceback.print_exc()
         return None
 
+@sheets_quota.write_path
 def update_user_password(employee_id, password_hash):
     """사용자 비밀번호 해시 업데이트"""
     try:
@@ -299,6 +596,10 @@ def update_user_password(employee_id, password_hash):
                 row_employee_id = str(row[employee_id_col - 1]).strip() if row[employee_id_col - 1] else ""
                 if row_employee_id == str(employee_id).strip():
                     worksheet.update_cell(i, password_hash_col, password_hash)
+                    # 다른 워커가 이전 해시로 인증하지 않도록 (공유 캐시일 때 특히)
+                    _accounts_cache.clear(ACCOUNTS_CACHE_KEY)
+                    _set_values_cell(accounts, i, password_hash_col, password_hash)
+                    sheets_mirror.put_row('work', 'accounts', i, accounts[i - 1])
                     return True
         return False
     except Exception as e:
@@ -314,6 +615,14 @@ LOANER_DB_READ_RANGE = 'A:F'  # 차량번호·차종·대차가능·신청일·
 ACCOUNTS_READ_RANGE = 'A:Z'  # accounts 시트(아이디/해시 등) 조회 범위
 
 
+def _read_mirrored_values(kind, title, fetch_fn, employee_id=None):
+    """로컬 미러(utils/sheets_mirror)에 최신 값이 있으면 그 값, 없으면 fetch_fn() 으로 Sheets 조회."""
+    mirrored = sheets_mirror.read_values(kind, title, employee_id=employee_id)
+    if mirrored is not None:
+        return mirrored
+    return fetch_fn()
+
+
 def _rows_to_dict_records(raw_rows):
     """시트 2차원 배열을 get_all_records와 유사한 dict 리스트로 변환"""
     if not raw_rows:
@@ -321,59 +630,274 @@ def _rows_to_dict_records(raw_rows):
     header = [str(h).strip() for h in raw_rows[0]]
     records = []
     for row in raw_rows[1:]:
-        rec = {}
-        for i, key in enumerate(header):
-            if not key:
-                continue
-            val = row[i] if i < len(row) else ''
-            rec[key] = '' if val is None or val == '' else str(val).strip()
+        rec = _row_to_dict_record(header, row)
         if rec.get('사번'):
             records.append(rec)
     return records
 
 
-def get_monthly_work_data(month_sheet_name, spreadsheet=None):
-    """월별 근무 데이터 가져오기 (A:AM 범위만 조회, 캘린더·근무표에 충분).
-    spreadsheet가 있으면 get_spreadsheet() 재호출 없이 해당 통합문서에서 시트만 연다."""
+def _row_to_dict_record(header, row):
+    rec = {}
+    for i, key in enumerate(header):
+        if not key:
+            continue
+        val = row[i] if i < len(row) else ''
+        rec[key] = '' if val is None or val == '' else str(val).strip()
+    return rec
+
+
+WORK_GRID_CACHE_TTL_SEC = config.WORK_DATA_CACHE_SECONDS
+_work_grid_lock = threading.Lock()
+_work_grid_entries = {}  # 월 시트 이름 → {'header', 'records', 'by_employee', 'row_numbers', 'matrix', 'ts', 'loaded', 'rev'}
+_work_grid_load_locks = {}
+
+
+def _build_work_grid_entry(raw_values):
+    """월 시트 원시 값 → 전 기사 공용 레코드 + 사번별 인덱스(레코드·시트 행 번호)."""
+    header = [str(h).strip() for h in raw_values[0]] if raw_values else []
+    records = []
+    by_employee = {}
+    row_numbers = {}
+    for row_num, row in enumerate((raw_values or [])[1:], start=2):
+        rec = _row_to_dict_record(header, row)
+        eid = rec.get('사번')
+        if not eid:
+            continue
+        records.append(rec)
+        by_employee.setdefault(eid, []).append(rec)
+        row_numbers.setdefault(eid, []).append(row_num)
+    return {
+        'header': header,
+        'records': records,
+        'by_employee': by_employee,
+        'row_numbers': row_numbers,
+        # 날짜 열 상태 코드 배열 (records 와 같은 행 순서) — 개수·우선순위·전체 합계를 벡터 연산으로
+        'matrix': month_grid.MonthGrid.from_values(raw_values),
+        'ts': time.time(),
+    }
+
+
+def _store_work_grid(month_sheet_name, raw_values):
+    """월 시트 한 번 읽은 결과를 공유 그리드로 저장 (모든 사번이 재사용)."""
+    entry = _build_work_grid_entry(raw_values)
+    entry['loaded'] = entry['ts']
+    entry['rev'] = workbook_revision('work', refresh=False)
+    with _work_grid_lock:
+        _work_grid_entries[month_sheet_name] = entry
+    return entry
+
+
+def _peek_work_grid(month_sheet_name, allow_stale=False):
+    with _work_grid_lock:
+        entry = _work_grid_entries.get(month_sheet_name)
+    if entry is None:
+        return None
+    if not allow_stale and time.time() - entry['ts'] > WORK_GRID_CACHE_TTL_SEC:
+        return None
+    return entry
+
+
+def invalidate_work_grid(month_sheet_name=None):
+    """공유 월 그리드 삭제 (month_sheet_name이 None이면 전체)."""
+    with _work_grid_lock:
+        if month_sheet_name is None:
+            _work_grid_entries.clear()
+        else:
+            _work_grid_entries.pop(month_sheet_name, None)
+
+
+def _revalidate_work_grid(month_sheet_name):
+    """TTL 이 지난 그리드라도 work 통합문서 세대가 읽을 때와 같으면 TTL 을 연장해 반환."""
+    stale = _peek_work_grid(month_sheet_name, allow_stale=True)
+    if stale is None or stale.get('rev') is None:
+        return None
+    if time.time() - stale['loaded'] > config.SHEETS_REVALIDATE_MAX_AGE_SEC:
+        return None
+    if workbook_revision('work') != stale['rev']:
+        return None
+    with _work_grid_lock:
+        if _work_grid_entries.get(month_sheet_name) is stale:
+            stale['ts'] = time.time()
+    return stale
+
+
+def _fetch_work_month_values(month_sheet_name, spreadsheet=None, use_mirror=True):
+    if use_mirror and (spreadsheet is None or _registry_kind_of(spreadsheet) == 'work'):
+        mirrored = sheets_mirror.read_values('work', month_sheet_name)
+        if mirrored is not None:
+            return mirrored
+
     def _fetch_values():
-        ss = spreadsheet if spreadsheet is not None else get_spreadsheet()
-        worksheet = ss.worksheet(month_sheet_name)
+        if spreadsheet is None or _registry_kind_of(spreadsheet) == 'work':
+            worksheet = get_worksheet(month_sheet_name)
+        else:
+            worksheet = spreadsheet.worksheet(month_sheet_name)
         return worksheet.get_values(WORK_DB_READ_RANGE)
 
-    try:
-        raw = _retry_sheets_operation(_fetch_values)
-        if not raw:
-            return []
-        return _rows_to_dict_records(raw)
-    except Exception as e:
-        print(f"Error getting monthly work data: {e}")
+    registry_kind = 'work' if spreadsheet is None else _registry_kind_of(spreadsheet)
+    return _retry_sheets_operation(_fetch_values, kind=registry_kind)
+
+
+def get_work_month_grid(month_sheet_name, spreadsheet=None, refresh=False):
+    """월 시트 공유 그리드. 같은 월은 TTL 동안 Sheets 읽기 1회로 전 기사 조회를 처리한다.
+
+    동시에 여러 요청이 캐시 미스를 내도 월별 잠금으로 실제 읽기는 한 번만 수행.
+    읽기 실패 시 만료된 그리드라도 있으면 그대로 반환, 없으면 None.
+    refresh=True 면 캐시·미러를 건너뛰고 시트를 바로 읽는다 (쓰기 직전 행 위치 확인용, 실패 시 None)."""
+    if refresh:
+        try:
+            raw = _fetch_work_month_values(month_sheet_name, spreadsheet, use_mirror=False)
+            return _store_work_grid(month_sheet_name, raw)
+        except Exception as e:
+            print(f"Error getting monthly work data: {e}")
+            return None
+    entry = _peek_work_grid(month_sheet_name)
+    if entry is not None:
+        return entry
+    # 통합문서가 그대로면 시트를 다시 읽지 않고 연장
+    entry = _revalidate_work_grid(month_sheet_name)
+    if entry is not None:
+        return entry
+    # 읽기 예산이 바닥이면 만료된 그리드라도 있으면 그대로 사용 (대기 대신 stale)
+    stale = _peek_work_grid(month_sheet_name, allow_stale=True)
+    if stale is not None and not sheets_quota.has_budget('read'):
+        return stale
+    with _work_grid_lock:
+        load_lock = _work_grid_load_locks.setdefault(month_sheet_name, threading.Lock())
+    with load_lock:
+        entry = _peek_work_grid(month_sheet_name)
+        if entry is not None:
+            return entry
+        try:
+            raw = _fetch_work_month_values(month_sheet_name, spreadsheet)
+            return _store_work_grid(month_sheet_name, raw)
+        except Exception as e:
+            print(f"Error getting monthly work data: {e}")
+            stale = _peek_work_grid(month_sheet_name, allow_stale=True)
+            if stale is not None:
+                print(f'Warning: {month_sheet_name} 시트 조회 실패 — 직전 공유 그리드를 사용합니다.')
+            return stale
+
+
+def get_work_month_grids(month_sheet_names):
+    """여러 월의 공유 그리드 {월: 그리드}. 캐시·미러에 없는 월은 values.batchGet 1회(구간당
+    SHEETS_WORK_BATCH_CHUNK 개)로 묶어 읽는다. batchGet 이 실패한 구간은 월별 get_work_month_grid 로 폴백,
+    그래도 읽지 못한 월은 결과에서 빠진다."""
+    out = {}
+    missing = []
+    for mn in month_sheet_names:
+        entry = _peek_work_grid(mn) or _revalidate_work_grid(mn)
+        if entry is None:
+            mirrored = sheets_mirror.read_values('work', mn)
+            if mirrored is not None:
+                entry = _store_work_grid(mn, mirrored)
+        if entry is not None:
+            out[mn] = entry
+        else:
+            missing.append(mn)
+    if not missing:
+        return out
+
+    sid = _work_spreadsheet_id()
+    BATCH = max(1, min(200, int(getattr(config, 'SHEETS_WORK_BATCH_CHUNK', 90))))
+    for off in range(0, len(missing), BATCH):
+        chunk = missing[off : off + BATCH]
+        try:
+            resp = _sheet_values_batch_get(sid, [_sheet_title_to_a1_range(mn, WORK_DB_READ_RANGE) for mn in chunk])
+        except Exception as ex:
+            print(f'work DB batchGet 실패(chunk {off}-{off + len(chunk)}): {str(ex)[:400]}')
+            resp = {}
+        raw_by_sheet = {}
+        for vr in (resp.get('valueRanges') or []):
+            name = _sheet_name_from_batch_range(vr.get('range', '') or '')
+            if name:
+                raw_by_sheet[name] = vr.get('values') or []
+        for mn in chunk:
+            if mn in raw_by_sheet:
+                out[mn] = _store_work_grid(mn, raw_by_sheet[mn])
+                continue
+            entry = get_work_month_grid(mn)
+            if entry is not None:
+                out[mn] = entry
+    return out
+
+
+def _employee_records_from_grid(entry, employee_id):
+    """공유 그리드에서 사번 행들의 복사본 (호출자가 키를 더해도 다른 기사가 보는 그리드는 그대로)."""
+    if entry is None:
         return []
+    return [dict(rec) for rec in entry['by_employee'].get(str(employee_id).strip(), [])]
+
+
+def get_monthly_work_data(month_sheet_name, spreadsheet=None):
+    """월별 근무 데이터 가져오기 (A:AM 범위, 공유 월 그리드 경유).
+    spreadsheet가 있으면 get_spreadsheet() 재호출 없이 해당 통합문서에서 시트만 연다."""
+    entry = get_work_month_grid(month_sheet_name, spreadsheet)
+    return [dict(rec) for rec in entry['records']] if entry is not None else []
 
 def get_user_work_data(employee_id, month_sheet_name):
     """특정 사용자의 월별 근무 데이터 가져오기 (첫 번째 행만 반환)"""
     try:
-        records = get_monthly_work_data(month_sheet_name)
-        for record in records:
-            if str(record.get('사번', '')).strip() == str(employee_id).strip():
-                return record
-        return None
+        records = _employee_records_from_grid(get_work_month_grid(month_sheet_name), employee_id)
+        return records[0] if records else None
     except Exception as e:
         print(f"Error getting user work data: {e}")
         return None
 
 def get_all_user_work_data(employee_id, month_sheet_name, spreadsheet=None):
-    """특정 사용자의 월별 근무 데이터 가져오기 (같은 사번의 모든 행 반환)"""
+    """특정 사용자의 월별 근무 데이터 가져오기 (같은 사번의 모든 행 반환).
+    공유 월 그리드에서 사번 인덱스로 꺼내므로 기사 수만큼 시트를 다시 읽지 않는다."""
     try:
-        records = get_monthly_work_data(month_sheet_name, spreadsheet)
-        user_records = []
-        for record in records:
-            if str(record.get('사번', '')).strip() == str(employee_id).strip():
-                user_records.append(record)
+        user_records = _employee_records_from_grid(
+            get_work_month_grid(month_sheet_name, spreadsheet), employee_id
+        )
         return user_records if user_records else None
     except Exception as e:
         print(f"Error getting all user work data: {e}")
         return None
 
+# ----- 쓰기 델타 알림 -----
+# 근무 상태·매출 기록이 성공하면 그 사번·월 집계의 증감({ROLLUP_FIELDS 일부: 증감})을 등록된 함수에 알린다.
+# app 은 이를 연간 통계 캐시·스냅샷·고정된 월 롤업에 더해, 쓰기마다 전체를 무효화·재계산하지 않는다.
+_stats_delta_listeners = []
+
+
+def on_stats_delta(fn):
+    """fn(사번, 월 시트 이름, {필드: 증감}) 등록. 쓰기 성공 직후 호출되며 예외는 경고만 남긴다."""
+    _stats_delta_listeners.append(fn)
+
+
+def _emit_stats_delta(employee_id, month_sheet_name, deltas, source):
+    deltas = {k: v for k, v in deltas.items() if v}
+    if not deltas:
+        return
+    metrics.inc('stats_deltas_total', {'source': source})
+    for fn in list(_stats_delta_listeners):
+        try:
+            fn(str(employee_id).strip(), month_sheet_name, deltas)
+        except Exception as ex:
+            print(f'Warning: 통계 증감 반영 실패 ({month_sheet_name}, {employee_id}): {ex}')
+
+
+def _work_row_deltas(header, old_row, new_row, first_row):
+    """근무 행 쓰기 전후 값 → 월 집계 증감 (근무일·결근일 열, 예정일 R 수).
+    예정일은 월 집계가 사번의 첫 행만 세므로 first_row 일 때만 반영한다."""
+    def stat(row, col_name):
+        idx = header.index(col_name) if col_name in header else None
+        return _safe_int_days(row[idx]) if idx is not None and idx < len(row) else 0
+
+    deltas = {
+        'work_days': stat(new_row, '근무일') - stat(old_row, '근무일'),
+        'absent_days': stat(new_row, '결근일') - stat(old_row, '결근일'),
+    }
+    if first_row:
+        deltas['scheduled_days'] = (
+            month_grid.count_row_statuses(header, new_row)['R'] - month_grid.count_row_statuses(header, old_row)['R']
+        )
+    return deltas
+
+
+@sheets_quota.write_path
 def update_work_status(employee_id, date, month_sheet_name, status='O', work_details=None, vehicle_number=None, work_type=None):
     """근무 상태 업데이트 (O 또는 X) 및 메모 추가
     
@@ -387,8 +911,10 @@ def update_work_status(employee_id, date, month_sheet_name, status='O', work_det
         work_type: 근무유형 (선택사항, 지정하면 해당 근무유형의 행을 찾음)
     """
     try:
+        all_values = _retry_sheets_operation(
+            lambda: get_worksheet(month_sheet_name).get_values(WORK_DB_READ_RANGE), kind='work'
+        )
         worksheet = get_worksheet(month_sheet_name)
-        all_values = worksheet.get_values(WORK_DB_READ_RANGE)
         
         if not all_values:
             return False
@@ -428,6 +954,13 @@ def update_work_status(employee_id, date, month_sheet_name, status='O', work_det
         if date_col is None:
             return False
         
+        # 사번의 첫 행 (월 집계의 예정일은 이 행 기준)
+        first_row = next(
+            (r for r, row in enumerate(all_values[1:], start=2)
+             if len(row) >= employee_id_col and str(row[employee_id_col - 1]).strip() == str(employee_id).strip()),
+            None,
+        )
+
         # 해당 사번의 행 찾기 (차량번호와 근무유형이 있으면 모두 일치하는 행 찾기)
         for i, row in enumerate(all_values[1:], start=2):
             if len(row) >= employee_id_col:
@@ -455,40 +988,33 @@ def update_work_status(employee_id, date, month_sheet_name, status='O', work_det
                         # 근무유형 컬럼이 없으면 첫 번째 일치하는 행 사용
                         pass
                     
-                    # 상태 업데이트
-                    worksheet.update_cell(i, date_col, status)
-                    
-                    # 메모 추가 (work_details가 있는 경우)
-                    if work_details:
-                        note_text = format_work_details_note(work_details)
-                        if note_text:  # 메모 내용이 있을 때만 추가
-                            try:
-                                # gspread의 셀 주소 변환 함수 사용
-                                from gspread.utils import rowcol_to_a1
-                                cell_address = rowcol_to_a1(i, date_col)
-                                
-                                # gspread의 insert_note 메서드 사용 (버전에 따라 다를 수 있음)
-                                if hasattr(worksheet, 'insert_note'):
-                                    worksheet.insert_note(cell_address, note_text)
-                                else:
-                                    # insert_note가 없으면 Google Sheets API 직접 사용
-                                    add_note_via_api(worksheet, i, date_col, note_text)
-                            except Exception as note_error:
-                                # 모든 방법 실패 시 API 직접 사용
-                                print(f"Warning: Could not insert note: {note_error}")
-                                try:
-                                    add_note_via_api(worksheet, i, date_col, note_text)
-                                except Exception as api_error:
-                                    print(f"Warning: Could not insert note via API: {api_error}")
-                    
-                    # 근무일수와 결근일수 업데이트
-                    update_work_stats(worksheet, i, header, employee_id)
+                    # 상태·메모·근무일/결근일을 이미 읽은 행으로 계산해 batchUpdate 1회로 기록
+                    note_text = format_work_details_note(work_details) if work_details else ''
+                    old_row = list(all_values[i - 1])
+                    counts = _write_work_status_batch(worksheet, header, all_values, i, date_col, status, note_text)
+                    if note_text:
+                        _remember_work_note(month_sheet_name, date, i, note_text, employee_id)
+
+                    # 이미 읽은 시트 값에 쓰기 결과를 반영해 공유 월 그리드 갱신 (재조회 없음)
+                    _set_values_cell(all_values, i, date_col, status)
+                    if counts is not None:
+                        for col_name, value in zip(('근무일', '결근일'), counts):
+                            if col_name in header:
+                                _set_values_cell(all_values, i, header.index(col_name) + 1, value)
+                    _store_work_grid(month_sheet_name, all_values)
+                    sheets_mirror.put_row('work', month_sheet_name, i, all_values[i - 1])
+                    _emit_stats_delta(
+                        employee_id, month_sheet_name,
+                        _work_row_deltas(header, old_row, all_values[i - 1], i == first_row), 'work'
+                    )
                     return True
         return False
     except Exception as e:
         print(f"Error updating work status: {e}")
         import traceback
         traceback.print_exc()
+        # 쓰기 도중 실패하면 시트가 어디까지 바뀌었는지 모르므로 공유 그리드를 버리고 다음 조회 때 다시 읽는다
+        invalidate_work_grid(month_sheet_name)
         return False
 
 def format_work_details_note(work_details):
@@ -512,75 +1038,86 @@ def format_work_details_note(work_details):
     
     return "\n".join(note_lines) if note_lines else ""
 
+_sheet_id_lock = threading.Lock()
+_sheet_id_maps = {}  # spreadsheet_id → {'version': 레지스트리 세대, 'ids': {시트 제목: sheetId}}
+
+
+def _sheet_id_for_title(spreadsheet_id, title):
+    """시트 제목 → sheetId (캐시). 레지스트리 매핑 세대가 바뀌면(이름 변경 등) 다시 구한다.
+
+    레지스트리에 등록된 통합문서는 추가 API 호출 없이, 그 외에는 sheetId·title만 담은
+    메타데이터 1회 조회로 채운다."""
+    kind = _registry_kind_of_id(spreadsheet_id)
+    version = worksheet_registry_version(kind) if kind else 0
+    with _sheet_id_lock:
+        cached = _sheet_id_maps.get(spreadsheet_id)
+        if cached is not None and cached['version'] == version and title in cached['ids']:
+            return cached['ids'][title]
+
+    if kind == 'work':
+        ids = {title: get_worksheet(title).id}
+    elif kind == 'sales':
+        ids = {title: get_sales_worksheet(title).id}
+    else:
+        def _call():
+            return _get_sheets_v4_service().spreadsheets().get(
+                spreadsheetId=spreadsheet_id,
+                fields='sheets.properties(sheetId,title)',
+            ).execute()
+
+        metadata = _retry_sheets_operation(_call)
+        ids = {
+            sh['properties']['title']: sh['properties']['sheetId']
+            for sh in metadata.get('sheets', [])
+        }
+    version = worksheet_registry_version(kind) if kind else 0
+    with _sheet_id_lock:
+        cached = _sheet_id_maps.get(spreadsheet_id)
+        if cached is None or cached['version'] != version:
+            cached = _sheet_id_maps[spreadsheet_id] = {'version': version, 'ids': {}}
+        cached['ids'].update(ids)
+        return cached['ids'].get(title)
+
+
+def _worksheet_spreadsheet_id(worksheet):
+    ss = getattr(worksheet, 'spreadsheet', None)
+    return getattr(ss, 'id', None) or config.SPREADSHEET_ID or get_spreadsheet().id
+
+
 def add_note_via_api(worksheet, row, col, note_text):
-    """Google Sheets API를 사용하여 메모 추가"""
+    """Google Sheets API를 사용하여 메모 추가 (공용 v4 서비스 + 캐시된 sheetId → batchUpdate 1회)."""
     try:
-        from googleapiclient.discovery import build
-        from google.oauth2.service_account import Credentials
-        import config
-        
-        # 인증 정보 가져오기
-        credentials_dict = config.get_google_credentials()
-        if credentials_dict:
-            creds = Credentials.from_service_account_info(
-                credentials_dict,
-                scopes=config.SCOPES
-            )
-        else:
-            creds = Credentials.from_service_account_file(
-                config.CREDENTIALS_FILE,
-                scopes=config.SCOPES,
-            )
-        
-        # Google Sheets API 서비스 빌드
-        service = build('sheets', 'v4', credentials=creds)
-        
-        # 스프레드시트 ID 가져오기
-        spreadsheet_id = config.SPREADSHEET_ID
-        if not spreadsheet_id:
-            spreadsheet = get_spreadsheet()
-            spreadsheet_id = spreadsheet.id
-        
-        # 시트 ID 가져오기 (API를 통해 메타데이터 가져오기)
-        metadata = service.spreadsheets().get(spreadsheetId=spreadsheet_id).execute()
-        sheet_id = None
-        for sheet in metadata.get('sheets', []):
-            if sheet['properties']['title'] == worksheet.title:
-                sheet_id = sheet['properties']['sheetId']
-                break
-        
-        if sheet_id is None:
-            print(f"Error: Could not find sheet ID for {worksheet.title}")
-            return False
-        
-        # 메모 추가 요청
-        requests = [{
-            'updateCells': {
-                'range': {
-                    'sheetId': sheet_id,
-                    'startRowIndex': row - 1,
-                    'endRowIndex': row,
-                    'startColumnIndex': col - 1,
-                    'endColumnIndex': col
-                },
-                'rows': [{
-                    'values': [{
-                        'note': note_text
-                    }]
-                }],
-                'fields': 'note'
+        spreadsheet_id = _worksheet_spreadsheet_id(worksheet)
+
+        def _call():
+            sheet_id = _sheet_id_for_title(spreadsheet_id, worksheet.title)
+            if sheet_id is None:
+                raise gspread.exceptions.WorksheetNotFound(worksheet.title)
+            body = {
+                'requests': [{
+                    'updateCells': {
+                        'range': {
+                            'sheetId': sheet_id,
+                            'startRowIndex': row - 1,
+                            'endRowIndex': row,
+                            'startColumnIndex': col - 1,
+                            'endColumnIndex': col
+                        },
+                        'rows': [{
+                            'values': [{
+                                'note': note_text
+                            }]
+                        }],
+                        'fields': 'note'
+                    }
+                }]
             }
-        }]
-        
-        body = {
-            'requests': requests
-        }
-        
-        service.spreadsheets().batchUpdate(
-            spreadsheetId=spreadsheet_id,
-            body=body
-        ).execute()
-        
+            return _get_sheets_v4_service().spreadsheets().batchUpdate(
+                spreadsheetId=spreadsheet_id,
+                body=body
+            ).execute()
+
+        _retry_sheets_operation(_call, kind=_registry_kind_of_id(spreadsheet_id))
         print(f"Successfully added note to cell row {row}, col {col}")
         return True
     except Exception as e:
@@ -589,76 +1126,106 @@ def add_note_via_api(worksheet, row, col, note_text):
         traceback.print_exc()
         return False
 
-def update_work_stats(worksheet, row_num, header, employee_id):
-    """근무일/결근일 자동 계산 및 업데이트."""
+def _set_values_cell(all_values, row_num, col_num, value):
+    """get_values 2차원 배열의 (행, 열)(1-base)에 값 반영 (짧은 행은 빈 칸으로 채움)."""
+    if row_num < 1 or row_num > len(all_values):
+        return
+    row = all_values[row_num - 1]
+    if len(row) < col_num:
+        row.extend([''] * (col_num - len(row)))
+    row[col_num - 1] = '' if value is None else str(value)
+
+
+def _count_work_statuses(header, row_values):
+    """행 값에서 날짜 열(1~31)의 O(근무)·X(결근) 개수 → (근무일, 결근일)."""
+    counts = month_grid.count_row_statuses(header, row_values)
+    return counts['O'], counts['X']
+
+
+def _cell_update_request(sheet_id, row_num, col_num, cell, fields):
+    return {
+        'updateCells': {
+            'range': {
+                'sheetId': sheet_id,
+                'startRowIndex': row_num - 1,
+                'endRowIndex': row_num,
+                'startColumnIndex': col_num - 1,
+                'endColumnIndex': col_num,
+            },
+            'rows': [{'values': [cell]}],
+            'fields': fields,
+        }
+    }
+
+
+def _spreadsheet_batch_update(spreadsheet_id, requests_fn):
+    """spreadsheets.batchUpdate 1회 (429·시트 이름 변경 시 재시도). requests_fn은 매 시도마다 요청 목록 생성."""
+    def _call():
+        return _get_sheets_v4_service().spreadsheets().batchUpdate(
+            spreadsheetId=spreadsheet_id,
+            body={'requests': requests_fn()},
+        ).execute()
+
+    return _retry_sheets_operation(_call, kind=_registry_kind_of_id(spreadsheet_id))
+
+
+def _write_work_status_batch(worksheet, header, all_values, row_num, date_col, status, note_text):
+    """근무 상태 값·메모·근무일/결근일을 spreadsheets.batchUpdate 1회로 기록.
+
+    근무일/결근일은 이미 읽은 행(all_values)에 새 상태를 반영해 계산하므로 행 재조회가 없다.
+    통계 셀이 보호되어 한 번에 실패하면 상태·메모만 먼저 쓰고 통계는 따로 시도한다(기존 경고 유지).
+    all_values 는 바꾸지 않는다 (행 복사본으로 계산, 기록이 끝난 뒤 호출자가 반영).
+    반환: (근무일, 결근일), 통계 셀 기록만 실패하면 None."""
+    row_values = list(all_values[row_num - 1])
+    if len(row_values) < date_col:
+        row_values.extend([''] * (date_col - len(row_values)))
+    row_values[date_col - 1] = str(status)
+    counts = _count_work_statuses(header, row_values)
+    spreadsheet_id = _worksheet_spreadsheet_id(worksheet)
+    title = worksheet.title
+
+    def status_requests():
+        sheet_id = _sheet_id_for_title(spreadsheet_id, title)
+        cell = {'userEnteredValue': {'stringValue': str(status)}}
+        fields = 'userEnteredValue'
+        if note_text:
+            cell['note'] = note_text
+            fields = 'userEnteredValue,note'
+        return [_cell_update_request(sheet_id, row_num, date_col, cell, fields)]
+
+    def stats_requests():
+        sheet_id = _sheet_id_for_title(spreadsheet_id, title)
+        out = []
+        for col_name, value in zip(('근무일', '결근일'), counts):
+            if col_name in header:
+                out.append(_cell_update_request(
+                    sheet_id, row_num, header.index(col_name) + 1,
+                    {'userEnteredValue': {'numberValue': value}}, 'userEnteredValue',
+                ))
+        return out
+
     try:
-        # 날짜 컬럼 찾기 (1~31)
-        date_columns = []
-        for col_idx, col_name in enumerate(header, start=1):
-            try:
-                day = int(str(col_name).strip())
-                if 1 <= day <= 31:
-                    date_columns.append((col_idx, day))
-            except (ValueError, AttributeError):
-                continue
-        
-        # O와 X 개수 계산
-        work_count = 0
-        absent_count = 0
-        
-        # 업데이트 후 최신 데이터 가져오기
-        row_values = worksheet.row_values(row_num)
-        for col_idx, day in date_columns:
-            if col_idx <= len(row_values):
-                value = str(row_values[col_idx - 1]).strip().upper()
-                if value == 'O':
-                    work_count += 1
-                elif value == 'X':
-                    absent_count += 1
-        
-        # 근무일/결근일 컬럼 찾기
-        try:
-            from gspread.utils import rowcol_to_a1
-            work_days_col = header.index('근무일') + 1
-            absent_days_col = header.index('결근일') + 1
+        _spreadsheet_batch_update(spreadsheet_id, lambda: status_requests() + stats_requests())
+        return counts
+    except Exception as e:
+        if isinstance(e, sheets_quota.QuotaExhausted):
+            raise
+        print(f"Warning: 근무 상태·통계 일괄 기록 실패, 상태만 다시 기록합니다: {e}")
 
-            # 네트워크 왕복 감소: 두 셀을 batch_update 1회로 처리
-            ranges = [
-                {
-                    'range': rowcol_to_a1(row_num, work_days_col),
-                    'values': [[work_count]],
-                },
-                {
-                    'range': rowcol_to_a1(row_num, absent_days_col),
-                    'values': [[absent_count]],
-                },
-            ]
-            try:
-                worksheet.batch_update(ranges, value_input_option='USER_ENTERED')
-            except Exception:
-                # 배치 업데이트 실패 시 기존 방식으로 폴백 (보호 셀 메시지 유지)
-                try:
-                    worksheet.update_cell(row_num, work_days_col, work_count)
-                except Exception as e:
-                    error_msg = str(e)
-                    if 'protected' in error_msg.lower() or 'permission' in error_msg.lower():
-                        print("Warning: '근무일' 셀이 보호되어 있어 업데이트를 건너뜁니다.")
-                    else:
-                        print(f"Warning: '근무일' 업데이트 실패: {e}")
-
-                try:
-                    worksheet.update_cell(row_num, absent_days_col, absent_count)
-                except Exception as e:
-                    error_msg = str(e)
-                    if 'protected' in error_msg.lower() or 'permission' in error_msg.lower():
-                        print("Warning: '결근일' 셀이 보호되어 있어 업데이트를 건너뜁니다.")
-                    else:
-                        print(f"Warning: '결근일' 업데이트 실패: {e}")
-        except ValueError:
-            # 컬럼이 없으면 스킵
-            pass
+    # 상태·메모는 반드시 기록 (실패 시 예외 → update_work_status 실패 처리)
+    _spreadsheet_batch_update(spreadsheet_id, status_requests)
+    try:
+        if stats_requests():
+            _spreadsheet_batch_update(spreadsheet_id, stats_requests)
+        return counts
     except Exception as e:
-        print(f"Error updating work stats: {e}")
+        error_msg = str(e)
+        if 'protected' in error_msg.lower() or 'permission' in error_msg.lower():
+            print("Warning: '근무일'/'결근일' 셀이 보호되어 있어 업데이트를 건너뜁니다.")
+        else:
+            print(f"Warning: '근무일'/'결근일' 업데이트 실패: {e}")
+        return None
+
 
 def get_all_months_data(employee_id):
     """사용자의 모든 월별 데이터 가져오기 (첫 번째 행만 반환)"""
@@ -716,171 +1283,178 @@ def _aggregate_user_month_records(all_records):
     return aggregated
 
 
-def _work_history_fetch_one_month(employee_id, month_name, spreadsheet, work_data_cache):
-    """한 개월 시트 조회 → 사번 필터 → 집계. work_data_cache는 app.SimpleCache( get/set )."""
-    cache_key = f"work_data:{employee_id}:{month_name}"
-    if work_data_cache is not None:
-        cached = work_data_cache.get(cache_key)
-        if cached is not None:
-            return month_name, _aggregate_user_month_records(cached)
-    records = get_monthly_work_data(month_name, spreadsheet)
-    user_records = []
-    for record in records:
-        if str(record.get('사번', '')).strip() == str(employee_id).strip():
-            user_records.append(record)
-    user_list = user_records if user_records else None
-    if work_data_cache is not None and user_list is not None:
-        work_data_cache.set(cache_key, user_list)
-    return month_name, _aggregate_user_month_records(user_list)
-
-
-def _aggregate_work_month_from_sheet_raw(month_name, raw_values, employee_id, work_data_cache):
-    """batchGet 결과 2차원 배열 한 시트 분 → 집계·워크 캐시 반영."""
-    cache_key = f"work_data:{employee_id}:{month_name}"
-    records = _rows_to_dict_records(raw_values or [])
-    user_records = [
-        r for r in records
-        if str(r.get('사번', '')).strip() == str(employee_id).strip()
-    ]
-    user_list = user_records if user_records else None
-    if work_data_cache is not None and user_list is not None:
-        work_data_cache.set(cache_key, user_list)
-    return month_name, _aggregate_user_month_records(user_list)
-
-
-def get_all_months_aggregated_data(
-    employee_id,
-    reference_date=None,
-    recent_months=None,
-    work_data_cache=None,
-    max_workers=None,
-):
-    """사용자의 월별 근무 데이터 합산 (근무 이력 차트용).
-
-    미캐시 월은 Sheets API ``values.batchGet`` 으로 한 통합문서당 읽기 호출 횟수를 줄인다(구간당 최대 요청 크기까지 묶음).
-    max_workers 인자는 하위 호환용으로 무시된다.
-    """
-    ref = reference_date or date.today()
-    if recent_months is None:
-        recent_months = 12
-    month_names = work_history_month_sheet_names(ref, recent_months)
-    if not month_names:
-        return {}
+# ----- 근무 셀 메모 일괄 조회 (날짜 열 단위 spreadsheets.get 1회) -----
+WORK_NOTE_CACHE_TTL_SEC = config.WORK_START_INFO_CACHE_SECONDS
+# 메모와 함께 사번 열 값(formattedValue)도 같은 요청으로 받아, 메모마다 그 행의 사번을 붙인다
+WORK_NOTE_FIELDS_MASK = 'sheets(data(startRow,startColumn,rowData(values(note,formattedValue))))'
+# 'work_notes:<월>:<일>' → {시트 행 번호: {'note', 'info', 'eid'}}. APP_CACHE_BACKEND=sqlite 면 워커 공유라
+# 한 워커가 메모를 쓰면 다른 워커도 TTL 을 기다리지 않고 새 메모를 본다.
+_work_note_cache = BoundedCache(default_ttl=WORK_NOTE_CACHE_TTL_SEC, name='work_notes')
 
-    all_data = {}
-    for mn in month_names:
-        ck = f"work_data:{employee_id}:{mn}"
-        if work_data_cache is not None:
-            cached = work_data_cache.get(ck)
-            if cached is not None:
-                ac = _aggregate_user_month_records(cached)
-                if ac:
-                    all_data[mn] = ac
-
-    missing = [mn for mn in month_names if mn not in all_data]
-    if not missing:
-        return all_data
 
-    spreadsheet = get_spreadsheet()
-    sid = spreadsheet.id
-    BATCH = getattr(config, 'SHEETS_WORK_BATCH_CHUNK', 90)
-    BATCH = max(1, min(200, int(BATCH)))
+def _work_note_key(month_sheet_name, day):
+    return f'work_notes:{month_sheet_name}:{int(day)}'
 
-    for off in range(0, len(missing), BATCH):
-        chunk = missing[off : off + BATCH]
-        ranges_a1 = [_sheet_title_to_a1_range(mn, WORK_DB_READ_RANGE) for mn in chunk]
+
+def _parse_work_note(note_text):
+    """근무 셀 메모(운행차량/운행시작일시/근무유형/차량상태/보고사항 줄) → dict."""
+    info = {}
+    for line in (note_text or '').split('\n'):
+        if ':' in line:
+            key, value = line.split(':', 1)
+            key, value = key.strip(), value.strip()
+            if key == '운행차량':
+                info['vehicle_number'] = value
+            elif key == '운행시작일시':
+                info['work_date'] = value
+            elif key == '근무유형':
+                info['work_type'] = value
+            elif key == '차량상태':
+                info['vehicle_condition'] = value
+            elif key == '보고사항':
+                info['special_notes'] = value
+    return info
+
+
+def _work_note_entry(note_text, employee_id):
+    return {'note': note_text, 'info': _parse_work_note(note_text), 'eid': str(employee_id or '').strip()}
+
+
+def _work_spreadsheet_id():
+    return config.SPREADSHEET_ID or get_spreadsheet().id
+
+
+def _column_letters(col):
+    """1-base 열 번호 → A1 열 문자 (예: 39 → AM)."""
+    from gspread.utils import rowcol_to_a1
+    return rowcol_to_a1(1, col)[:-1]
+
+
+def load_work_notes(month_sheet_name, days=None, header=None):
+    """월 시트의 날짜 열 메모와 사번 열을 spreadsheets.get 1회(fields 마스크)로 읽어 공유 캐시에 저장.
+
+    days가 None이면 1~31일 전체 열. header가 없으면 공유 월 그리드의 헤더를 사용한다.
+    메모마다 같은 응답의 사번을 붙이므로 그리드가 오래돼 행이 밀렸어도 메모 주인을 잘못 보지 않는다.
+    반환: {일: {시트 행 번호: {'note', 'info', 'eid'}}}"""
+    if header is None:
+        entry = get_work_month_grid(month_sheet_name)
+        header = entry['header'] if entry is not None else []
+    if '사번' not in header:
+        return {}
+    eid_col = header.index('사번') + 1
+    day_cols = {}
+    for idx, col_name in enumerate(header, start=1):
         try:
-            resp = _sheet_values_batch_get(sid, ranges_a1)
-        except Exception as ex:
-            print(f'work DB batchGet 실패(chunk {off}-{off + len(chunk)}): {str(ex)[:400]}')
-            resp = {}
+            d = int(str(col_name).strip())
+        except (ValueError, TypeError):
+            continue
+        if 1 <= d <= 31 and (days is None or d in days):
+            day_cols.setdefault(d, idx)
+    if not day_cols:
+        return {}
 
-        raw_by_sheet = {}
-        for vr in (resp.get('valueRanges') or []):
-            name = _sheet_name_from_batch_range(vr.get('range', '') or '')
-            if name:
-                raw_by_sheet[name] = vr.get('values')
+    col_to_day = {c: d for d, c in day_cols.items()}
+    if days is None:
+        first, last = min(col_to_day), max(col_to_day)
+        ranges = [_sheet_title_to_a1_range(
+            month_sheet_name, f'{_column_letters(first)}2:{_column_letters(last)}'
+        )]
+    else:
+        ranges = [
+            _sheet_title_to_a1_range(month_sheet_name, f'{_column_letters(c)}2:{_column_letters(c)}')
+            for c in sorted(col_to_day)
+        ]
+    ranges.append(_sheet_title_to_a1_range(
+        month_sheet_name, f'{_column_letters(eid_col)}2:{_column_letters(eid_col)}'
+    ))
 
-        for mn in chunk:
-            raw = raw_by_sheet.get(mn)
-            if raw is None:
-                try:
-                    m2, agg = _work_history_fetch_one_month(employee_id, mn, spreadsheet, work_data_cache)
-                    if agg:
-                        all_data[m2] = agg
-                except Exception as ex:
-                    print(f'work 월별 폴백 실패 ({mn}): {ex}')
-                continue
-            m2, agg = _aggregate_work_month_from_sheet_raw(mn, raw, employee_id, work_data_cache)
-            if agg:
-                all_data[m2] = agg
+    def _call():
+        svc = _get_sheets_v4_service()
+        return svc.spreadsheets().get(
+            spreadsheetId=_work_spreadsheet_id(),
+            ranges=ranges,
+            fields=WORK_NOTE_FIELDS_MASK,
+        ).execute()
+
+    resp = _retry_sheets_operation(_call)
+    eid_by_row = {}
+    found = []  # (일, 시트 행 번호, 메모)
+    for sheet in resp.get('sheets') or []:
+        for grid in sheet.get('data') or []:
+            start_row = int(grid.get('startRow', 0) or 0)
+            start_col = int(grid.get('startColumn', 0) or 0)
+            for r_off, row_data in enumerate(grid.get('rowData') or []):
+                row_num = start_row + r_off + 1
+                for c_off, cell in enumerate(row_data.get('values') or []):
+                    col = start_col + c_off + 1
+                    if col == eid_col:
+                        eid_by_row[row_num] = str(cell.get('formattedValue') or '').strip()
+                    note_text = cell.get('note')
+                    day = col_to_day.get(col)
+                    if note_text and day is not None:
+                        found.append((day, row_num, note_text))
+
+    by_day = {d: {} for d in day_cols}
+    for day, row_num, note_text in found:
+        by_day[day][row_num] = _work_note_entry(note_text, eid_by_row.get(row_num))
+    for d, notes in by_day.items():
+        _work_note_cache.set(_work_note_key(month_sheet_name, d), notes)
+    return by_day
+
+
+def get_work_notes_for_day(month_sheet_name, day, header=None, refresh=False):
+    """(월, 일) 메모 인덱스 {시트 행 번호: {'note', 'info', 'eid'}}. TTL 내면 Sheets 호출 없음."""
+    if not refresh:
+        cached = _work_note_cache.get(_work_note_key(month_sheet_name, day))
+        if cached is not None:
+            return cached
+    return load_work_notes(month_sheet_name, days={int(day)}, header=header).get(int(day), {})
+
+
+def _remember_work_note(month_sheet_name, day, row_num, note_text, employee_id):
+    """메모 쓰기 성공 후 캐시 반영 (해당 일 항목이 있을 때만, 공유 저장소면 다른 워커에도 보임)."""
+    key = _work_note_key(month_sheet_name, day)
+    cached = _work_note_cache.get(key)
+    if cached is not None:
+        notes = dict(cached)
+        notes[int(row_num)] = _work_note_entry(note_text, employee_id)
+        _work_note_cache.set(key, notes)
+
+
+def _employee_records_by_row(entry, employee_id):
+    """공유 그리드에서 사번 행 {시트 행 번호: 레코드}."""
+    eid = str(employee_id).strip()
+    return dict(zip(entry['row_numbers'].get(eid) or [], entry['by_employee'].get(eid) or []))
 
-    return all_data
 
 def get_today_work_start_info(employee_id, month_sheet_name, day):
-    """오늘 날짜의 근무 시작 정보 가져오기 (work_DB_2026의 메모에서)"""
+    """오늘 날짜의 근무 시작 정보 가져오기 (work_DB_2026의 메모에서).
+    메모는 날짜 열 일괄 인덱스에서 사번으로 찾고(행마다 get_note 호출 없음), 차량번호·차종은 같은 행의
+    공유 그리드 레코드에서 가져온다. 그리드의 그 행이 다른 사번이면(행 삽입·정렬 뒤) 그리드를 새로 읽는다."""
     try:
-        worksheet = get_worksheet(month_sheet_name)
-        all_values = worksheet.get_values(WORK_DB_READ_RANGE)
-        
-        if not all_values:
+        entry = get_work_month_grid(month_sheet_name)
+        if entry is None or str(day).strip() not in entry['header']:
             return None
-        
-        # 헤더 행 찾기
-        header = [str(h).strip() for h in all_values[0]]
-        
-        try:
-            employee_id_col = header.index('사번') + 1
-        except ValueError:
+        eid = str(employee_id).strip()
+        notes = get_work_notes_for_day(month_sheet_name, day, header=entry['header'])
+        mine = sorted(row_num for row_num, note in notes.items() if note.get('eid') == eid)
+        if not mine:
             return None
-        
-        # 날짜 컬럼 찾기
-        date_col = None
-        date_str = str(day).strip()
-        for idx, col_name in enumerate(header, start=1):
-            if str(col_name).strip() == date_str:
-                date_col = idx
-                break
-        
-        if date_col is None:
-            return None
-
-        from gspread.utils import rowcol_to_a1
-
-        vehicle_num_col = header.index('차량번호') + 1 if '차량번호' in header else None
-        vehicle_type_col = header.index('차종') + 1 if '차종' in header else None
+        records = _employee_records_by_row(entry, eid)
+        if any(row_num not in records for row_num in mine):
+            fresh = get_work_month_grid(month_sheet_name, refresh=True)
+            if fresh is not None:
+                records = _employee_records_by_row(fresh, eid)
         first_info_with_note = None  # 운행시작일시 없는 경우 폴백
 
         # 해당 사번의 행 찾기 (운행시작일시가 있는 행 = 해당일 실제 근무 시작 행을 우선)
-        for i, row in enumerate(all_values[1:], start=2):
-            if len(row) < employee_id_col or str(row[employee_id_col - 1]).strip() != str(employee_id).strip():
-                continue
-            cell_address = rowcol_to_a1(i, date_col)
-            try:
-                note_text = worksheet.get_note(cell_address) if hasattr(worksheet, 'get_note') else get_note_via_api(worksheet, i, date_col)
-            except Exception:
-                note_text = None
-            if not note_text:
-                continue
-            info = {}
-            for line in note_text.split('\n'):
-                if ':' in line:
-                    key, value = line.split(':', 1)
-                    key, value = key.strip(), value.strip()
-                    if key == '운행차량':
-                        info['vehicle_number'] = value
-                    elif key == '운행시작일시':
-                        info['work_date'] = value
-                    elif key == '근무유형':
-                        info['work_type'] = value
-                    elif key == '차량상태':
-                        info['vehicle_condition'] = value
-                    elif key == '보고사항':
-                        info['special_notes'] = value
-            if vehicle_num_col and len(row) >= vehicle_num_col:
-                info['vehicle_number'] = row[vehicle_num_col - 1].strip()
-            if vehicle_type_col and len(row) >= vehicle_type_col:
-                info['vehicle_type'] = row[vehicle_type_col - 1].strip()
+        for row_num in mine:
+            info = dict(notes[row_num]['info'])
+            record = records.get(row_num) or {}
+            if '차량번호' in record:
+                info['vehicle_number'] = record.get('차량번호', '').strip()
+            if '차종' in record:
+                info['vehicle_type'] = record.get('차종', '').strip()
             if first_info_with_note is None:
                 first_info_with_note = info
             if info.get('work_date'):
@@ -893,74 +1467,76 @@ def get_today_work_start_info(employee_id, month_sheet_name, day):
         return None
 
 def get_note_via_api(worksheet, row, col):
-    """Google Sheets API를 사용하여 메모 가져오기"""
+    """Google Sheets API를 사용하여 메모 가져오기 (공용 v4 서비스, note만 담는 fields 마스크로 1회 조회)."""
     try:
-        from googleapiclient.discovery import build
-        from google.oauth2.service_account import Credentials
-        import config
-        
-        # 인증 정보 가져오기
-        credentials_dict = config.get_google_credentials()
-        if credentials_dict:
-            creds = Credentials.from_service_account_info(
-                credentials_dict,
-                scopes=config.SCOPES
-            )
-        else:
-            creds = Credentials.from_service_account_file(
-                config.CREDENTIALS_FILE,
-                scopes=config.SCOPES,
-            )
-        
-        # Google Sheets API 서비스 빌드
-        service = build('sheets', 'v4', credentials=creds)
-        
-        # 스프레드시트 ID 가져오기
-        spreadsheet_id = config.SPREADSHEET_ID
-        if not spreadsheet_id:
-            spreadsheet = get_spreadsheet()
-            spreadsheet_id = spreadsheet.id
-        
-        # 시트 ID 가져오기
-        metadata = service.spreadsheets().get(spreadsheetId=spreadsheet_id).execute()
-        sheet_id = None
-        for sheet in metadata.get('sheets', []):
-            if sheet['properties']['title'] == worksheet.title:
-                sheet_id = sheet['properties']['sheetId']
-                break
-        
-        if sheet_id is None:
-            return None
-        
-        # 메모 가져오기
         from gspread.utils import rowcol_to_a1
-        cell_address = rowcol_to_a1(row, col)
-        range_name = f"{worksheet.title}!{cell_address}"
-        
-        result = service.spreadsheets().get(
-            spreadsheetId=spreadsheet_id,
-            ranges=[range_name],
-            includeGridData=True
-        ).execute()
-        
-        if result.get('sheets'):
-            sheet_data = result['sheets'][0]
-            if sheet_data.get('data'):
-                row_data = sheet_data['data'][0]
-                if row_data.get('rowData'):
-                    cell_data = row_data['rowData'][0]
-                    if cell_data.get('values'):
-                        note = cell_data['values'][0].get('note', '')
-                        return note
-        
+        spreadsheet_id = _worksheet_spreadsheet_id(worksheet)
+        range_name = _sheet_title_to_a1_range(worksheet.title, rowcol_to_a1(row, col))
+
+        def _call():
+            return _get_sheets_v4_service().spreadsheets().get(
+                spreadsheetId=spreadsheet_id,
+                ranges=[range_name],
+                fields='sheets(data(rowData(values(note))))',
+            ).execute()
+
+        result = _retry_sheets_operation(_call)
+        for sheet_data in result.get('sheets') or []:
+            for grid in sheet_data.get('data') or []:
+                for row_data in grid.get('rowData') or []:
+                    for cell in row_data.get('values') or []:
+                        return cell.get('note', '')
         return None
     except Exception as e:
         print(f"Error getting note via API: {e}")
         return None
 
+SALES_HEADER_CACHE_TTL_SEC = config.SALES_HEADER_CACHE_SECONDS
+_sales_header_lock = threading.Lock()
+_sales_header_cache = {}  # 월 시트 이름 → (헤더, 레지스트리 세대, 저장 시각)
+
+
+def _get_sales_header(worksheet):
+    """매출 월 시트 1행 헤더 (캐시). 시트 매핑 세대가 바뀌거나 TTL이 지나면 다시 읽는다."""
+    version = worksheet_registry_version('sales')
+    now = time.time()
+    with _sales_header_lock:
+        cached = _sales_header_cache.get(worksheet.title)
+    if cached is not None and cached[1] == version and now - cached[2] < SALES_HEADER_CACHE_TTL_SEC:
+        return list(cached[0])
+    header = [
+        str(h).strip()
+        for h in _retry_sheets_operation(lambda: get_sales_worksheet(worksheet.title).row_values(1), kind='sales')
+    ]
+    with _sales_header_lock:
+        _sales_header_cache[worksheet.title] = (header, version, now)
+    return list(header)
+
+
+def _user_entered_cell(value):
+    """append_row(RAW)와 같은 해석: 숫자는 numberValue, 그 외는 문자열 그대로."""
+    if value is None or value == '':
+        return {}
+    if isinstance(value, bool):
+        return {'userEnteredValue': {'boolValue': value}}
+    if isinstance(value, (int, float)):
+        return {'userEnteredValue': {'numberValue': value}}
+    return {'userEnteredValue': {'stringValue': str(value)}}
+
+
+def _row_from_updated_range(updated_range):
+    """values.append 응답 updatedRange('5월'!A57:N57) → 57."""
+    m = re.search(r'![A-Z]+(\d+)', updated_range or '')
+    return int(m.group(1)) if m else None
+
+
+@sheets_quota.write_path
 def add_sales_record(month_sheet_name, sales_data, note_text=None):
     """sales_DB_2026에 매출 데이터 추가
     
+    캐시된 헤더로 행을 구성하고, 행 추가와 근무시간(분) 셀 메모를 appendCells 요청 하나
+    (spreadsheets.batchUpdate 1회)로 보낸다. 시트 길이와 무관하게 호출 수가 일정하다.
+
     Args:
         month_sheet_name: 월별 시트 이름
         sales_data: 매출 데이터 딕셔너리
@@ -970,14 +1546,7 @@ def add_sales_record(month_sheet_name, sales_data, note_text=None):
     """
     try:
         worksheet = get_sales_worksheet(month_sheet_name)
-        
-        # 헤더 가져오기
-        header = worksheet.row_values(1)
-        header = [str(h).strip() for h in header]
-        
-        # 다음 행 번호 계산 (헤더 포함 기존 데이터 개수 + 1)
-        all_values = worksheet.get_values(SALES_DB_READ_RANGE)
-        next_row = len(all_values) + 1 if all_values else 2
+        header = _get_sales_header(worksheet)
         
         # 데이터 행 구성
         row_data = []
@@ -985,27 +1554,36 @@ def add_sales_record(month_sheet_name, sales_data, note_text=None):
             value = sales_data.get(col_name, '')
             row_data.append(value)
         
-        # 새 행 추가
-        worksheet.append_row(row_data)
-        
-        # 근무시간(분) 셀에 메모 추가 (운행시작일시, 운행종료일시, 근무시간)
+        note_col_idx = None
         if note_text and '근무시간(분)' in header:
-            try:
-                from gspread.utils import rowcol_to_a1
-                work_time_col = header.index('근무시간(분)') + 1
-                cell_address = rowcol_to_a1(next_row, work_time_col)
-                
-                if hasattr(worksheet, 'insert_note'):
-                    worksheet.insert_note(cell_address, note_text)
-                else:
-                    # gspread에서 insert_note 지원하지 않는 경우 API 사용
-                    add_note_via_api(worksheet, next_row, work_time_col, note_text)
-            except Exception as note_error:
-                print(f"Warning: Could not insert note for sales record: {note_error}")
-                try:
-                    add_note_via_api(worksheet, next_row, work_time_col, note_text)
-                except Exception as api_error:
-                    print(f"Warning: Could not insert note via API for sales record: {api_error}")
+            note_col_idx = header.index('근무시간(분)')
+        spreadsheet_id = _worksheet_spreadsheet_id(worksheet)
+
+        def append_requests():
+            cells = [_user_entered_cell(v) for v in row_data]
+            if note_col_idx is not None:
+                cells[note_col_idx]['note'] = note_text
+            return [{
+                'appendCells': {
+                    'sheetId': _sheet_id_for_title(spreadsheet_id, worksheet.title),
+                    'rows': [{'values': cells}],
+                    'fields': 'userEnteredValue,note',
+                }
+            }]
+
+        next_row = None  # appendCells 응답에는 들어간 행 번호가 없다
+        try:
+            _spreadsheet_batch_update(spreadsheet_id, append_requests)
+        except Exception as append_error:
+            if isinstance(append_error, sheets_quota.QuotaExhausted):
+                raise
+            # appendCells 실패 시 기존 append_row 로 추가하고, 응답 updatedRange 의 행 번호에 메모 기록
+            print(f"Warning: appendCells failed, falling back to append_row: {append_error}")
+            resp = worksheet.append_row(row_data)
+            next_row = _row_from_updated_range(((resp or {}).get('updates') or {}).get('updatedRange'))
+            if note_col_idx is not None and next_row:
+                if not add_note_via_api(worksheet, next_row, note_col_idx + 1, note_text):
+                    print("Warning: Could not insert note via API for sales record")
         
         # TODO(restore): 차량번호 셀에 메모 추가 (보고사항)
         # TODO(restore): if vehicle_condition_note and '차량번호' in header:
@@ -1020,6 +1598,22 @@ def add_sales_record(month_sheet_name, sales_data, note_text=None):
         # TODO(restore):            # gspread에서 insert_note 지원하지 않는 경우 API 사용
         # TODO(restore):            add_note_via_api(worksheet, next_row, vehicle_number_col, vehicle_condition_note)
         
+        if next_row:
+            sheets_mirror.append_rows('sales', month_sheet_name, [row_data], start_row=next_row)
+        else:
+            # 행 위치를 모르면 미러 끝에 붙여 추측하지 않는다 (그 사이 다른 곳에서 붙인 행이 있으면 중복 집계).
+            # 다음 동기화의 꼬리 읽기가 실제 위치로 채울 때까지 이 월은 Sheets 로 읽는다.
+            sheets_mirror.mark_stale('sales', month_sheet_name)
+        invalidate_sales_tail(month_sheet_name)
+        # 요약과 같은 규칙으로 이 행만 접어 증감 알림 (사고유무에 '가해'면 가해사고 +1)
+        cols = _sales_columns(header)
+        if cols is not None:
+            for eid, summary in _fold_sales_rows(cols, [row_data], {}).items():
+                _emit_stats_delta(eid, month_sheet_name, {
+                    'revenue': summary['total_revenue'],
+                    'fuel_cost': summary['total_fuel_cost'],
+                    'accident_count': summary['accident_count'],
+                }, 'sales')
         print(f"Successfully added sales record to {month_sheet_name}")
         return True
     except Exception as e:
@@ -1037,71 +1631,208 @@ def _normalize_sales_operation_date(operation_date):
     return s
 
 
-def _parse_sales_summary_from_values(all_values, employee_id):
-    """매출 시트 A:N 원시 행들에서 사번 한 명 요약 추출."""
-    if not all_values or len(all_values) < 2:
-        return {'total_revenue': 0, 'total_fuel_cost': 0, 'accident_count': 0, 'operation_dates': set()}
-    header = [str(h).strip() for h in all_values[0]]
+def _empty_sales_summary():
+    return {'total_revenue': 0, 'total_fuel_cost': 0, 'accident_count': 0, 'operation_dates': set()}
+
+
+def _copy_sales_summary(summary):
+    out = dict(summary)
+    out['operation_dates'] = set(summary.get('operation_dates') or ())
+    return out
+
+
+def _sales_columns(header):
+    """매출 시트 헤더 → 요약에 쓰는 열 인덱스. 필수 열이 없으면 None."""
     try:
-        employee_id_col_idx = header.index('사번')
-        cash_fare_col_idx = header.index('현금운임')
-        card_fare_col_idx = header.index('카드운임')
-        fuel_cost_col_idx = header.index('연료비')
+        cols = {
+            'eid': header.index('사번'),
+            'cash': header.index('현금운임'),
+            'card': header.index('카드운임'),
+            'fuel': header.index('연료비'),
+        }
     except ValueError as e:
         print(f"Error: Required column not found in sales sheet: {e}")
-        return {'total_revenue': 0, 'total_fuel_cost': 0, 'accident_count': 0, 'operation_dates': set()}
-    accident_col_idx = header.index('사고유무') if '사고유무' in header else None
-    operation_date_col_idx = header.index('운행일') if '운행일' in header else None
-    total_revenue = 0
-    total_fuel_cost = 0
-    accident_count = 0
-    operation_dates = set()
-    eid_needle = str(employee_id).strip()
-    for row in all_values[1:]:
-        max_col = max(employee_id_col_idx, cash_fare_col_idx, card_fare_col_idx, fuel_cost_col_idx)
-        if accident_col_idx is not None:
-            max_col = max(max_col, accident_col_idx)
-        if operation_date_col_idx is not None:
-            max_col = max(max_col, operation_date_col_idx)
-        if len(row) <= max_col:
+        return None
+    cols['accident'] = header.index('사고유무') if '사고유무' in header else None
+    cols['date'] = header.index('운행일') if '운행일' in header else None
+    cols['max'] = max(v for v in cols.values() if v is not None)
+    return cols
+
+
+def _sales_int(row, idx):
+    try:
+        text = str(row[idx]).strip().replace(',', '')
+        return int(text) if text else 0
+    except (ValueError, TypeError):
+        return 0
+
+
+def _fold_sales_rows(cols, rows, summaries, employee_id=None):
+    """매출 행들을 사번별 누적 요약(summaries: {사번: 요약})에 더한다. employee_id 를 주면 그 사번만."""
+    eid_needle = str(employee_id).strip() if employee_id is not None else None
+    for row in rows:
+        if len(row) <= cols['max']:
             continue
-        row_employee_id = str(row[employee_id_col_idx]).strip()
-        if row_employee_id != eid_needle:
+        row_employee_id = str(row[cols['eid']]).strip()
+        if eid_needle is not None and row_employee_id != eid_needle:
             continue
-        if operation_date_col_idx is not None and len(row) > operation_date_col_idx:
-            od = _normalize_sales_operation_date(row[operation_date_col_idx])
+        summary = summaries.get(row_employee_id)
+        if summary is None:
+            summary = summaries[row_employee_id] = _empty_sales_summary()
+        if cols['date'] is not None:
+            od = _normalize_sales_operation_date(row[cols['date']])
             if od:
-                operation_dates.add(od)
-        try:
-            cash_fare_str = str(row[cash_fare_col_idx]).strip().replace(',', '')
-            total_revenue += int(cash_fare_str) if cash_fare_str else 0
-        except (ValueError, TypeError):
-            pass
+                summary['operation_dates'].add(od)
+        summary['total_revenue'] += _sales_int(row, cols['cash']) + _sales_int(row, cols['card'])
+        summary['total_fuel_cost'] += _sales_int(row, cols['fuel'])
+        if cols['accident'] is not None:
+            accident_status = str(row[cols['accident']]).strip()
+            if accident_status and ('가해' in accident_status or '가해사고' in accident_status):
+                summary['accident_count'] += 1
+    return summaries
+
+
+def _parse_sales_summary_from_values(all_values, employee_id):
+    """매출 시트 A:N 원시 행들에서 사번 한 명 요약 추출."""
+    if not all_values or len(all_values) < 2:
+        return _empty_sales_summary()
+    cols = _sales_columns([str(h).strip() for h in all_values[0]])
+    if cols is None:
+        return _empty_sales_summary()
+    summaries = _fold_sales_rows(cols, all_values[1:], {}, employee_id=employee_id)
+    return summaries.get(str(employee_id).strip()) or _empty_sales_summary()
+
+
+# ----- 매출 월 시트 꼬리 읽기 -----
+# 월 시트를 한 번 훑어 전 사번 요약({사번: 요약})을 만들고 프로세스 공용으로 보관한다. 기사별 월·연간
+# 수치는 이 결과를 찾아보기만 한다. 로컬 미러가 있으면 미러 값으로 만든다.
+# 매출 시트는 행이 뒤에만 붙으므로 월마다 마지막으로 읽은 행 번호와 사번별 누적 요약을 보관하고,
+# 갱신 때는 'A{n}:N'(마지막으로 읽은 행부터)만 읽어 새 행을 더한다. 첫 행이 기억한 값과 다르면
+# (중간 행 수정·삭제) 전체를 다시 읽는다. SALES_TAIL_FULL_RESYNC_SECONDS 마다 전체 재읽기.
+SALES_TAIL_FRESH_SEC = config.SALES_SUMMARY_CACHE_SECONDS
+_sales_tail_lock = threading.Lock()
+_sales_tail_states = {}  # 월 → {'cols', 'consumed', 'last_row', 'summaries', 'ts', 'full_ts'}
+_sales_tail_load_locks = {}
+
+
+def _sales_tail_range(month_sheet_name, state):
+    """state 가 없거나 전체 재읽기 시점이면 A:N, 아니면 마지막으로 읽은 행부터의 꼬리."""
+    if state is None or state['cols'] is None or time.time() - state['full_ts'] > config.SALES_TAIL_FULL_RESYNC_SECONDS:
+        return _sheet_title_to_a1_range(month_sheet_name, SALES_DB_READ_RANGE)
+    return _sheet_title_to_a1_range(month_sheet_name, f"A{state['consumed']}:N")
+
+
+def _sales_tail_apply(month_sheet_name, state, a1_range, values, consumed=None):
+    """batchGet 결과를 월 상태에 반영. 꼬리가 어긋나면 None (호출자가 전체 재읽기).
+    consumed: 꼬리 범위를 만들 때의 state['consumed']."""
+    values = values or []
+    now = time.time()
+    full = a1_range.endswith('!' + SALES_DB_READ_RANGE)
+    if full:
+        header = [str(h).strip() for h in values[0]] if values else []
+        cols = _sales_columns(header) if header else None
+        state = {
+            'cols': cols,
+            'consumed': max(len(values), 1),
+            'last_row': list(values[-1]) if values else [],
+            'summaries': _fold_sales_rows(cols, values[1:], {}) if cols else {},
+            'ts': now,
+            'full_ts': now,
+        }
+        with _sales_tail_lock:
+            _sales_tail_states[month_sheet_name] = state
+        return state
+    new_rows = values[1:]
+    with _sales_tail_lock:
+        # 다른 스레드가 같은 꼬리를 먼저 더했거나 상태를 바꿨으면 이 결과는 버린다 (이중 합산 방지)
+        if (
+            not values
+            or _sales_tail_states.get(month_sheet_name) is not state
+            or state['consumed'] != consumed
+            or list(values[0]) != state['last_row']
+        ):
+            return None
+        if new_rows:
+            _fold_sales_rows(state['cols'], new_rows, state['summaries'])
+            state['consumed'] += len(new_rows)
+            state['last_row'] = list(new_rows[-1])
+        state['ts'] = now
+        _sales_tail_states[month_sheet_name] = state
+    return state
+
+
+def _refresh_sales_tails(month_sheet_names, force=False):
+    """여러 월의 꼬리를 batchGet 1회로 갱신. 반환: {월: 상태} (읽기 실패한 월은 직전 상태)."""
+    out = {}
+    plans = []
+    now = time.time()
+    for mn in month_sheet_names:
+        with _sales_tail_lock:
+            state = _sales_tail_states.get(mn)
+        if state is not None and not force and now - state['ts'] < SALES_TAIL_FRESH_SEC:
+            out[mn] = state
+            continue
+        mirrored = sheets_mirror.read_values('sales', mn)
+        if mirrored is not None:
+            out[mn] = _sales_tail_apply(mn, None, _sheet_title_to_a1_range(mn, SALES_DB_READ_RANGE), mirrored)
+            continue
+        plans.append((mn, state, _sales_tail_range(mn, state), state['consumed'] if state is not None else None))
+    if not plans:
+        return out
+    sid = get_sales_spreadsheet().id
+    BATCH = max(1, min(200, int(getattr(config, 'SHEETS_WORK_BATCH_CHUNK', 90))))
+    retry_full = []
+    for off in range(0, len(plans), BATCH):
+        chunk = plans[off : off + BATCH]
         try:
-            card_fare_str = str(row[card_fare_col_idx]).strip().replace(',', '')
-            total_revenue += int(card_fare_str) if card_fare_str else 0
-        except (ValueError, TypeError):
-            pass
+            resp = _sheet_values_batch_get(sid, [p[2] for p in chunk])
+        except Exception as ex:
+            print(f'sales DB 꼬리 batchGet 실패: {str(ex)[:400]}')
+            # 행 삭제로 꼬리 범위가 그리드를 벗어났을 수 있어 월별 전체 재읽기로 폴백
+            retry_full.extend(mn for mn, state, _, _ in chunk if state is not None)
+            out.update({mn: state for mn, state, _, _ in chunk if state is not None})
+            continue
+        for (mn, state, a1, consumed), vr in zip(chunk, resp.get('valueRanges') or []):
+            applied = _sales_tail_apply(mn, state, a1, vr.get('values'), consumed)
+            if applied is None:
+                retry_full.append(mn)
+                out[mn] = state
+            else:
+                out[mn] = applied
+    if retry_full:
+        ranges = [_sheet_title_to_a1_range(mn, SALES_DB_READ_RANGE) for mn in retry_full]
         try:
-            fuel_cost_str = str(row[fuel_cost_col_idx]).strip().replace(',', '')
-            total_fuel_cost += int(fuel_cost_str) if fuel_cost_str else 0
-        except (ValueError, TypeError):
-            pass
-        if accident_col_idx is not None:
-            accident_status = str(row[accident_col_idx]).strip()
-            if accident_status and ('가해' in accident_status or '가해사고' in accident_status):
-                accident_count += 1
-    return {
-        'total_revenue': total_revenue,
-        'total_fuel_cost': total_fuel_cost,
-        'accident_count': accident_count,
-        'operation_dates': operation_dates,
-    }
+            resp = _sheet_values_batch_get(sid, ranges)
+            for mn, a1, vr in zip(retry_full, ranges, resp.get('valueRanges') or []):
+                out[mn] = _sales_tail_apply(mn, None, a1, vr.get('values'))
+        except Exception as ex:
+            print(f'sales DB 전체 재읽기 실패: {str(ex)[:400]}')
+    return out
+
+
+def _sales_month_state(month_sheet_name):
+    """월 꼬리 상태 (같은 월은 동시에 한 번만 갱신)."""
+    with _sales_tail_lock:
+        state = _sales_tail_states.get(month_sheet_name)
+        load_lock = _sales_tail_load_locks.setdefault(month_sheet_name, threading.Lock())
+    if state is not None and time.time() - state['ts'] < SALES_TAIL_FRESH_SEC:
+        return state
+    with load_lock:
+        return _refresh_sales_tails([month_sheet_name]).get(month_sheet_name)
+
+
+def invalidate_sales_tail(month_sheet_name=None):
+    """다음 조회 때 꼬리를 다시 읽게 표시 (누적 요약은 유지)."""
+    with _sales_tail_lock:
+        for mn in (list(_sales_tail_states) if month_sheet_name is None else [month_sheet_name]):
+            if mn in _sales_tail_states:
+                _sales_tail_states[mn]['ts'] = 0.0
 
 
 def get_user_sales_summary(employee_id, month_sheet_name):
-    """sales_DB_2026에서 특정 사번의 월별 매출 합계 가져오기 (A:N 범위만 조회).
-    같은 스캔으로 운행일 집합(operation_dates)을 채워 has_sales_record 에서 재사용한다.
+    """sales_DB_2026에서 특정 사번의 월별 매출 합계 가져오기.
+    월마다 누적 요약을 두고 새로 붙은 행만 읽어 더한다(꼬리 읽기). 운행일 집합(operation_dates)도
+    함께 채워 has_sales_record 에서 재사용한다.
     
     Args:
         employee_id: 사번
@@ -1116,63 +1847,92 @@ def get_user_sales_summary(employee_id, month_sheet_name):
         }
     """
     try:
-        def _fetch_sales_values():
-            worksheet = get_sales_worksheet(month_sheet_name)
-            return worksheet.get_values(SALES_DB_READ_RANGE)
-
-        all_values = _retry_sheets_operation(_fetch_sales_values)
-        return _parse_sales_summary_from_values(all_values, employee_id)
+        state = _sales_month_state(month_sheet_name)
+        if state is None:
+            return _empty_sales_summary()
+        with _sales_tail_lock:
+            summary = state['summaries'].get(str(employee_id).strip())
+            return _copy_sales_summary(summary) if summary else _empty_sales_summary()
     except Exception as e:
         print(f"Error getting user sales summary: {e}")
         import traceback
         traceback.print_exc()
-        return {'total_revenue': 0, 'total_fuel_cost': 0, 'accident_count': 0, 'operation_dates': set()}
+        return _empty_sales_summary()
 
 
-def prefetch_user_sales_summaries_batch(employee_id, month_sheet_names, sales_summary_cache=None):
-    """sales_DB 여러 월을 batchGet으로 묶어 읽어 sales_summary:{사번}:{월} 캐시를 채운다."""
-    empty = {'total_revenue': 0, 'total_fuel_cost': 0, 'accident_count': 0, 'operation_dates': set()}
-    if not month_sheet_names:
-        return
-    eid = str(employee_id).strip()
-    need = []
-    for mn in month_sheet_names:
-        ck = f'sales_summary:{eid}:{mn}'
-        if sales_summary_cache is None or sales_summary_cache.get(ck) is None:
-            need.append(mn)
-    if not need:
-        return
-    spreadsheet = get_sales_spreadsheet()
-    sid = spreadsheet.id
-    BATCH = getattr(config, 'SHEETS_WORK_BATCH_CHUNK', 90)
-    BATCH = max(1, min(200, int(BATCH)))
-    for off in range(0, len(need), BATCH):
-        chunk = need[off : off + BATCH]
-        ranges_a1 = [_sheet_title_to_a1_range(mn, SALES_DB_READ_RANGE) for mn in chunk]
+def get_sales_summaries_by_employee(month_sheet_names):
+    """여러 월의 전 사번 매출 요약 {월: {사번: 요약}} (월 시트당 한 번 훑은 공유 결과의 복사본).
+
+    갱신이 필요한 월은 batchGet 1회로 묶어 꼬리만 읽는다. 읽지 못한 월은 빈 dict."""
+    try:
+        states = _refresh_sales_tails(list(month_sheet_names))
+    except Exception as ex:
+        print(f'get_sales_summaries_by_employee: {ex}')
+        states = {}
+    out = {}
+    with _sales_tail_lock:
+        for mn in month_sheet_names:
+            state = states.get(mn)
+            out[mn] = {
+                eid: _copy_sales_summary(summary) for eid, summary in (state or {}).get('summaries', {}).items()
+            }
+    return out
+
+
+def _work_month_rollup(records, matrix, employee_id):
+    """한 사번의 월 행들 → 월 집계 dict (근무 이력 차트와 같은 규칙).
+
+    근무·결근·인정일은 모든 행 합계, 휴가와 예정일(R 수)은 첫 행 값 (_aggregate_user_month_records 가
+    첫 행을 기준으로 합치므로). 캘린더의 휴무일 계산('/' 폴백)과는 다르다."""
+    agg = _aggregate_user_month_records(records) or {}
+    try:
+        vacation_days = int(str(agg.get('휴가', 0)).strip())
+    except (ValueError, TypeError):
+        vacation_days = 0
+    rollup = dict.fromkeys(ROLLUP_FIELDS, 0)
+    rollup.update(
+        work_rows=len(records),
+        work_days=agg.get('근무일', 0),
+        absent_days=agg.get('결근일', 0),
+        approved_days=agg.get('인정일', 0),
+        vacation_days=vacation_days,
+        scheduled_days=matrix.first_row_counts(employee_id)['R'],
+    )
+    return rollup
+
+
+def get_monthly_rollups_by_employee(month_sheet_names, with_sales=True):
+    """여러 월의 사번별 월 집계 {월: {사번: {ROLLUP_FIELDS}}} (연간 스냅샷 DB 월 롤업용).
+
+    근무는 get_work_month_grids, 매출은 꼬리 상태로 월마다 한 번씩만 읽는다. 근무(with_sales 면 매출도)를
+    읽지 못한 월은 결과에서 빠진다. with_sales=False 면 매출을 읽지 않고 매출 필드는 0.
+    매출만 있는 사번은 work_rows=0 으로 들어간다."""
+    grids = get_work_month_grids(month_sheet_names)
+    states = {}
+    if with_sales:
         try:
-            resp = _sheet_values_batch_get(sid, ranges_a1)
+            states = _refresh_sales_tails([mn for mn in month_sheet_names if mn in grids])
         except Exception as ex:
-            print(f'sales DB batchGet 실패: {str(ex)[:400]}')
-            resp = {'valueRanges': []}
-        raw_by = {}
-        for vr in (resp.get('valueRanges') or []):
-            nm = _sheet_name_from_batch_range(vr.get('range', '') or '')
-            if nm:
-                raw_by[nm] = vr.get('values')
-        for mn in chunk:
-            ck = f'sales_summary:{eid}:{mn}'
-            raw = raw_by.get(mn)
-            summ = empty
-            try:
-                if raw is None:
-                    summ = get_user_sales_summary(eid, mn)
-                else:
-                    summ = _parse_sales_summary_from_values(raw or [], eid)
-            except Exception as ex:
-                print(f'prefetch_sales {mn}: {ex}')
-                summ = empty
-            if sales_summary_cache is not None:
-                sales_summary_cache.set(ck, summ)
+            print(f'get_monthly_rollups_by_employee: {ex}')
+    out = {}
+    for mn in month_sheet_names:
+        entry, state = grids.get(mn), states.get(mn)
+        if entry is None or (with_sales and state is None):
+            continue
+        matrix = entry['matrix']
+        rollups = {
+            eid: _work_month_rollup(records, matrix, eid) for eid, records in entry['by_employee'].items()
+        }
+        with _sales_tail_lock:
+            for eid, summary in (state or {}).get('summaries', {}).items():
+                rollup = rollups.setdefault(eid, dict.fromkeys(ROLLUP_FIELDS, 0))
+                rollup.update(
+                    revenue=summary['total_revenue'],
+                    fuel_cost=summary['total_fuel_cost'],
+                    accident_count=summary['accident_count'],
+                )
+        out[mn] = rollups
+    return out
 
 
 def has_sales_record_for_date(employee_id, month_sheet_name, operation_date):
@@ -1195,8 +1955,9 @@ LOANER_SHEET_NAME = "대차차량"
 def get_loaner_vehicles():
     """[대차차량] 시트에서 대차가능('O')인 차량 목록 반환"""
     try:
-        worksheet = get_worksheet(LOANER_SHEET_NAME)
-        all_values = worksheet.get_values(LOANER_DB_READ_RANGE)
+        all_values = _read_mirrored_values(
+            'work', LOANER_SHEET_NAME, lambda: get_worksheet(LOANER_SHEET_NAME).get_values(LOANER_DB_READ_RANGE)
+        )
         if not all_values or len(all_values) < 2:
             return []
         header = [str(h).strip() for h in all_values[0]]
@@ -1222,6 +1983,7 @@ def get_loaner_vehicles():
         return []
 
 
+@sheets_quota.write_path
 def update_loaner_vehicle_on_apply(vehicle_number, employee_id, driver_name, apply_date_str):
     """대차 신청 시 [대차차량] 시트 해당 행 수정: 대차가능=X, 대차신청일, 대차사용자, 사번"""
     try:
@@ -1263,6 +2025,11 @@ def update_loaner_vehicle_on_apply(vehicle_number, employee_id, driver_name, app
                     })
                 if updates:
                     worksheet.batch_update(updates, value_input_option='USER_ENTERED')
+                    for col_name, value in (('대차가능', 'X'), ('대차신청일', apply_date_str),
+                                            ('대차사용자', driver_name or ''), ('사번', str(employee_id or ''))):
+                        if col_name in col_idx:
+                            _set_values_cell(all_values, i, col_idx[col_name] + 1, value)
+                    sheets_mirror.put_row('work', LOANER_SHEET_NAME, i, all_values[i - 1])
                 return True
         return False
     except Exception as e:
@@ -1270,6 +2037,7 @@ def update_loaner_vehicle_on_apply(vehicle_number, employee_id, driver_name, app
         return False
 
 
+@sheets_quota.write_path
 def reset_loaner_vehicle_on_work_end(vehicle_number, employee_id):
     """대차 차량으로 근무 종료 시 [대차차량] 시트 해당 행 초기화.
     - 대차가능(C열)=O
@@ -1324,6 +2092,10 @@ def reset_loaner_vehicle_on_work_end(vehicle_number, employee_id):
                     'values': [['']],
                 })
             worksheet.batch_update(updates, value_input_option='USER_ENTERED')
+            for col_name, value in (('대차가능', 'O'), ('대차신청일', ''), ('대차사용자', ''), ('사번', '')):
+                if col_name in col_idx:
+                    _set_values_cell(all_values, i, col_idx[col_name] + 1, value)
+            sheets_mirror.put_row('work', LOANER_SHEET_NAME, i, all_values[i - 1])
             return True
         return False
     except Exception as e:
@@ -1331,18 +2103,18 @@ def reset_loaner_vehicle_on_work_end(vehicle_number, employee_id):
         return False
 
 
+@sheets_quota.write_path
 def update_work_cell_note_report(employee_id, month_sheet_name, day, report_value):
     """해당 월·일의 근무 셀 메모에서 '보고사항'만 갱신 (없으면 추가).
-    같은 사번이 야간/주간 등 여러 행일 수 있으므로, 해당일 메모에 '운행시작일시'가 있는 행(실제 근무 시작된 행)을 찾아 그 셀만 수정한다."""
+    같은 사번이 야간/주간 등 여러 행일 수 있으므로, 해당일 메모에 '운행시작일시'가 있는 행(실제 근무 시작된 행)을 찾아 그 셀만 수정한다.
+    쓰기 직전이므로 행 위치는 시트를 새로 읽고(refresh), 기존 메모는 날짜 열 일괄 조회 1회로 확인한다
+    (오래된 그리드의 행 번호로 쓰면 행이 삽입·정렬된 뒤 다른 기사 셀에 메모가 붙는다)."""
     try:
-        worksheet = get_worksheet(month_sheet_name)
-        all_values = worksheet.get_values(WORK_DB_READ_RANGE)
-        if not all_values:
+        entry = get_work_month_grid(month_sheet_name, refresh=True)
+        if entry is None:
             return False
-        header = [str(h).strip() for h in all_values[0]]
-        try:
-            emp_col = header.index('사번') + 1
-        except ValueError:
+        header = entry['header']
+        if '사번' not in header:
             return False
         date_str = str(day).strip()
         try:
@@ -1351,6 +2123,12 @@ def update_work_cell_note_report(employee_id, month_sheet_name, day, report_valu
             return False
         from gspread.utils import rowcol_to_a1
 
+        rows = entry['row_numbers'].get(str(employee_id).strip()) or []
+        if not rows:
+            return False
+        # 캐시된 메모 대신 해당 날짜 열을 새로 읽는다 (행별 get_note 대신 1회)
+        notes = get_work_notes_for_day(month_sheet_name, day, header=header, refresh=True)
+
         def do_update(i, note_text):
             """메모 내용을 보고사항만 갱신한 새 메모로 덮어쓰기 (기존 보고사항 유지하고 새 값 추가)"""
             note_text = note_text or ''
@@ -1374,39 +2152,23 @@ def update_work_cell_note_report(employee_id, month_sheet_name, day, report_valu
                 # 보고사항 줄이 없으면 추가
                 new_lines.append(f"보고사항: {report_value}")
             new_note = '\n'.join(new_lines)
+            worksheet = get_worksheet(month_sheet_name)
             cell_address = rowcol_to_a1(i, date_col)
             if hasattr(worksheet, 'insert_note'):
                 worksheet.insert_note(cell_address, new_note)
-            else:
-                add_note_via_api(worksheet, i, date_col, new_note)
+            elif not add_note_via_api(worksheet, i, date_col, new_note):
+                return False
+            _remember_work_note(month_sheet_name, day, i, new_note, employee_id)
             return True
 
-        first_matching_row = None  # 운행시작일시가 없는 경우 대비 첫 번째 매칭 행
-        for i, row in enumerate(all_values[1:], start=2):
-            if len(row) < emp_col:
-                continue
-            if str(row[emp_col - 1]).strip() != str(employee_id).strip():
-                continue
-            if first_matching_row is None:
-                first_matching_row = i
-            cell_address = rowcol_to_a1(i, date_col)
-            try:
-                note_text = worksheet.get_note(cell_address) if hasattr(worksheet, 'get_note') else None
-            except Exception:
-                note_text = get_note_via_api(worksheet, i, date_col)
-            note_text = note_text or ''
+        for i in rows:
+            note_text = (notes.get(i) or {}).get('note') or ''
             # 해당일 근무가 시작된 행 = 메모에 '운행시작일시'가 있는 셀
-            if '운행시작일시' in note_text or '운행시작일시:' in note_text:
+            if '운행시작일시' in note_text:
                 return do_update(i, note_text)
 
         # 해당일 '운행시작일시' 메모가 있는 행이 없으면, 사번 일치 첫 행에 반영 (폴백)
-        if first_matching_row is not None:
-            try:
-                nt = worksheet.get_note(rowcol_to_a1(first_matching_row, date_col)) if hasattr(worksheet, 'get_note') else None
-            except Exception:
-                nt = get_note_via_api(worksheet, first_matching_row, date_col)
-            return do_update(first_matching_row, nt or '')
-        return False
+        return do_update(rows[0], (notes.get(rows[0]) or {}).get('note') or '')
     except Exception as e:
         print(f"Error update_work_cell_note_report: {e}")
         return False
@@ -1442,8 +2204,9 @@ def get_today_replacement_display(employee_id, month_sheet_name, day, work_start
         num = parse_replacement_vehicle_from_remark(remark)
         if not num:
             return None
-        ws = get_worksheet(LOANER_SHEET_NAME)
-        all_values = ws.get_values(LOANER_DB_READ_RANGE)
+        all_values = _read_mirrored_values(
+            'work', LOANER_SHEET_NAME, lambda: get_worksheet(LOANER_SHEET_NAME).get_values(LOANER_DB_READ_RANGE)
+        )
         if not all_values or len(all_values) < 2:
             return (num, '')
         header = [str(h).strip() for h in all_values[0]]
@@ -1529,8 +2292,10 @@ def get_user_annual_leave_entitlement(user_record):
 def sum_approved_leave_days_for_employee(employee_id):
     """승인된 휴가(o/O) 기간 합계."""
     try:
-        ws = get_worksheet(LEAVE_REQUEST_SHEET_NAME)
-        rows = ws.get_values(LEAVE_REQUEST_READ_RANGE)
+        rows = _read_mirrored_values(
+            'work', LEAVE_REQUEST_SHEET_NAME,
+            lambda: get_worksheet(LEAVE_REQUEST_SHEET_NAME).get_values(LEAVE_REQUEST_READ_RANGE),
+        )
         if not rows or len(rows) < 2:
             return 0
         header = [str(h).strip() for h in rows[0]]
@@ -1559,8 +2324,10 @@ def sum_approved_leave_days_for_employee(employee_id):
 def get_leave_requests_for_display(employee_id):
     """로그인 사번 기준 휴가 신청 목록 (신청일 내림차순)."""
     try:
-        ws = get_worksheet(LEAVE_REQUEST_SHEET_NAME)
-        rows = ws.get_values(LEAVE_REQUEST_READ_RANGE)
+        rows = _read_mirrored_values(
+            'work', LEAVE_REQUEST_SHEET_NAME,
+            lambda: get_worksheet(LEAVE_REQUEST_SHEET_NAME).get_values(LEAVE_REQUEST_READ_RANGE),
+        )
         if not rows or len(rows) < 2:
             return []
         header = [str(h).strip() for h in rows[0]]
@@ -1614,6 +2381,7 @@ def get_leave_requests_for_display(employee_id):
         return []
 
 
+@sheets_quota.write_path
 def append_leave_request_row(apply_date_str, employee_id, name, start_date_str, end_date_str, duration_days, reason_text):
     """휴가신청 시트에 한 행 추가. 승인상태는 '/'(대기). 구분은 빈 칸."""
     try:
@@ -1633,7 +2401,12 @@ def append_leave_request_row(apply_date_str, employee_id, name, start_date_str,
             '승인상태': '/',
         }
         row_out = [payload.get(h, '') for h in header]
-        ws.append_row(row_out, value_input_option='USER_ENTERED')
+        resp = ws.append_row(row_out, value_input_option='USER_ENTERED')
+        appended_row = _row_from_updated_range(((resp or {}).get('updates') or {}).get('updatedRange'))
+        if appended_row:
+            sheets_mirror.append_rows('work', LEAVE_REQUEST_SHEET_NAME, [row_out], start_row=appended_row)
+        else:
+            sheets_mirror.mark_stale('work', LEAVE_REQUEST_SHEET_NAME)
         return True
     except Exception as e:
         print(f'Error append_leave_request_row: {e}')
@@ -1642,6 +2415,7 @@ def append_leave_request_row(apply_date_str, employee_id, name, start_date_str,
         return False
 
 
+@sheets_quota.write_path
 def delete_pending_leave_request_row(employee_id, name, apply_date_str, start_date_str, end_date_str):
     """휴가신청 시트에서 대기('/') 상태의 신청 1건 행 삭제."""
     try:
@@ -1682,6 +2456,8 @@ def delete_pending_leave_request_row(employee_id, name, apply_date_str, start_da
             if _leave_status_bucket(row[idx_status]) != 'pending':
                 continue
             ws.delete_rows(i)
+            # 아래 행이 한 칸씩 당겨지므로 삭제 후 값 전체로 미러 교체
+            sheets_mirror.store_values('work', LEAVE_REQUEST_SHEET_NAME, rows[:i - 1] + rows[i:])
             return True
         return False
     except Exception as e:
@@ -1689,3 +2465,131 @@ def delete_pending_leave_request_row(employee_id, name, apply_date_str, start_da
         import traceback
         traceback.print_exc()
         return False
+
+
+# ----- 로컬 SQLite 미러 동기화 (utils/sheets_mirror) -----
+MIRROR_WORK_SIDE_SHEETS = (
+    ('accounts', ACCOUNTS_READ_RANGE),
+    (LEAVE_REQUEST_SHEET_NAME, LEAVE_REQUEST_READ_RANGE),
+    (LOANER_SHEET_NAME, LOANER_DB_READ_RANGE),
+)
+
+
+def _mirror_batch_get(spreadsheet_id, ranges_a1):
+    """batchGet 을 SHEETS_WORK_BATCH_CHUNK 단위로 나눠 요청 순서대로 values 목록 반환."""
+    chunk = max(1, min(200, int(getattr(config, 'SHEETS_WORK_BATCH_CHUNK', 90))))
+    out = []
+    for off in range(0, len(ranges_a1), chunk):
+        resp = _sheet_values_batch_get(spreadsheet_id, ranges_a1[off : off + chunk])
+        out.extend(vr.get('values') or [] for vr in (resp.get('valueRanges') or []))
+    return out
+
+
+def sync_sheets_mirror(full=False):
+    """시트 → 로컬 미러 동기화 (통합문서당 batchGet 1회).
+
+    증분(full=False): 당월·전월 근무 시트와 accounts·휴가신청·대차차량은 값 전체를 읽어 바뀐 행만 반영,
+    매출 월 시트는 미러 마지막 행 뒤의 꼬리만 읽는다(append 전용 시트).
+    전체(full=True): 근무·매출 모든 월 시트를 다시 읽어 수정·삭제까지 반영."""
+    if not sheets_mirror.enabled():
+        return
+    today = date.today()
+    recent = {config.MONTHS[today.month - 1], config.MONTHS[today.month - 2]}
+
+    work_ss = get_spreadsheet()
+    work_titles = set(_refresh_worksheet_map('work', work_ss))
+    targets = [(mn, WORK_DB_READ_RANGE) for mn in config.MONTHS
+               if mn in work_titles and (full or mn in recent
+                                         or sheets_mirror.sheet_state('work', mn) is None)]
+    targets += [(t, rng) for t, rng in MIRROR_WORK_SIDE_SHEETS if t in work_titles]
+    ranges = [_sheet_title_to_a1_range(t, rng) for t, rng in targets]
+    # 읽기 시작 시각 — 읽는 동안 write-through 된 행은 이 값보다 새것이라 덮지 않는다
+    started = time.time()
+    for (title, _), values in zip(targets, _mirror_batch_get(work_ss.id, ranges)):
+        sheets_mirror.store_values('work', title, values, synced_at=started)
+
+    sales_ss = get_sales_spreadsheet()
+    started = time.time()
+    sales_sheets = _refresh_worksheet_map('sales', sales_ss)
+    plans = []
+    for mn in config.MONTHS:
+        if mn not in sales_sheets:
+            continue
+        state = None if full else sheets_mirror.sheet_state('sales', mn)
+        if state is None:
+            plans.append((mn, None, _sheet_title_to_a1_range(mn, SALES_DB_READ_RANGE)))
+            continue
+        start = state[1] + 1
+        if start > sales_sheets[mn].row_count:
+            # 그리드 끝까지 찼으면 새 행이 없다 (범위가 그리드를 넘으면 batchGet 전체가 실패)
+            sheets_mirror.append_rows('sales', mn, [], synced_at=started)
+            continue
+        plans.append((mn, start, _sheet_title_to_a1_range(mn, f'A{start}:N')))
+    for (title, start, _), values in zip(plans, _mirror_batch_get(sales_ss.id, [p[2] for p in plans])):
+        if start is None:
+            sheets_mirror.store_values('sales', title, values, synced_at=started)
+        else:
+            sheets_mirror.append_rows('sales', title, values, start_row=start, synced_at=started)
+
+
+# ----- 체크포인트 (워커 재시작 보존, utils.cache_checkpoint) -----
+_WORK_GRID_SAVED_KEYS = ('header', 'records', 'row_numbers', 'ts', 'loaded', 'rev')
+
+
+def _export_work_grids():
+    """공유 월 그리드 → {월: 저장 필드}. by_employee·matrix 는 records 로 다시 만든다."""
+    with _work_grid_lock:
+        entries = dict(_work_grid_entries)
+    return {
+        mn: dict({k: e.get(k) for k in _WORK_GRID_SAVED_KEYS}, records=[dict(r) for r in e['records']])
+        for mn, e in entries.items()
+    }
+
+
+def _import_work_grids(saved):
+    now = time.time()
+    restored = 0
+    for mn, fields in saved.items():
+        fresh = now - fields['ts'] <= WORK_GRID_CACHE_TTL_SEC
+        revalidatable = fields.get('rev') is not None and now - fields['loaded'] <= config.SHEETS_REVALIDATE_MAX_AGE_SEC
+        if not (fresh or revalidatable):
+            continue
+        by_employee = {}
+        for rec in fields['records']:
+            by_employee.setdefault(rec.get('사번'), []).append(rec)
+        entry = dict(fields, by_employee=by_employee, matrix=month_grid.MonthGrid.from_records(fields['records']))
+        with _work_grid_lock:
+            if mn not in _work_grid_entries:
+                _work_grid_entries[mn] = entry
+                restored += 1
+    return restored
+
+
+def _export_sales_tails():
+    with _sales_tail_lock:
+        return {
+            mn: dict(state, summaries={eid: _copy_sales_summary(s) for eid, s in state['summaries'].items()})
+            for mn, state in _sales_tail_states.items()
+        }
+
+
+def _import_sales_tails(saved):
+    """매출 월 상태 복원. 오래됐어도 누적 요약은 맞으므로 꼬리만 읽으면 되고, 전체 재읽기 주기는 full_ts 로 지킨다."""
+    restored = 0
+    with _sales_tail_lock:
+        for mn, state in saved.items():
+            if mn not in _sales_tail_states:
+                _sales_tail_states[mn] = state
+                restored += 1
+    return restored
+
+
+cache_checkpoint.register_cache(_accounts_cache)
+cache_checkpoint.register_cache(_work_note_cache)
+cache_checkpoint.register('work_grid', _export_work_grids, _import_work_grids)
+cache_checkpoint.register('sales_tail', _export_sales_tails, _import_sales_tails)
+
+
+def start_sheets_mirror_if_enabled():
+    """SHEETS_MIRROR_ENABLED 이면 배경 동기화 시작 (프로세스당 1회)."""
+    sheets_mirror.start_syncer(lambda full: sync_sheets_mirror(full=full))
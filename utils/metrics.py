@@ -0,0 +1,155 @@
+"""프로세스 내 지표 수집 + Prometheus 텍스트 형식(/metrics) 출력.
+
+카운터·히스토그램은 이름과 라벨 조합별로 메모리에 쌓고, render() 가 exposition format 0.0.4 로 낸다.
+값이 다른 모듈 상태에서 나오는 게이지(캐시 항목 수, 스냅샷 적중률 등)는 register_gauge 로 콜백 등록.
+gunicorn 워커마다 따로 모이므로 수집기는 워커별로 긁는다(라벨 pid 로 구분)."""
+import os
+import threading
+
+import config
+
+_lock = threading.Lock()
+_meta = {}  # 이름 → (종류, 설명, 히스토그램 경계)
+_counters = {}  # (이름, 라벨 튜플) → 값
+_histograms = {}  # (이름, 라벨 튜플) → [경계별 개수..., 합, 개수]
+_gauges = {}  # 이름 → (설명, 콜백) — 콜백은 [(라벨 dict, 값), ...] 반환
+
+# 초 단위 지연 경계
+SHEETS_LATENCY_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+ROUTE_LATENCY_BUCKETS = (0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+
+def enabled():
+    return bool(getattr(config, 'METRICS_ENABLED', True))
+
+
+def _key(name, labels):
+    return name, tuple(sorted((labels or {}).items()))
+
+
+def counter(name, help_text):
+    """카운터 선언 (한 번도 증가하지 않아도 /metrics 에 HELP·TYPE 이 나온다)."""
+    _meta.setdefault(name, ('counter', help_text, None))
+
+
+def histogram(name, help_text, buckets):
+    _meta.setdefault(name, ('histogram', help_text, tuple(sorted(buckets))))
+
+
+def register_gauge(name, help_text, fn):
+    """render 시점에 fn() → [(라벨 dict, 값), ...] 을 불러 게이지로 낸다."""
+    with _lock:
+        _gauges[name] = (help_text, fn)
+
+
+def inc(name, labels=None, value=1.0):
+    if not enabled():
+        return
+    key = _key(name, labels)
+    with _lock:
+        _counters[key] = _counters.get(key, 0.0) + value
+
+
+def observe(name, value, labels=None):
+    """히스토그램에 값 하나 기록 (histogram 으로 선언한 이름만)."""
+    if not enabled():
+        return
+    buckets = _meta[name][2]
+    key = _key(name, labels)
+    with _lock:
+        slot = _histograms.get(key)
+        if slot is None:
+            slot = _histograms[key] = [0] * len(buckets) + [0.0, 0]
+        for i, bound in enumerate(buckets):
+            if value <= bound:
+                slot[i] += 1
+        slot[-2] += value
+        slot[-1] += 1
+
+
+def snapshot():
+    """현재 카운터 값 {(이름, 라벨 튜플): 값} 복사본 (벤치마크·디버깅용)."""
+    with _lock:
+        return dict(_counters)
+
+
+def reset():
+    with _lock:
+        _counters.clear()
+        _histograms.clear()
+
+
+def _escape(value):
+    return str(value).replace('\\', '\\\\').replace('\n', '\\n').replace('"', '\\"')
+
+
+def _labels_text(pairs):
+    if not pairs:
+        return ''
+    return '{' + ','.join(f'{k}="{_escape(v)}"' for k, v in pairs) + '}'
+
+
+def _number(value):
+    if isinstance(value, float) and value.is_integer():
+        return str(int(value))
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+def render():
+    """Prometheus text exposition format 문자열."""
+    pid = ('pid', str(os.getpid()))
+    with _lock:
+        counters = dict(_counters)
+        histograms = {k: list(v) for k, v in _histograms.items()}
+        gauges = dict(_gauges)
+    lines = []
+    for name in sorted(_meta):
+        kind, help_text, buckets = _meta[name]
+        lines.append(f'# HELP {name} {help_text}')
+        lines.append(f'# TYPE {name} {kind}')
+        if kind == 'counter':
+            for (n, labels), value in sorted(counters.items()):
+                if n == name:
+                    lines.append(f'{name}{_labels_text(labels + (pid,))} {_number(value)}')
+            continue
+        for (n, labels), slot in sorted(histograms.items()):
+            if n != name:
+                continue
+            for bound, count in zip(buckets, slot):
+                lines.append(f'{name}_bucket{_labels_text(labels + (("le", _number(bound)), pid))} {count}')
+            lines.append(f'{name}_bucket{_labels_text(labels + (("le", "+Inf"), pid))} {slot[-1]}')
+            lines.append(f'{name}_sum{_labels_text(labels + (pid,))} {_number(slot[-2])}')
+            lines.append(f'{name}_count{_labels_text(labels + (pid,))} {slot[-1]}')
+    for name in sorted(gauges):
+        help_text, fn = gauges[name]
+        try:
+            samples = fn()
+        except Exception as ex:
+            print(f'metrics: 게이지 {name} 수집 실패 ({ex})')
+            continue
+        lines.append(f'# HELP {name} {help_text}')
+        lines.append(f'# TYPE {name} gauge')
+        for labels, value in samples:
+            pairs = tuple(sorted((labels or {}).items())) + (pid,)
+            lines.append(f'{name}{_labels_text(pairs)} {_number(value)}')
+    return '\n'.join(lines) + '\n'
+
+
+# ----- 공통 지표 이름 -----
+counter('sheets_requests_total', 'Google Sheets/Drive API 호출 수 (op, result=ok|429|error)')
+histogram('sheets_request_duration_seconds', 'Google Sheets/Drive API 호출 지연 (op)', SHEETS_LATENCY_BUCKETS)
+counter('sheets_quota_wait_seconds_total', '토큰 버킷 대기 시간 합 (bucket)')
+counter('sheets_quota_exhausted_total', '대기 상한 안에 토큰을 못 얻어 건너뛴 호출 수 (bucket)')
+counter('sheets_quota_fallbacks_total', '공유 쿼터 버킷(SQLite) 접근 실패로 메모리 버킷을 쓴 호출 수')
+counter('sheets_429_total', 'Sheets/Drive 429 응답 수 (op)')
+counter('sheets_retries_total', '429 후 백오프 재시도 수')
+counter('sheets_retry_sleep_seconds_total', '429 백오프 대기 시간 합')
+counter('google_token_refreshes_total', '서비스 계정 액세스 토큰 발급·갱신 수 (trigger=startup|background, result=ok|error)')
+counter('warmup_steps_total', '워커 시작 캐시 예열 단계 수 (step, result=ok|skipped|error)')
+counter('yearly_fleet_refreshes_total', '전 사번 연간 통계 스냅샷 일괄 갱신 수 (result=ok|skipped|error)')
+counter('stats_deltas_total', '근무·매출 쓰기 후 통계 증감 알림 수 (source=work|sales)')
+counter('app_cache_requests_total', '메모리 캐시 조회 수 (cache, result=hit|miss)')
+counter('app_cache_evictions_total', '메모리 캐시 항목 제거 수 (cache, reason=expired|stale|cleared)')
+counter('app_cache_errors_total', '공유 캐시 호출 실패 수 (cache, reason=encode|decode|sqlite)')
+counter('yearly_snapshot_lookups_total', '연간 통계 SQLite 스냅샷 조회 수 (result=fresh|stale|miss)')
+histogram('http_request_duration_seconds', 'Flask 라우트 응답 시간 (route, method, status)', ROUTE_LATENCY_BUCKETS)
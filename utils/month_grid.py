@@ -0,0 +1,118 @@
+"""근무 월 시트의 날짜 열(1~31일)을 상태 코드 2차원 배열로 보관해 집계를 벡터 연산으로 처리.
+
+셀 문자열 정규화(strip·upper)는 배열을 만들 때 한 번만 하고, 이후 O/X/R/H// 개수·날짜별 우선순위
+결정은 NumPy 연산으로 계산한다. 코드 값이 곧 캘린더 우선순위다."""
+import numpy as np
+
+DAYS = 31
+# 코드 = 우선순위: O(근무) > X(결근) > R(예정일) > H(공휴일) > /(휴무일), 0 = 빈 칸·기타 값
+STATUS_LABELS = ('', '/', 'H', 'R', 'X', 'O')
+STATUS_CODES = {label: code for code, label in enumerate(STATUS_LABELS)}
+
+
+def encode_statuses(cells):
+    """셀 값 2차원 목록(행 × 31) → uint8 코드 배열. 대소문자·앞뒤 공백은 무시."""
+    if not len(cells):
+        return np.zeros((0, DAYS), dtype=np.uint8)
+    text = np.char.upper(np.char.strip(np.asarray(cells, dtype=str)))
+    codes = np.zeros(text.shape, dtype=np.uint8)
+    for label, code in STATUS_CODES.items():
+        if label:
+            codes[text == label] = code
+    return codes
+
+
+def _day_columns(header):
+    """헤더 → 1~31일 열 인덱스 목록 (없는 날은 None)."""
+    cols = [None] * DAYS
+    for idx, name in enumerate(header):
+        try:
+            day = int(str(name).strip())
+        except (ValueError, TypeError):
+            continue
+        if 1 <= day <= DAYS and cols[day - 1] is None:
+            cols[day - 1] = idx
+    return cols
+
+
+class MonthGrid:
+    """월 시트(또는 한 기사의 행들)의 날짜별 상태 코드 배열과 사번별 행 인덱스."""
+
+    def __init__(self, codes, employee_ids):
+        self.codes = codes  # (행 수, 31) uint8
+        self.employee_ids = list(employee_ids)
+        rows = {}
+        for pos, eid in enumerate(self.employee_ids):
+            rows.setdefault(eid, []).append(pos)
+        self._rows = {eid: np.asarray(pos, dtype=np.intp) for eid, pos in rows.items()}
+
+    @classmethod
+    def from_values(cls, raw_values):
+        """get_values 2차원 배열(1행 헤더) → 사번이 있는 행만 (공유 월 그리드 레코드와 같은 순서)."""
+        if not raw_values:
+            return cls(encode_statuses([]), [])
+        header = [str(h).strip() for h in raw_values[0]]
+        eid_col = header.index('사번') if '사번' in header else None
+        day_cols = _day_columns(header)
+        cells = []
+        employee_ids = []
+        for row in raw_values[1:]:
+            eid = str(row[eid_col]).strip() if eid_col is not None and eid_col < len(row) else ''
+            if not eid:
+                continue
+            employee_ids.append(eid)
+            cells.append([row[c] if c is not None and c < len(row) else '' for c in day_cols])
+        return cls(encode_statuses(cells), employee_ids)
+
+    @classmethod
+    def from_records(cls, records):
+        """레코드 dict 목록({'1': 'O', ...}) → 같은 순서의 배열 (사번 구분 없이 행 위치로 조회)."""
+        records = records or []
+        cells = [[rec.get(str(day), '') for day in range(1, DAYS + 1)] for rec in records]
+        return cls(encode_statuses(cells), [str(rec.get('사번', '')).strip() for rec in records])
+
+    def __len__(self):
+        return len(self.employee_ids)
+
+    def employee_codes(self, employee_id=None):
+        """사번 행들의 코드 (employee_id=None 이면 전체 행)."""
+        if employee_id is None:
+            return self.codes
+        rows = self._rows.get(str(employee_id).strip())
+        if rows is None:
+            return self.codes[:0]
+        return self.codes[rows]
+
+    def resolve_days(self, employee_id=None):
+        """여러 행을 날짜별 최고 우선순위로 합침 → {일: (상태, 해당 행 위치)} (빈 날 제외).
+
+        행 위치는 employee_codes(employee_id) 안에서의 순서, 같은 우선순위면 앞 행."""
+        codes = self.employee_codes(employee_id)
+        if not len(codes):
+            return {}
+        best_rows = codes.argmax(axis=0)
+        best_codes = codes[best_rows, np.arange(DAYS)]
+        return {
+            int(day) + 1: (STATUS_LABELS[best_codes[day]], int(best_rows[day]))
+            for day in np.flatnonzero(best_codes)
+        }
+
+    def counts(self, employee_id=None):
+        """상태별 셀 개수 {'O': n, 'X': n, 'R': n, 'H': n, '/': n} (행 합산, 우선순위 합치기 없음)."""
+        return _count_codes(self.employee_codes(employee_id))
+
+    def first_row_counts(self, employee_id):
+        """사번 첫 행만의 상태 개수 (근무 이력의 예정일처럼 첫 행 값을 쓰는 집계용)."""
+        return _count_codes(self.employee_codes(employee_id)[:1])
+
+
+def _count_codes(codes):
+    totals = np.bincount(codes.ravel(), minlength=len(STATUS_LABELS))
+    return {label: int(totals[code]) for label, code in STATUS_CODES.items() if label}
+
+
+def count_row_statuses(header, row_values):
+    """시트 한 행의 상태 개수 {'O': n, ...} (날짜 열 1~31만)."""
+    day_cols = _day_columns([str(h).strip() for h in header])
+    cells = [[row_values[c] if c is not None and c < len(row_values) else '' for c in day_cols]]
+    return MonthGrid(encode_statuses(cells), ['']).counts()
@@ -0,0 +1,202 @@
+"""여러 gunicorn 워커가 함께 쓰는 캐시 저장소 (SQLite WAL 파일).
+
+APP_CACHE_BACKEND=sqlite 이면 BoundedCache 가 프로세스 메모리 대신 이 파일에 항목을 두어, 한 워커가 읽어
+채운 값을 다른 워커도 그대로 쓴다(워커 수만큼 Sheets 읽기가 늘지 않음). 무효화(clear_pattern)도
+모든 워커에 바로 보인다. 값은 pickle 대신 태그를 붙인 JSON(dumps_value / loads_value)으로 저장한다.
+
+캐시 이름(namespace)별로 키 공간이 나뉘고, 접두사 삭제는 기본 키 범위 검색이라 지우는 항목 수만큼만 일한다."""
+import json
+import os
+import sqlite3
+import threading
+from datetime import date, datetime
+
+import config
+
+KEY_SEPARATOR = ':'
+# 조회 때마다 쓰기를 하지 않도록, 최근 사용 시각은 이 간격보다 오래됐을 때만 갱신 (LRU 근사)
+TOUCH_INTERVAL_SEC = 30.0
+
+_local = threading.local()
+
+
+def enabled():
+    return (getattr(config, 'APP_CACHE_BACKEND', 'memory') or 'memory').strip().lower() == 'sqlite' and bool(_db_path())
+
+
+def _db_path():
+    return (getattr(config, 'APP_CACHE_DB_PATH', '') or '').strip()
+
+
+# ----- 값 직렬화 (JSON + 태그) -----
+def _encode(obj):
+    if isinstance(obj, dict):
+        if all(isinstance(k, str) for k in obj) and '__t' not in obj:
+            return {k: _encode(v) for k, v in obj.items()}
+        return {'__t': 'dict', 'v': [[_encode(k), _encode(v)] for k, v in obj.items()]}
+    if isinstance(obj, list):
+        return [_encode(v) for v in obj]
+    if isinstance(obj, tuple):
+        return {'__t': 'tuple', 'v': [_encode(v) for v in obj]}
+    if isinstance(obj, (set, frozenset)):
+        return {'__t': 'set', 'v': [_encode(v) for v in sorted(obj, key=repr)]}
+    if isinstance(obj, datetime):
+        return {'__t': 'datetime', 'v': obj.isoformat()}
+    if isinstance(obj, date):
+        return {'__t': 'date', 'v': obj.isoformat()}
+    if obj is None or isinstance(obj, (str, int, float, bool)):
+        return obj
+    raise TypeError(f'캐시에 저장할 수 없는 값 형식: {type(obj).__name__}')
+
+
+def _decode(obj):
+    if isinstance(obj, list):
+        return [_decode(v) for v in obj]
+    if not isinstance(obj, dict):
+        return obj
+    tag = obj.get('__t')
+    if tag is None:
+        return {k: _decode(v) for k, v in obj.items()}
+    v = obj['v']
+    if tag == 'tuple':
+        return tuple(_decode(x) for x in v)
+    if tag == 'set':
+        return {_decode(x) for x in v}
+    if tag == 'dict':
+        return {_decode(k): _decode(x) for k, x in v}
+    if tag == 'datetime':
+        return datetime.fromisoformat(v)
+    if tag == 'date':
+        return date.fromisoformat(v)
+    raise ValueError(f'알 수 없는 캐시 값 태그: {tag}')
+
+
+def dumps_value(value):
+    """캐시 값 → JSON 문자열 (dict·list·tuple·set·date·datetime·기본형)."""
+    return json.dumps(_encode(value), ensure_ascii=False, separators=(',', ':'))
+
+
+def loads_value(text):
+    return _decode(json.loads(text))
+
+
+def encode_value(value):
+    """캐시 값 → json.dump 할 수 있는 태그 구조 (dumps_value 의 문자열화 전 단계, 체크포인트 파일용)."""
+    return _encode(value)
+
+
+def decode_value(obj):
+    return _decode(obj)
+
+
+# ----- SQLite -----
+def _init_db(conn):
+    conn.execute('PRAGMA journal_mode=WAL')
+    conn.execute('PRAGMA synchronous=NORMAL')
+    conn.executescript(
+        """
+        CREATE TABLE IF NOT EXISTS cache_entry (
+            namespace TEXT NOT NULL,
+            key TEXT NOT NULL,
+            value TEXT NOT NULL,
+            version TEXT,
+            ttl REAL NOT NULL,
+            expires_at REAL NOT NULL,
+            loaded_at REAL NOT NULL,
+            touched_at REAL NOT NULL,
+            PRIMARY KEY (namespace, key)
+        );
+        CREATE INDEX IF NOT EXISTS cache_entry_touched ON cache_entry (namespace, touched_at);
+        """
+    )
+
+
+def _conn():
+    """스레드마다 연결 하나를 열어 재사용 (조회마다 파일을 새로 여는 비용 제거)."""
+    path = os.path.abspath(_db_path())
+    conn = getattr(_local, 'conn', None)
+    if conn is not None and getattr(_local, 'path', None) == path:
+        return conn
+    d = os.path.dirname(path)
+    if d:
+        os.makedirs(d, exist_ok=True)
+    conn = sqlite3.connect(path, timeout=10, check_same_thread=False, isolation_level=None)
+    _init_db(conn)
+    _local.conn = conn
+    _local.path = path
+    return conn
+
+
+def _prefix_bounds(prefix):
+    """'a:b' → 키 'a:b' 자신과 'a:b:' 로 시작하는 키 범위 [lo, hi). ';' 는 ':' 다음 문자."""
+    return prefix + KEY_SEPARATOR, prefix + chr(ord(KEY_SEPARATOR) + 1)
+
+
+class SharedStore:
+    """BoundedCache 한 개(namespace)의 공유 저장소. 반환·인자 값은 파이썬 객체, 저장은 JSON."""
+
+    def __init__(self, namespace):
+        self.namespace = namespace
+
+    def get(self, key):
+        """(값, 세대, ttl, 만료 시각, 적재 시각) 또는 None."""
+        row = _conn().execute(
+            'SELECT value, version, ttl, expires_at, loaded_at, touched_at FROM cache_entry '
+            'WHERE namespace=? AND key=?',
+            (self.namespace, key),
+        ).fetchone()
+        if row is None:
+            return None
+        value, version, ttl, expires_at, loaded_at, touched_at = row
+        return loads_value(value), (loads_value(version) if version is not None else None), ttl, expires_at, loaded_at, touched_at
+
+    def put(self, key, value, version, ttl, now):
+        _conn().execute(
+            'INSERT OR REPLACE INTO cache_entry '
+            '(namespace, key, value, version, ttl, expires_at, loaded_at, touched_at) VALUES (?,?,?,?,?,?,?,?)',
+            (self.namespace, key, dumps_value(value), None if version is None else dumps_value(version),
+             ttl, now + ttl, now, now),
+        )
+
+    def extend(self, key, version, expires_at, now):
+        """세대가 그대로인 항목의 만료를 연장 (그 사이 다른 워커가 다시 썼으면 건드리지 않음)."""
+        _conn().execute(
+            'UPDATE cache_entry SET expires_at=?, touched_at=? WHERE namespace=? AND key=? AND version IS ?',
+            (expires_at, now, self.namespace, key, None if version is None else dumps_value(version)),
+        )
+
+    def touch(self, key, now):
+        _conn().execute(
+            'UPDATE cache_entry SET touched_at=? WHERE namespace=? AND key=?', (now, self.namespace, key)
+        )
+
+    def delete(self, key):
+        cur = _conn().execute('DELETE FROM cache_entry WHERE namespace=? AND key=?', (self.namespace, key))
+        return cur.rowcount
+
+    def delete_prefix(self, prefix):
+        """prefix 키와 그 아래 구간 키 삭제 (prefix 가 빈 문자열이면 전체) → 지운 수."""
+        if not prefix:
+            cur = _conn().execute('DELETE FROM cache_entry WHERE namespace=?', (self.namespace,))
+            return cur.rowcount
+        lo, hi = _prefix_bounds(prefix)
+        cur = _conn().execute(
+            'DELETE FROM cache_entry WHERE namespace=? AND (key=? OR (key>=? AND key<?))',
+            (self.namespace, prefix, lo, hi),
+        )
+        return cur.rowcount
+
+    def count(self):
+        return _conn().execute('SELECT COUNT(*) FROM cache_entry WHERE namespace=?', (self.namespace,)).fetchone()[0]
+
+    def trim(self, max_entries):
+        """항목 수가 상한을 넘으면 가장 오래 안 쓴 항목부터 삭제 → 지운 수."""
+        excess = self.count() - max_entries
+        if excess <= 0:
+            return 0
+        cur = _conn().execute(
+            'DELETE FROM cache_entry WHERE rowid IN ('
+            'SELECT rowid FROM cache_entry WHERE namespace=? ORDER BY touched_at LIMIT ?)',
+            (self.namespace, excess),
+        )
+        return cur.rowcount
@@ -0,0 +1,354 @@
+"""work_DB / sales_DB 시트 값을 로컬 SQLite 에 복제(미러)해 조회를 Sheets 쿼터와 분리.
+
+배경 동기화(start_syncer)가 월 시트·accounts·휴가신청·대차차량 값을 행 단위로 옮기고, 읽기 경로는
+read_values 로 이 테이블을 먼저 본다. 쓰기는 Sheets 에 한 뒤 put_row·append_rows·store_values 로
+미러에도 바로 반영(write-through)하고 행·시트마다 그 시각(written_at)을 남긴다. 동기화는 batchGet 을
+시작한 시각(synced_at)을 넘기며, 그 뒤에 write-through 된 행은 읽은 값(더 오래된 값)으로 덮지 않는다. 미러가 꺼져 있거나, 해당 시트를 아직 못 읽었거나,
+마지막 동기화가 SHEETS_MIRROR_MAX_AGE_SEC 보다 오래됐으면 None 을 돌려 호출자가 Sheets 를 읽게 한다.
+
+kind 는 통합문서 구분('work' | 'sales'), title 은 시트 이름. 행 번호는 시트와 같은 1-base(1행 = 헤더)."""
+import json
+import os
+import socket
+import sqlite3
+import threading
+import time
+
+import config
+
+_lock = threading.Lock()
+_local = threading.local()
+_syncer_started = False
+_owner_id = f'{socket.gethostname()}:{os.getpid()}'
+
+# 사번 열 이름 (월 시트·휴가신청: 사번, accounts: employee_id)
+EMPLOYEE_ID_COLUMNS = ('사번', 'employee_id')
+
+
+def enabled():
+    return bool(getattr(config, 'SHEETS_MIRROR_ENABLED', False)) and bool(_db_path())
+
+
+def _db_path():
+    return (getattr(config, 'SHEETS_MIRROR_DB_PATH', '') or '').strip()
+
+
+def _init_db(conn):
+    conn.execute('PRAGMA journal_mode=WAL')
+    conn.executescript(
+        """
+        CREATE TABLE IF NOT EXISTS mirror_sheet (
+            kind TEXT NOT NULL,
+            title TEXT NOT NULL,
+            header TEXT NOT NULL,
+            row_count INTEGER NOT NULL,
+            synced_at REAL NOT NULL,
+            written_at REAL NOT NULL DEFAULT 0,
+            PRIMARY KEY (kind, title)
+        );
+        CREATE TABLE IF NOT EXISTS mirror_row (
+            kind TEXT NOT NULL,
+            title TEXT NOT NULL,
+            row_num INTEGER NOT NULL,
+            employee_id TEXT NOT NULL,
+            data TEXT NOT NULL,
+            written_at REAL NOT NULL DEFAULT 0,
+            PRIMARY KEY (kind, title, row_num)
+        );
+        CREATE INDEX IF NOT EXISTS mirror_row_employee
+            ON mirror_row (kind, title, employee_id);
+        CREATE TABLE IF NOT EXISTS mirror_lease (
+            name TEXT PRIMARY KEY,
+            owner TEXT NOT NULL,
+            expires_at REAL NOT NULL
+        );
+        """
+    )
+    # written_at 이전에 만든 미러 파일
+    for table in ('mirror_sheet', 'mirror_row'):
+        cols = {r[1] for r in conn.execute(f'PRAGMA table_info({table})')}
+        if 'written_at' not in cols:
+            conn.execute(f'ALTER TABLE {table} ADD COLUMN written_at REAL NOT NULL DEFAULT 0')
+
+
+def _conn():
+    """스레드마다 연결 하나를 열어 재사용 (조회마다 파일 열기·DDL 을 되풀이하지 않음). 동시 쓰기는 WAL·busy timeout 이 맡는다."""
+    path = os.path.abspath(_db_path())
+    conn = getattr(_local, 'conn', None)
+    if conn is not None and getattr(_local, 'path', None) == path:
+        return conn
+    d = os.path.dirname(path)
+    if d:
+        os.makedirs(d, exist_ok=True)
+    conn = sqlite3.connect(path, timeout=10, check_same_thread=False)
+    _init_db(conn)
+    _local.conn = conn
+    _local.path = path
+    return conn
+
+
+def _cell_text(value):
+    """Sheets FORMATTED_VALUE 와 같은 문자열로 보관 (정수형 float 은 소수점 제거)."""
+    if value is None:
+        return ''
+    if isinstance(value, float) and value.is_integer():
+        return str(int(value))
+    return str(value)
+
+
+def _employee_col(header):
+    for name in EMPLOYEE_ID_COLUMNS:
+        if name in header:
+            return header.index(name)
+    return None
+
+
+def _row_employee_id(row, eid_col):
+    if eid_col is None or len(row) <= eid_col:
+        return ''
+    return str(row[eid_col]).strip()
+
+
+def _normalize_header(values):
+    return [str(h).strip() for h in (values[0] if values else [])]
+
+
+def _row_data(row):
+    return json.dumps([_cell_text(v) for v in row], ensure_ascii=False)
+
+
+def store_values(kind, title, values, synced_at=None):
+    """시트 전체 값(헤더 포함)으로 미러 교체. 바뀐 행만 쓰고 줄어든 꼬리 행은 지운다.
+
+    synced_at 은 배경 동기화가 값을 읽기 시작한 시각. 그 뒤에 write-through 된 행은 건너뛰고(지우지도
+    않음), 그 뒤에 행이 지워지는 등 시트 모양이 바뀌었으면 미러 끝 너머의 행도 붙이지 않는다.
+    synced_at 이 없으면 쓰기 함수가 방금 읽은 값으로 교체하는 write-through (바뀐 행에 지금 시각 기록)."""
+    if not enabled():
+        return
+    values = values or []
+    header = _normalize_header(values)
+    eid_col = _employee_col(header)
+    now = time.time()
+    through = synced_at is None
+    rows = {i: _row_data(row) for i, row in enumerate(values[1:], start=2)}
+    conn = _conn()
+    with conn:
+        old = {
+            n: (data, float(w)) for n, data, w in conn.execute(
+                'SELECT row_num, data, written_at FROM mirror_row WHERE kind=? AND title=?', (kind, title)
+            ).fetchall()
+        }
+        meta = conn.execute(
+            'SELECT row_count, written_at FROM mirror_sheet WHERE kind=? AND title=?', (kind, title)
+        ).fetchone()
+        if through:
+            newer = set()
+            row_count = len(values)
+        else:
+            newer = {n for n, (_, w) in old.items() if w > synced_at}
+            row_count = len(values)
+            if meta is not None and float(meta[1]) > synced_at:
+                row_count = min(row_count, int(meta[0]))
+            rows = {n: data for n, data in rows.items() if n <= row_count and n not in newer}
+            while row_count + 1 in newer:
+                row_count += 1
+        changed = [
+            (kind, title, n, _row_employee_id(json.loads(data), eid_col), data, now if through else 0.0)
+            for n, data in rows.items() if old.get(n, (None,))[0] != data
+        ]
+        conn.executemany(
+            'INSERT OR REPLACE INTO mirror_row (kind, title, row_num, employee_id, data, written_at) '
+            'VALUES (?,?,?,?,?,?)',
+            changed,
+        )
+        conn.execute(
+            'DELETE FROM mirror_row WHERE kind=? AND title=? AND row_num>? AND written_at<=?',
+            (kind, title, row_count, now if through else synced_at),
+        )
+        conn.execute(
+            'INSERT OR REPLACE INTO mirror_sheet (kind, title, header, row_count, synced_at, written_at) '
+            'VALUES (?,?,?,?,?,?)',
+            (kind, title, json.dumps(header, ensure_ascii=False), max(row_count, 1),
+             now if through else synced_at,
+             now if through else (float(meta[1]) if meta is not None else 0.0)),
+        )
+
+
+def sheet_state(kind, title):
+    """(헤더, 행 수, 마지막 동기화 시각). 미러에 없으면 None."""
+    if not enabled():
+        return None
+    row = _conn().execute(
+        'SELECT header, row_count, synced_at FROM mirror_sheet WHERE kind=? AND title=?', (kind, title)
+    ).fetchone()
+    if row is None:
+        return None
+    return json.loads(row[0]), int(row[1]), float(row[2])
+
+
+def append_rows(kind, title, rows, start_row=None, synced_at=None):
+    """행 추가 (매출·휴가신청 append write-through, 배경 동기화의 꼬리 읽기).
+
+    start_row 는 시트에 실제로 들어간 첫 행 번호(append 응답 updatedRange 또는 꼬리 읽기 시작 행). 그 사이
+    다른 곳에서 붙인 행이 있어 미러 끝과 이어지지 않으면 행만 넣고 행 수는 그대로 두어, 다음 꼬리 읽기가
+    빈 구간부터 다시 채우게 한다. start_row 가 없으면 미러 마지막 행 뒤.
+    synced_at 을 주면 배경 동기화(그 시각에 읽기 시작): 동기화 시각을 그 값으로 바꾸고, 그 뒤에
+    write-through 된 행은 덮지 않는다. 없으면 write-through 로 지금 시각을 행에 남긴다. 미러에 없는 시트는 무시."""
+    if not enabled():
+        return
+    rows = rows or []
+    through = synced_at is None
+    now = time.time()
+    conn = _conn()
+    with conn:
+        meta = conn.execute(
+            'SELECT header, row_count FROM mirror_sheet WHERE kind=? AND title=?', (kind, title)
+        ).fetchone()
+        if meta is None:
+            return
+        eid_col = _employee_col(json.loads(meta[0]))
+        row_count = int(meta[1])
+        start = row_count + 1 if start_row is None else int(start_row)
+        newer = set() if through else {
+            n for (n,) in conn.execute(
+                'SELECT row_num FROM mirror_row WHERE kind=? AND title=? AND row_num>=? AND written_at>?',
+                (kind, title, start, synced_at),
+            ).fetchall()
+        }
+        conn.executemany(
+            'INSERT OR REPLACE INTO mirror_row (kind, title, row_num, employee_id, data, written_at) '
+            'VALUES (?,?,?,?,?,?)',
+            [
+                (kind, title, n, _row_employee_id(row, eid_col), _row_data(row), now if through else 0.0)
+                for n, row in enumerate(rows, start=start) if n not in newer
+            ],
+        )
+        if start <= row_count + 1:
+            row_count = max(row_count, start + len(rows) - 1)
+        if through:
+            conn.execute(
+                'UPDATE mirror_sheet SET row_count=?, written_at=? WHERE kind=? AND title=?',
+                (row_count, now, kind, title),
+            )
+        else:
+            conn.execute(
+                'UPDATE mirror_sheet SET row_count=?, synced_at=? WHERE kind=? AND title=?',
+                (row_count, synced_at, kind, title),
+            )
+
+
+def put_row(kind, title, row_num, row):
+    """한 행 값 교체 (셀 수정 후 write-through, 지금 시각을 행에 남김). 미러에 없는 시트는 무시."""
+    if not enabled() or row_num < 2:
+        return
+    now = time.time()
+    conn = _conn()
+    with conn:
+        meta = conn.execute(
+            'SELECT header FROM mirror_sheet WHERE kind=? AND title=?', (kind, title)
+        ).fetchone()
+        if meta is None:
+            return
+        eid_col = _employee_col(json.loads(meta[0]))
+        conn.execute(
+            'INSERT OR REPLACE INTO mirror_row (kind, title, row_num, employee_id, data, written_at) '
+            'VALUES (?,?,?,?,?,?)',
+            (kind, title, int(row_num), _row_employee_id(row, eid_col), _row_data(row), now),
+        )
+        conn.execute(
+            'UPDATE mirror_sheet SET row_count=MAX(row_count, ?), written_at=? WHERE kind=? AND title=?',
+            (int(row_num), now, kind, title),
+        )
+
+
+def mark_stale(kind, title=None):
+    """다음 동기화 전까지 해당 시트(또는 kind 전체)를 읽기 대상에서 뺀다."""
+    if not enabled():
+        return
+    conn = _conn()
+    with conn:
+        if title is None:
+            conn.execute('UPDATE mirror_sheet SET synced_at=0 WHERE kind=?', (kind,))
+        else:
+            conn.execute('UPDATE mirror_sheet SET synced_at=0 WHERE kind=? AND title=?', (kind, title))
+
+
+def read_values(kind, title, employee_id=None, max_age=None):
+    """get_values 와 같은 2차원 배열(헤더 + 행). employee_id 를 주면 그 사번 행만(인덱스 조회).
+
+    미러가 꺼져 있거나 시트가 없거나 동기화가 max_age(기본 SHEETS_MIRROR_MAX_AGE_SEC)보다
+    오래됐으면 None."""
+    if not enabled():
+        return None
+    limit = config.SHEETS_MIRROR_MAX_AGE_SEC if max_age is None else max_age
+    try:
+        conn = _conn()
+        meta = conn.execute(
+            'SELECT header, synced_at FROM mirror_sheet WHERE kind=? AND title=?', (kind, title)
+        ).fetchone()
+        if meta is None or time.time() - float(meta[1]) > limit:
+            return None
+        if employee_id is None:
+            rows = conn.execute(
+                'SELECT data FROM mirror_row WHERE kind=? AND title=? ORDER BY row_num', (kind, title)
+            ).fetchall()
+        else:
+            rows = conn.execute(
+                'SELECT data FROM mirror_row WHERE kind=? AND title=? AND employee_id=? ORDER BY row_num',
+                (kind, title, str(employee_id).strip()),
+            ).fetchall()
+    except sqlite3.Error as ex:
+        print(f'sheets_mirror: 조회 실패 — Sheets 로 조회합니다 ({ex})')
+        return None
+    return [json.loads(meta[0])] + [json.loads(r[0]) for r in rows]
+
+
+def _try_lease(name, ttl_sec):
+    """여러 워커 중 한 곳만 동기화하도록 DB 임대(lease) 획득·연장."""
+    now = time.time()
+    conn = _conn()
+    conn.execute('BEGIN IMMEDIATE')
+    try:
+        row = conn.execute('SELECT owner, expires_at FROM mirror_lease WHERE name=?', (name,)).fetchone()
+        if row is not None and row[0] != _owner_id and float(row[1]) > now:
+            conn.commit()
+            return False
+        conn.execute(
+            'INSERT OR REPLACE INTO mirror_lease (name, owner, expires_at) VALUES (?,?,?)',
+            (name, _owner_id, now + ttl_sec),
+        )
+        conn.commit()
+        return True
+    except BaseException:
+        conn.rollback()
+        raise
+
+
+def start_syncer(sync_fn):
+    """배경 동기화 스레드 시작 (프로세스당 1회). sync_fn(full) 은 시트를 읽어 store_values/append_rows 호출.
+
+    SHEETS_MIRROR_SYNC_SECONDS 마다 증분 동기화, SHEETS_MIRROR_FULL_SYNC_SECONDS 마다 전체 동기화.
+    임대를 가진 워커만 실제로 Sheets 를 읽는다."""
+    global _syncer_started
+    if not enabled():
+        return
+    with _lock:
+        if _syncer_started:
+            return
+        _syncer_started = True
+    interval = config.SHEETS_MIRROR_SYNC_SECONDS
+
+    def loop():
+        last_full = 0.0
+        while True:
+            try:
+                if _try_lease('sync', interval * 3):
+                    full = time.time() - last_full >= config.SHEETS_MIRROR_FULL_SYNC_SECONDS
+                    sync_fn(full)
+                    if full:
+                        last_full = time.time()
+            except Exception as ex:
+                print(f'sheets_mirror: 동기화 실패 ({ex})')
+            time.sleep(interval)
+
+    threading.Thread(target=loop, daemon=True, name='sheets-mirror-sync').start()
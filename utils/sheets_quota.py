@@ -0,0 +1,373 @@
+"""Sheets/Drive 분당 쿼터 선제 제어 (토큰 버킷).
+
+429가 난 뒤 백오프하는 대신 호출 직전에 토큰을 받는다. 읽기·Drive 는 토큰이 없으면 대기 상한
+(SHEETS_QUOTA_MAX_WAIT_SEC)까지만 기다리고, 넘으면 QuotaExhausted 로 호출을 포기(shed)한다 —
+호출자는 만료된 캐시로 응답한다. 쓰기(근무·매출 기록)는 write_path 로 감싼 쓰기 함수 호출마다
+마감 하나(SHEETS_QUOTA_WRITE_MAX_WAIT_SEC, Gunicorn timeout 보다 한참 짧게)를 두고 그 안에서만 줄을 서며,
+넘으면 포기하고 라우트가 '잠시 후 다시 시도' 로 응답한다 — 워커를 timeout 까지 붙잡지 않는다.
+SHEETS_QUOTA_DB_PATH 가 있으면 버킷 상태를 SQLite 파일로 공유해 모든 Gunicorn 워커·스레드가
+같은 예산을 쓰고(연결은 스레드마다 하나를 재사용), 없거나 파일 접근이 실패하면 프로세스 메모리 버킷으로 동작한다.
+
+버킷: read(Sheets 읽기), write(Sheets 쓰기), drive(Drive API).
+모든 호출의 연산 이름별 지연·결과·토큰 대기 시간은 utils.metrics 로 기록한다."""
+import functools
+import json
+import math
+import os
+import sqlite3
+import threading
+import time
+from urllib.parse import parse_qs, urlparse
+
+import gspread
+from googleapiclient.errors import HttpError
+
+import config
+from utils import metrics
+
+BUCKETS = ('read', 'write', 'drive')
+
+_lock = threading.Lock()
+_mem_buckets = {}  # 버킷 이름 → [남은 토큰, 갱신 시각]
+_local = threading.local()
+_fallback_warned = False  # 공유 버킷 실패 경고는 실패가 이어지는 동안 한 번만
+
+
+class QuotaExhausted(Exception):
+    """대기 상한 안에 쿼터 토큰을 얻지 못해 호출을 포기함 (재시도 대상 아님)."""
+
+
+def _capacity(bucket):
+    return {
+        'read': config.SHEETS_READ_QUOTA_PER_MIN,
+        'write': config.SHEETS_WRITE_QUOTA_PER_MIN,
+        'drive': config.DRIVE_QUOTA_PER_MIN,
+    }[bucket]
+
+
+def _refilled(tokens, updated_at, now, cap):
+    return min(float(cap), tokens + max(0.0, now - updated_at) * cap / 60.0)
+
+
+def _take_from(tokens, n, cap):
+    """(새 토큰 수, 필요한 대기 초). 대기 0이면 토큰 n개를 차감한 것."""
+    if tokens >= n:
+        return tokens - n, 0.0
+    return tokens, (n - tokens) * 60.0 / cap
+
+
+def _take_memory(bucket, n, now, drain=False):
+    cap = _capacity(bucket)
+    with _lock:
+        tokens, ts = _mem_buckets.get(bucket, (float(cap), now))
+        tokens = 0.0 if drain else _refilled(tokens, ts, now, cap)
+        tokens, wait = _take_from(tokens, n, cap)
+        _mem_buckets[bucket] = [tokens, now]
+        return tokens, wait
+
+
+def _peek_memory(bucket, now):
+    cap = _capacity(bucket)
+    with _lock:
+        tokens, ts = _mem_buckets.get(bucket, (float(cap), now))
+    return _refilled(tokens, ts, now, cap)
+
+
+def _db_path():
+    return (getattr(config, 'SHEETS_QUOTA_DB_PATH', '') or '').strip()
+
+
+def _init_db(conn):
+    conn.execute('PRAGMA journal_mode=WAL')
+    conn.execute(
+        'CREATE TABLE IF NOT EXISTS quota_bucket ('
+        'name TEXT PRIMARY KEY, tokens REAL NOT NULL, updated_at REAL NOT NULL)'
+    )
+
+
+def _conn(path):
+    """스레드마다 연결 하나를 열어 재사용 (호출마다 파일 열기·PRAGMA·DDL 을 되풀이하지 않음)."""
+    conn = getattr(_local, 'conn', None)
+    if conn is not None and getattr(_local, 'path', None) == path:
+        return conn
+    d = os.path.dirname(path)
+    if d:
+        os.makedirs(d, exist_ok=True)
+    conn = sqlite3.connect(path, timeout=5, isolation_level=None, check_same_thread=False)
+    _init_db(conn)
+    _local.conn = conn
+    _local.path = path
+    return conn
+
+
+def _drop_conn():
+    conn = getattr(_local, 'conn', None)
+    _local.conn = None
+    if conn is not None:
+        try:
+            conn.close()
+        except sqlite3.Error:
+            pass
+
+
+def _take_sqlite(bucket, n, now, path, drain=False):
+    cap = _capacity(bucket)
+    conn = _conn(path)
+    conn.execute('BEGIN IMMEDIATE')
+    try:
+        row = conn.execute(
+            'SELECT tokens, updated_at FROM quota_bucket WHERE name=?', (bucket,)
+        ).fetchone()
+        tokens = float(cap) if row is None else _refilled(float(row[0]), float(row[1]), now, cap)
+        if drain:
+            tokens = 0.0
+        tokens, wait = _take_from(tokens, n, cap)
+        conn.execute(
+            'INSERT OR REPLACE INTO quota_bucket (name, tokens, updated_at) VALUES (?,?,?)',
+            (bucket, tokens, now),
+        )
+        conn.execute('COMMIT')
+    except BaseException:
+        if conn.in_transaction:
+            conn.execute('ROLLBACK')
+        raise
+    return tokens, wait
+
+
+def _peek_sqlite(bucket, now, path):
+    """쓰기 잠금 없이 현재 잔량만 계산 (차감·갱신하지 않음)."""
+    cap = _capacity(bucket)
+    row = _conn(path).execute(
+        'SELECT tokens, updated_at FROM quota_bucket WHERE name=?', (bucket,)
+    ).fetchone()
+    return float(cap) if row is None else _refilled(float(row[0]), float(row[1]), now, cap)
+
+
+def _shared(fn, *args):
+    """공유 버킷 호출. 실패하면 연결을 버리고 None (호출자는 메모리 버킷으로) — 수는 지표로 남긴다."""
+    global _fallback_warned
+    try:
+        result = fn(*args)
+    except (sqlite3.Error, OSError) as ex:
+        _drop_conn()
+        metrics.inc('sheets_quota_fallbacks_total')
+        if not _fallback_warned:
+            _fallback_warned = True
+            print(f'sheets_quota: 공유 버킷 접근 실패 — 복구될 때까지 메모리 버킷 사용 ({ex})')
+        return None
+    _fallback_warned = False
+    return result
+
+
+def _take(bucket, n, drain=False):
+    now = time.time()
+    path = _db_path()
+    if path:
+        taken = _shared(_take_sqlite, bucket, n, now, os.path.abspath(path), drain)
+        if taken is not None:
+            return taken
+    return _take_memory(bucket, n, now, drain=drain)
+
+
+def _peek(bucket):
+    now = time.time()
+    path = _db_path()
+    if path:
+        tokens = _shared(_peek_sqlite, bucket, now, os.path.abspath(path))
+        if tokens is not None:
+            return tokens
+    return _peek_memory(bucket, now)
+
+
+def enabled():
+    return bool(getattr(config, 'SHEETS_QUOTA_ENABLED', False))
+
+
+def max_wait_for(bucket):
+    """버킷별 대기 상한 (초). write_path 로 감싼 쓰기 함수 안에서는 그 호출 전체에 하나뿐인 마감까지 남은
+    시간이다 — 함수 안의 읽기(행 위치 확인 등)와 쓰기 대기를 모두 합쳐 SHEETS_QUOTA_WRITE_MAX_WAIT_SEC 를 넘지 않는다."""
+    deadline = getattr(_local, 'write_deadline', None)
+    if deadline is not None:
+        return max(0.0, deadline - time.monotonic())
+    if bucket == 'write':
+        return config.SHEETS_QUOTA_WRITE_MAX_WAIT_SEC
+    return config.SHEETS_QUOTA_MAX_WAIT_SEC
+
+
+def write_path(fn):
+    """쓰기 함수 장식자 — 가장 바깥 호출에서 마감(지금 + SHEETS_QUOTA_WRITE_MAX_WAIT_SEC)을 정하고,
+    함수 안의 모든 토큰 대기가 그 마감을 나눠 쓴다. 마감 안에 토큰을 못 얻으면 QuotaExhausted 로 포기하고
+    write_shed() 가 True 가 된다 (라우트는 '잠시 후 다시 시도' 로 응답)."""
+    @functools.wraps(fn)
+    def wrapper(*args, **kwargs):
+        outer = getattr(_local, 'write_deadline', None)
+        if outer is None:
+            _local.write_deadline = time.monotonic() + config.SHEETS_QUOTA_WRITE_MAX_WAIT_SEC
+            _local.write_shed = False
+        try:
+            return fn(*args, **kwargs)
+        finally:
+            _local.write_deadline = outer
+    return wrapper
+
+
+def write_shed():
+    """이 스레드의 마지막 write_path 호출이 쓰기 쿼터 마감에 걸려 포기됐는지."""
+    return bool(getattr(_local, 'write_shed', False))
+
+
+def retry_after(bucket='write'):
+    """토큰 1개가 다시 찰 때까지의 초 (Retry-After 헤더용, 최소 1)."""
+    cap = _capacity(bucket)
+    return max(1, int(math.ceil((1.0 - min(1.0, remaining(bucket))) * 60.0 / cap)))
+
+
+def acquire(bucket, n=1, max_wait=None):
+    """버킷에서 토큰 n개 확보. 필요하면 max_wait 초(기본 max_wait_for(bucket))까지 대기, 넘으면 QuotaExhausted."""
+    if not enabled():
+        return
+    limit = max_wait_for(bucket) if max_wait is None else max_wait
+    waited = 0.0
+    while True:
+        _, wait = _take(bucket, n)
+        if wait <= 0:
+            if waited:
+                metrics.inc('sheets_quota_wait_seconds_total', {'bucket': bucket}, waited)
+            return
+        if waited + wait > limit:
+            metrics.inc('sheets_quota_exhausted_total', {'bucket': bucket})
+            if waited:
+                metrics.inc('sheets_quota_wait_seconds_total', {'bucket': bucket}, waited)
+            if getattr(_local, 'write_deadline', None) is not None:
+                _local.write_shed = True
+            raise QuotaExhausted(
+                f'{bucket} 쿼터 예산 소진 — {limit:.1f}초 안에 토큰을 얻지 못해 호출을 건너뜁니다.'
+            )
+        time.sleep(wait)
+        waited += wait
+
+
+def remaining(bucket):
+    """지금 쓸 수 있는 토큰 수 (차감 없음)."""
+    if not enabled():
+        return float(_capacity(bucket))
+    return _peek(bucket)
+
+
+def budget():
+    """버킷별 {'remaining', 'capacity'} — 라우트가 대기 대신 stale 응답을 고를 때 참고."""
+    return {b: {'remaining': remaining(b), 'capacity': _capacity(b)} for b in BUCKETS}
+
+
+def has_budget(bucket='read', reserve=None, reserve_fraction=None):
+    """남은 토큰이 여유분(기본: 용량 × SHEETS_QUOTA_STALE_RESERVE, reserve_fraction 을 주면 용량 × 그 비율) 이상인지."""
+    if not enabled():
+        return True
+    if reserve is None:
+        fraction = config.SHEETS_QUOTA_STALE_RESERVE if reserve_fraction is None else reserve_fraction
+        reserve = _capacity(bucket) * fraction
+    return remaining(bucket) >= reserve
+
+
+def note_quota_error(bucket):
+    """실제 429 응답을 받으면 버킷을 비워 다른 스레드·워커도 잠시 멈추게 한다."""
+    if enabled():
+        _take(bucket, 0, drain=True)
+
+
+def classify_request(method, uri):
+    """HTTP 메서드·URL → 버킷 이름."""
+    uri = uri or ''
+    if '/drive/' in uri:
+        return 'drive'
+    if str(method).upper() == 'GET' or ':batchGet' in uri or 'getByDataFilter' in uri:
+        return 'read'
+    return 'write'
+
+
+def _batch_update_kind(body):
+    """batchUpdate 본문의 첫 요청 종류 (appendCells, updateCells 등). 모르면 None."""
+    if isinstance(body, (bytes, str)):
+        try:
+            body = json.loads(body)
+        except ValueError:
+            return None
+    if not isinstance(body, dict):
+        return None
+    requests = body.get('requests') or []
+    if not requests or not isinstance(requests[0], dict):
+        return None
+    return next(iter(requests[0]), None)
+
+
+def operation_name(method, uri, params=None, body=None):
+    """HTTP 메서드·URL(·쿼리·본문) → 지표용 연산 이름 (values.get, values.batchGet, notes.get 등)."""
+    parsed = urlparse(uri or '')
+    path = parsed.path
+    method = str(method).upper()
+    if '/drive/' in path:
+        return 'drive.files.list' if path.rstrip('/').endswith('/files') else 'drive.files.get'
+    if ':batchGet' in path:
+        return 'values.batchGet'
+    if ':batchUpdate' in path:
+        if '/values' in path:
+            return 'values.batchUpdate'
+        kind = _batch_update_kind(body)
+        return f'spreadsheets.batchUpdate.{kind}' if kind else 'spreadsheets.batchUpdate'
+    if '/values/' in path:
+        if ':append' in path:
+            return 'values.append'
+        if ':clear' in path:
+            return 'values.clear'
+        return 'values.get' if method == 'GET' else 'values.update'
+    fields = ' '.join(parse_qs(parsed.query).get('fields', []))
+    if params:
+        fields += ' ' + str(params.get('fields', ''))
+    return 'notes.get' if 'note' in fields else 'spreadsheets.get'
+
+
+def _record(op, started, exc=None):
+    result = 'ok'
+    if exc is not None:
+        result = '429' if _is_429(exc) else 'error'
+        if result == '429':
+            metrics.inc('sheets_429_total', {'op': op})
+    metrics.inc('sheets_requests_total', {'op': op, 'result': result})
+    metrics.observe('sheets_request_duration_seconds', time.perf_counter() - started, {'op': op})
+
+
+def _is_429(exc):
+    if isinstance(exc, HttpError):
+        return getattr(exc.resp, 'status', None) == 429
+    if isinstance(exc, gspread.exceptions.APIError):
+        return getattr(getattr(exc, 'response', None), 'status_code', None) == 429
+    return False
+
+
+def metered_call(method, uri, call, params=None, body=None):
+    """토큰 확보 → call() 실행 → 연산별 지연·결과 기록 (429 면 버킷 잔량을 비움).
+
+    gspread(QuotaClient) 와 discovery 서비스(utils.google_discovery) 의 모든 요청이 이 경로를 지난다."""
+    bucket = classify_request(method, uri)
+    acquire(bucket)
+    op = operation_name(method, uri, params=params, body=body)
+    started = time.perf_counter()
+    try:
+        result = call()
+    except Exception as e:
+        _record(op, started, e)
+        if _is_429(e):
+            note_quota_error(bucket)
+        raise
+    _record(op, started)
+    return result
+
+
+class QuotaClient(gspread.Client):
+    """gspread.authorize(client_factory=...) 용 — 모든 gspread 요청 전에 토큰 확보."""
+
+    def request(self, method, endpoint, *args, **kwargs):
+        return metered_call(
+            method, endpoint, lambda: super(QuotaClient, self).request(method, endpoint, *args, **kwargs),
+            params=kwargs.get('params'), body=kwargs.get('json'),
+        )
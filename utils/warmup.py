@@ -0,0 +1,94 @@
+"""워커 시작 캐시 예열 + 준비 완료(readiness) 상태.
+
+gunicorn 이 max_requests 마다 워커를 새로 띄우면 캐시가 비어, 재시작 직후 기사들이 각자 월 시트·매출·계정을
+읽는다. start() 는 예열 단계들을 백그라운드 스레드(cache-warmup)에서 차례로 실행해 그 읽기를 한 번으로 모은다.
+단계마다 쿼터 버킷에 WARMUP_QUOTA_RESERVE 이상 토큰이 남아 있을 때만 실행하고, 모자라면 건너뛴다
+(그 캐시는 평소처럼 첫 요청이 채움). 한 단계가 실패해도 나머지는 계속한다.
+
+모든 단계를 시도하면 준비 완료(is_ready) — /readyz 와 app_ready 게이지로 노출한다.
+프로세스(pid)마다 한 번만 실행되므로 fork 된 워커에서 다시 부르면 그 워커용으로 새로 돈다."""
+import os
+import threading
+import time
+
+import config
+from utils import metrics, sheets_quota
+
+_lock = threading.Lock()
+_state = {'pid': None, 'status': 'idle', 'started': None, 'finished': None, 'steps': []}
+
+
+def _reset_for_pid():
+    """fork 로 부모 상태를 물려받았으면 이 프로세스용으로 초기화 (잠금 안에서 호출)."""
+    if _state['pid'] != os.getpid():
+        _state.update(pid=os.getpid(), status='idle', started=None, finished=None, steps=[])
+
+
+def _run_step(name, fn, bucket):
+    if bucket and not sheets_quota.has_budget(bucket, reserve_fraction=config.WARMUP_QUOTA_RESERVE):
+        result, detail = 'skipped', f'{bucket} 쿼터 여유 부족'
+    else:
+        started = time.perf_counter()
+        try:
+            fn()
+            result, detail = 'ok', f'{(time.perf_counter() - started) * 1000:.0f}ms'
+        except Exception as ex:
+            result, detail = 'error', str(ex)[:200]
+            print(f'warmup: {name} 실패 ({ex})')
+    metrics.inc('warmup_steps_total', {'step': name, 'result': result})
+    with _lock:
+        _state['steps'].append({'name': name, 'result': result, 'detail': detail})
+
+
+def _run(steps):
+    for name, fn, bucket in steps:
+        _run_step(name, fn, bucket)
+    with _lock:
+        _state['status'] = 'ready'
+        _state['finished'] = time.time()
+        summary = ', '.join(f"{s['name']}={s['result']}" for s in _state['steps'])
+        elapsed = _state['finished'] - _state['started']
+    print(f'warmup: 준비 완료 ({elapsed:.1f}s) — {summary}')
+
+
+def start(steps_fn, background=True):
+    """예열 시작 (프로세스당 1회, 이미 시작했으면 무시) → 이번 호출이 시작했는지.
+
+    steps_fn() → [(단계 이름, 함수, 쿼터 버킷 또는 None), ...] — 날짜 계산 등을 시작 시점에 하도록 지연 호출."""
+    with _lock:
+        _reset_for_pid()
+        if _state['status'] != 'idle':
+            return False
+        if not config.WARMUP_ENABLED:
+            _state.update(status='ready', started=time.time(), finished=time.time())
+            return False
+        _state.update(status='running', started=time.time())
+    try:
+        steps = steps_fn()
+    except Exception as ex:
+        print(f'warmup: 단계 목록 생성 실패 ({ex})')
+        steps = []
+    if background:
+        threading.Thread(target=_run, args=(steps,), daemon=True, name='cache-warmup').start()
+    else:
+        _run(steps)
+    return True
+
+
+def is_ready():
+    with _lock:
+        _reset_for_pid()
+        return _state['status'] == 'ready' or (_state['status'] == 'idle' and not config.WARMUP_ENABLED)
+
+
+def status():
+    """{'ready', 'status', 'started', 'finished', 'steps': [{'name', 'result', 'detail'}]} (/readyz 응답)."""
+    with _lock:
+        _reset_for_pid()
+        state = dict(_state, steps=[dict(s) for s in _state['steps']])
+    state.pop('pid')
+    state['ready'] = state['status'] == 'ready' or (state['status'] == 'idle' and not config.WARMUP_ENABLED)
+    return state
+
+
+metrics.register_gauge('app_ready', '캐시 예열이 끝나 준비 완료면 1', lambda: [({}, 1 if is_ready() else 0)])
@@ -1,12 +1,42 @@
 """연간 통계 중 Sheets 부담이 큰 필드(결근 합·가해사고 합)만 SQLite에 스냅샷.
 
-연차(잔여/총액)는 매 요청 시 시트에서 갱신해 반영한다."""
+연차(잔여/총액)는 매 요청 시 시트에서 갱신해 반영한다.
+
+같은 DB 의 monthly_rollup 테이블은 (사번, 연, 월) 단위 집계(근무·결근·인정·휴가·예정일, 매출, 연료비,
+가해사고)를 보관한다. 마감된 월은 rollup_months 에 한 번 기록(freeze_month)한 뒤 다시 읽지 않으며,
+연간 합계·근무 이력은 마감 월을 SQL 합계로, 진행 중인 월만 Sheets 에서 구한다.
+근무·매출 쓰기는 apply_heavy_delta / apply_rollup_delta 로 증감만 더해 전체 재계산 없이 최신으로 유지한다."""
 import os
 import sqlite3
 import threading
 import time
 
+from utils import metrics
+
 _lock = threading.Lock()
+_lookups = {'fresh': 0, 'stale': 0, 'miss': 0}
+
+
+def _count_lookup(result):
+    with _lock:
+        _lookups[result] += 1
+    metrics.inc('yearly_snapshot_lookups_total', {'result': result})
+
+
+def _hit_ratio_samples():
+    """/metrics 게이지: 조회 대비 fresh 적중률, stale 포함 적중률."""
+    with _lock:
+        counts = dict(_lookups)
+    total = sum(counts.values())
+    if not total:
+        return []
+    return [
+        ({'kind': 'fresh'}, counts['fresh'] / total),
+        ({'kind': 'any'}, (counts['fresh'] + counts['stale']) / total),
+    ]
+
+
+metrics.register_gauge('yearly_snapshot_hit_ratio', '연간 통계 스냅샷 적중률 (kind=fresh|any)', _hit_ratio_samples)
 
 
 def _ensure_parent_dir(path):
@@ -28,6 +58,36 @@ def _init_db(conn):
         )
         """
     )
+    conn.execute(
+        """
+        CREATE TABLE IF NOT EXISTS monthly_rollup (
+            employee_id TEXT NOT NULL,
+            year INTEGER NOT NULL,
+            month INTEGER NOT NULL,
+            work_rows INTEGER NOT NULL,
+            work_days INTEGER NOT NULL,
+            absent_days INTEGER NOT NULL,
+            approved_days INTEGER NOT NULL,
+            vacation_days INTEGER NOT NULL,
+            scheduled_days INTEGER NOT NULL,
+            revenue INTEGER NOT NULL,
+            fuel_cost INTEGER NOT NULL,
+            accident_count INTEGER NOT NULL,
+            PRIMARY KEY (employee_id, year, month)
+        )
+        """
+    )
+    conn.execute(
+        """
+        CREATE TABLE IF NOT EXISTS rollup_months (
+            year INTEGER NOT NULL,
+            month INTEGER NOT NULL,
+            employees INTEGER NOT NULL,
+            frozen_at REAL NOT NULL,
+            PRIMARY KEY (year, month)
+        )
+        """
+    )
     conn.commit()
 
 
@@ -37,6 +97,7 @@ def get_heavy(employee_id, year, ttl_sec, db_path):
         return None
     path = os.path.abspath(db_path)
     if not os.path.exists(path):
+        _count_lookup('miss')
         return None
     with _lock:
         conn = sqlite3.connect(path, check_same_thread=False)
@@ -46,17 +107,20 @@ def get_heavy(employee_id, year, ttl_sec, db_path):
                 'SELECT annual_absent_days, annual_accident_count, updated_at FROM yearly_heavy WHERE employee_id=? AND year=?',
                 (str(employee_id), int(year)),
             ).fetchone()
-            if not row:
-                return None
-            absent, acc, ts = row
-            if time.time() - float(ts) > ttl_sec:
-                return None
-            return {
-                'annual_absent_days': int(absent),
-                'annual_accident_count': int(acc),
-            }
         finally:
             conn.close()
+    if not row:
+        _count_lookup('miss')
+        return None
+    absent, acc, ts = row
+    if time.time() - float(ts) > ttl_sec:
+        _count_lookup('stale')
+        return None
+    _count_lookup('fresh')
+    return {
+        'annual_absent_days': int(absent),
+        'annual_accident_count': int(acc),
+    }
 
 
 def peek_heavy(employee_id, year, ttl_sec, db_path):
@@ -67,6 +131,7 @@ def peek_heavy(employee_id, year, ttl_sec, db_path):
         return None
     path = os.path.abspath(db_path)
     if not os.path.exists(path):
+        _count_lookup('miss')
         return None
     with _lock:
         conn = sqlite3.connect(path, check_same_thread=False)
@@ -76,16 +141,16 @@ def peek_heavy(employee_id, year, ttl_sec, db_path):
                 'SELECT annual_absent_days, annual_accident_count, updated_at FROM yearly_heavy WHERE employee_id=? AND year=?',
                 (str(employee_id), int(year)),
             ).fetchone()
-            if not row:
-                return None
-            absent, acc, ts = row
-            d = {'annual_absent_days': int(absent), 'annual_accident_count': int(acc)}
-            if ttl_sec <= 0:
-                return (d, True)
-            stale = time.time() - float(ts) > ttl_sec
-            return (d, stale)
         finally:
             conn.close()
+    if not row:
+        _count_lookup('miss')
+        return None
+    absent, acc, ts = row
+    d = {'annual_absent_days': int(absent), 'annual_accident_count': int(acc)}
+    stale = ttl_sec <= 0 or time.time() - float(ts) > ttl_sec
+    _count_lookup('stale' if stale else 'fresh')
+    return (d, stale)
 
 
 def put_heavy(employee_id, year, annual_absent_days, annual_accident_count, db_path):
@@ -114,6 +179,59 @@ def put_heavy(employee_id, year, annual_absent_days, annual_accident_count, db_p
             conn.close()
 
 
+def put_heavy_many(year, rows, db_path):
+    """[(사번, 결근합, 가해사고 합), ...] 을 한 트랜잭션으로 일괄 저장 → 저장한 행 수 (fleet 갱신용)."""
+    if not db_path:
+        return 0
+    now = time.time()
+    params = [(str(eid), int(year), int(absent), int(acc), now) for eid, absent, acc in rows]
+    if not params:
+        return 0
+    path = os.path.abspath(db_path)
+    _ensure_parent_dir(path)
+    with _lock:
+        conn = sqlite3.connect(path, check_same_thread=False)
+        try:
+            _init_db(conn)
+            conn.executemany(
+                """INSERT OR REPLACE INTO yearly_heavy
+                (employee_id, year, annual_absent_days, annual_accident_count, updated_at)
+                VALUES (?,?,?,?,?)""",
+                params,
+            )
+            conn.commit()
+        finally:
+            conn.close()
+    return len(params)
+
+
+def claim_refresh(name, min_interval_sec, db_path):
+    """여러 워커 중 하나만 갱신하도록 선점 — 마지막 선점 뒤 min_interval_sec 가 지났으면 True.
+
+    워커마다 배경 루프가 돌아도 같은 DB 를 보는 워커들 중 한 곳만 주기당 한 번 fleet 갱신을 한다."""
+    if not db_path:
+        return True
+    path = os.path.abspath(db_path)
+    _ensure_parent_dir(path)
+    now = time.time()
+    with _lock:
+        conn = sqlite3.connect(path, check_same_thread=False, timeout=10)
+        try:
+            conn.execute(
+                'CREATE TABLE IF NOT EXISTS refresh_lease (name TEXT PRIMARY KEY, claimed_at REAL NOT NULL)'
+            )
+            cur = conn.execute(
+                """INSERT INTO refresh_lease (name, claimed_at) VALUES (?, ?)
+                ON CONFLICT(name) DO UPDATE SET claimed_at=excluded.claimed_at
+                WHERE refresh_lease.claimed_at <= ?""",
+                (name, now, now - float(min_interval_sec)),
+            )
+            conn.commit()
+            return cur.rowcount > 0
+        finally:
+            conn.close()
+
+
 def invalidate_employee(employee_id, db_path):
     """해당 사번 연도 스냅샷 전부 삭제."""
     if not db_path:
@@ -129,3 +247,131 @@ def invalidate_employee(employee_id, db_path):
             conn.commit()
         finally:
             conn.close()
+
+
+# ----- 월 롤업 -----
+ROLLUP_FIELDS = (
+    'work_rows', 'work_days', 'absent_days', 'approved_days', 'vacation_days', 'scheduled_days',
+    'revenue', 'fuel_cost', 'accident_count',
+)
+
+
+def _with_conn(db_path, fn):
+    """DB 가 있으면 잠금 안에서 fn(conn) 결과, 없으면 None (쓰기는 fn 이 commit)."""
+    if not db_path:
+        return None
+    path = os.path.abspath(db_path)
+    if not os.path.exists(path):
+        return None
+    with _lock:
+        conn = sqlite3.connect(path, check_same_thread=False)
+        try:
+            _init_db(conn)
+            return fn(conn)
+        finally:
+            conn.close()
+
+
+def freeze_month(year, month, rollups, db_path):
+    """마감 월의 전 사번 집계 {사번: {ROLLUP_FIELDS}} 를 한 트랜잭션으로 저장하고 마감 표시 → 저장한 행 수.
+
+    이후 그 월은 frozen_months 에 포함되어 Sheets 에서 다시 읽지 않는다 (기존 행은 통째로 교체)."""
+    if not db_path:
+        return 0
+    params = [
+        (str(eid), int(year), int(month), *(int(r.get(f, 0) or 0) for f in ROLLUP_FIELDS))
+        for eid, r in rollups.items()
+    ]
+    path = os.path.abspath(db_path)
+    _ensure_parent_dir(path)
+    with _lock:
+        conn = sqlite3.connect(path, check_same_thread=False, timeout=10)
+        try:
+            _init_db(conn)
+            with conn:
+                conn.execute('DELETE FROM monthly_rollup WHERE year=? AND month=?', (int(year), int(month)))
+                conn.executemany(
+                    f"""INSERT INTO monthly_rollup (employee_id, year, month, {', '.join(ROLLUP_FIELDS)})
+                    VALUES ({', '.join('?' * (3 + len(ROLLUP_FIELDS)))})""",
+                    params,
+                )
+                conn.execute(
+                    'INSERT OR REPLACE INTO rollup_months (year, month, employees, frozen_at) VALUES (?,?,?,?)',
+                    (int(year), int(month), len(params), time.time()),
+                )
+        finally:
+            conn.close()
+    return len(params)
+
+
+def frozen_months(year, db_path):
+    """마감 저장된 월 번호 집합."""
+    rows = _with_conn(db_path, lambda conn: conn.execute(
+        'SELECT month FROM rollup_months WHERE year=?', (int(year),)).fetchall())
+    return {int(m) for (m,) in rows or ()}
+
+
+def get_employee_rollups(employee_id, year, db_path):
+    """사번의 마감 월 집계 {월 번호: {ROLLUP_FIELDS}} (그 월에 행이 없던 사번은 해당 월 없음)."""
+    rows = _with_conn(db_path, lambda conn: conn.execute(
+        f'SELECT month, {", ".join(ROLLUP_FIELDS)} FROM monthly_rollup WHERE employee_id=? AND year=?',
+        (str(employee_id), int(year)),
+    ).fetchall())
+    return {int(row[0]): dict(zip(ROLLUP_FIELDS, row[1:])) for row in rows or ()}
+
+
+def sum_rollups_by_employee(year, db_path, employee_id=None):
+    """마감 월 합계 {사번: {ROLLUP_FIELDS 합}} (employee_id 를 주면 그 사번만)."""
+    sums = ', '.join(f'SUM({f})' for f in ROLLUP_FIELDS)
+    sql = f'SELECT employee_id, {sums} FROM monthly_rollup WHERE year=?'
+    args = [int(year)]
+    if employee_id is not None:
+        sql += ' AND employee_id=?'
+        args.append(str(employee_id))
+    rows = _with_conn(db_path, lambda conn: conn.execute(sql + ' GROUP BY employee_id', args).fetchall())
+    return {row[0]: dict(zip(ROLLUP_FIELDS, (int(v or 0) for v in row[1:]))) for row in rows or ()}
+
+
+# ----- 쓰기 델타 -----
+def apply_heavy_delta(employee_id, year, absent_delta, accident_delta, db_path):
+    """스냅샷 행이 있으면 결근합·가해사고 합에 증감을 더함 → 반영했는지.
+
+    updated_at 은 그대로 둔다 (TTL 은 마지막 전체 계산 기준 — 델타로 놓친 변경은 그때 바로잡힌다)."""
+    def _apply(conn):
+        cur = conn.execute(
+            """UPDATE yearly_heavy SET annual_absent_days = MAX(0, annual_absent_days + ?),
+            annual_accident_count = MAX(0, annual_accident_count + ?) WHERE employee_id=? AND year=?""",
+            (int(absent_delta), int(accident_delta), str(employee_id), int(year)),
+        )
+        conn.commit()
+        return cur.rowcount > 0
+
+    return bool(_with_conn(db_path, _apply))
+
+
+def apply_rollup_delta(employee_id, year, month, deltas, db_path):
+    """고정된 월이면 사번 월 롤업에 {필드: 증감} 을 더함 (행이 없으면 0 에서 시작) → 반영했는지.
+
+    진행 중인 월은 Sheets 가 원본이라 건드리지 않는다."""
+    fields = [f for f in ROLLUP_FIELDS if deltas.get(f)]
+    if not fields:
+        return False
+    key = (str(employee_id), int(year), int(month))
+
+    def _apply(conn):
+        if conn.execute('SELECT 1 FROM rollup_months WHERE year=? AND month=?', key[1:]).fetchone() is None:
+            return False
+        with conn:
+            conn.execute(
+                f"""INSERT OR IGNORE INTO monthly_rollup (employee_id, year, month, {', '.join(ROLLUP_FIELDS)})
+                VALUES (?, ?, ?{', 0' * len(ROLLUP_FIELDS)})""",
+                key,
+            )
+            conn.execute(
+                f"UPDATE monthly_rollup SET {', '.join(f'{f} = MAX(0, {f} + ?)' for f in fields)} "
+                'WHERE employee_id=? AND year=? AND month=?',
+                [int(deltas[f]) for f in fields] + list(key),
+            )
+        return True
+
+    return bool(_with_conn(db_path, _apply))